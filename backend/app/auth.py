@@ -9,14 +9,15 @@ from typing import Optional
 import logging
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .config import settings
 from .models import User
+from .password_hashing import averify_and_update, pwd_context
+from .token_cache import verified_token_cache
 
-# 비밀번호 해싱 컨텍스트
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 logger = logging.getLogger(__name__)
 
 
@@ -62,18 +63,22 @@ def create_refresh_token(data: dict) -> str:
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
-    """JWT 토큰 검증"""
-    try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
-        )
-        # 토큰 타입 확인
-        if payload.get("type") != token_type:
+    """JWT 토큰 검증 (검증된 payload는 exp 까지 캐시)"""
+    payload = verified_token_cache.get(token)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+            )
+        except JWTError as exc:
+            logger.warning("JWT verification failed: %s", exc)
             return None
-        return payload
-    except JWTError as exc:
-        logger.warning("JWT verification failed: %s", exc)
+        verified_token_cache.set(token, payload)
+    # 토큰 타입 확인
+    if payload.get("type") != token_type:
         return None
+    # 캐시된 payload 를 호출자가 수정하지 않도록 복사본 반환
+    return dict(payload)
 
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -88,6 +93,24 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     return user
 
 
+async def aauthenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """authenticate_user 의 비동기 버전 (bcrypt는 해싱 전용 풀에서 실행)
+
+    저장된 해시의 cost가 BCRYPT_ROUNDS 와 다르면 password_hash 를 새 해시로 교체한다 (commit은 호출자).
+    """
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user:
+        return None
+    verified, new_hash = await averify_and_update(password, user.password_hash)
+    if not verified:
+        return None
+    if user.status != "active":
+        return None
+    if new_hash is not None:
+        user.password_hash = new_hash
+    return user
+
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """이메일로 사용자 조회"""
     return db.query(User).filter(User.email == email).first()
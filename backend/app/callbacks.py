@@ -0,0 +1,120 @@
+"""
+Generation 결과 콜백
+
+GPU 워커(RunPods/ComfyUI) 또는 fal.ai webhook이 결과를 POST /callbacks/generations 로 보낸다.
+본문 형식은 fal.ai webhook과 동일: {"request_id", "status": "OK" | "ERROR", "payload", "error"}
+
+인증 (둘 중 하나):
+- X-Avatarbank-Signature: sha256=<hex>  (RUNPODS_HMAC_SECRET 으로 raw body에 대한 HMAC)
+- ?generation_id=..&token=..  (fal.ai는 본문에 서명할 수 없으므로 제출 시 URL에 토큰을 넣는다)
+"""
+
+import hashlib
+import hmac
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .generation_queue import (
+    GENERATION_TASK_TYPE,
+    TERMINAL_GENERATION_STATUSES,
+    complete_generation,
+    fail_generation,
+)
+from .models import Generation, Task
+
+SIGNATURE_HEADER = "X-Avatarbank-Signature"
+_SIGNATURE_PREFIX = "sha256="
+
+CALLBACK_STATUS_OK = "OK"
+
+
+def _hmac_hex(message: bytes) -> str:
+    return hmac.new(
+        settings.RUNPODS_HMAC_SECRET.encode(), message, hashlib.sha256
+    ).hexdigest()
+
+
+def sign_body(body: bytes) -> str:
+    """SIGNATURE_HEADER 값 생성 (워커 측에서 사용)"""
+    return _SIGNATURE_PREFIX + _hmac_hex(body)
+
+
+def verify_signature(body: bytes, signature: Optional[str]) -> bool:
+    if not signature or not signature.startswith(_SIGNATURE_PREFIX):
+        return False
+    return hmac.compare_digest(_hmac_hex(body), signature[len(_SIGNATURE_PREFIX):])
+
+
+def _generation_token(generation_id: int) -> str:
+    return _hmac_hex(f"generation-callback:{generation_id}".encode())
+
+
+def verify_generation_token(generation_id: int, token: Optional[str]) -> bool:
+    if not token:
+        return False
+    return hmac.compare_digest(_generation_token(generation_id), token)
+
+
+def callback_url_for(generation_id: int) -> Optional[str]:
+    """fal_webhook 으로 넘길 콜백 URL (GENERATION_CALLBACK_URL 미설정 시 None)"""
+    if not settings.GENERATION_CALLBACK_URL:
+        return None
+    query = urlencode(
+        {"generation_id": generation_id, "token": _generation_token(generation_id)}
+    )
+    return f"{settings.GENERATION_CALLBACK_URL}?{query}"
+
+
+def apply_generation_callback(
+    db: Session,
+    body: dict[str, Any],
+    generation_id: Optional[int] = None,
+) -> Optional[Generation]:
+    """콜백 결과를 Generation/Task에 반영 (한 트랜잭션, request_id 기준 멱등)
+
+    대상이 없으면 None, 이미 종료된 Generation이면 변경 없이 그대로 반환한다.
+    """
+    request_id = body.get("request_id")
+    query = db.query(Generation)
+    if generation_id is not None:
+        query = query.filter(Generation.id == generation_id)
+    elif request_id:
+        query = query.filter(Generation.request_id == request_id)
+    else:
+        return None
+
+    # 같은 콜백이 동시에 두 번 와도 한 번만 반영되도록 행 잠금
+    generation = query.with_for_update().first()
+    if generation is None:
+        return None
+    if generation.status in TERMINAL_GENERATION_STATUSES:
+        db.commit()
+        return generation
+    if request_id and generation.request_id and generation.request_id != request_id:
+        db.commit()
+        return None
+
+    task = (
+        db.query(Task)
+        .filter(
+            Task.generation_id == generation.id,
+            Task.task_type == GENERATION_TASK_TYPE,
+        )
+        .order_by(Task.id.desc())
+        .first()
+    )
+    if task is None:
+        db.commit()
+        return None
+    if request_id and not generation.request_id:
+        # 제출 응답보다 webhook이 먼저 도착한 경우
+        generation.request_id = request_id
+
+    if body.get("status") == CALLBACK_STATUS_OK:
+        complete_generation(db, task, body.get("payload") or {})
+    else:
+        fail_generation(db, task, str(body.get("error") or "Generation failed"))
+    return generation
@@ -0,0 +1,125 @@
+"""
+크레딧 차감/환불 유틸리티
+Generation 선차감과 실패 시 환불을 Transaction 기록과 함께 처리
+
+잔액 확인과 차감을 하나의 조건부 UPDATE로 처리하므로 row lock 없이도
+동시 요청에서 잔액이 음수가 되지 않는다.
+PostgreSQL에서는 UPDATE와 Transaction INSERT를 CTE 하나로 묶어 한 번의 왕복으로 끝낸다.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from .models import Transaction, User
+
+users_table = User.__table__
+transactions_table = Transaction.__table__
+
+
+class InsufficientCreditsError(Exception):
+    """잔액 부족으로 차감할 수 없을 때 발생"""
+
+
+def _apply_credit_delta(
+    db: Session,
+    user_id: int,
+    delta: int,
+    tx_type: str,
+    reference_id: Optional[str],
+) -> Optional[int]:
+    """잔액에 delta를 더하고 Transaction을 기록, 변경 후 잔액 반환
+
+    차감(delta < 0)은 잔액이 충분할 때만 적용되며, 적용되지 않으면 None 반환.
+    """
+    balance_update = (
+        update(users_table)
+        .where(users_table.c.id == user_id)
+        .values(credit_balance=users_table.c.credit_balance + delta)
+        .returning(users_table.c.id, users_table.c.credit_balance)
+    )
+    if delta < 0:
+        balance_update = balance_update.where(
+            users_table.c.credit_balance >= -delta
+        )
+
+    tx_columns = [
+        "user_id",
+        "type",
+        "amount",
+        "currency",
+        "credit_before",
+        "credit_after",
+        "reference_id",
+        "created_at",
+    ]
+
+    if db.get_bind().dialect.name == "postgresql":
+        updated = balance_update.cte("updated_balance")
+        tx_insert = (
+            insert(transactions_table)
+            .from_select(
+                tx_columns,
+                select(
+                    updated.c.id,
+                    literal(tx_type, String),
+                    literal(delta, Integer),
+                    literal("CREDIT", String),
+                    updated.c.credit_balance - delta,
+                    updated.c.credit_balance,
+                    literal(reference_id, String),
+                    literal(datetime.utcnow(), DateTime),
+                ),
+            )
+            .add_cte(updated)
+            .returning(transactions_table.c.credit_after)
+        )
+        return db.execute(tx_insert).scalar_one_or_none()
+
+    # UPDATE ... RETURNING 을 지원하지만 DML CTE는 지원하지 않는 DB(SQLite 등)
+    row = db.execute(balance_update).first()
+    if row is None:
+        return None
+    credit_after = row.credit_balance
+    db.execute(
+        insert(transactions_table).values(
+            user_id=user_id,
+            type=tx_type,
+            amount=delta,
+            currency="CREDIT",
+            credit_before=credit_after - delta,
+            credit_after=credit_after,
+            reference_id=reference_id,
+            created_at=datetime.utcnow(),
+        )
+    )
+    return credit_after
+
+
+def debit_credits(
+    db: Session,
+    user_id: int,
+    amount: int,
+    tx_type: str = "generation",
+    reference_id: Optional[str] = None,
+) -> int:
+    """크레딧 차감 후 잔액 반환 (commit은 호출자가 수행)"""
+    credit_after = _apply_credit_delta(db, user_id, -amount, tx_type, reference_id)
+    if credit_after is None:
+        raise InsufficientCreditsError("Insufficient credits.")
+    return credit_after
+
+
+def refund_credits(
+    db: Session,
+    user_id: int,
+    amount: int,
+    reference_id: Optional[str] = None,
+) -> int:
+    """크레딧 환불 후 잔액 반환 (commit은 호출자가 수행)"""
+    credit_after = _apply_credit_delta(db, user_id, amount, "refund", reference_id)
+    if credit_after is None:
+        raise ValueError(f"User {user_id} not found for refund")
+    return credit_after
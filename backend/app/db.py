@@ -1,7 +1,16 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from .config import settings
+from .db_metrics import (
+    instrument_engine,
+    instrument_sessions,
+    record_request_hold,
+    timed_pool_class,
+)
 
 
 class Base(DeclarativeBase):
@@ -10,20 +19,42 @@ class Base(DeclarativeBase):
 
 # NeonDB 연결 설정 개선
 # pool_recycle: 연결을 주기적으로 재사용하여 SSL 연결 끊김 방지
-# pool_pre_ping: 연결 전에 ping을 보내서 유효한 연결인지 확인
-# connect_args: SSL 연결 안정성 향상
+# pool_pre_ping: 연결 전에 ping을 보내서 유효한 연결인지 확인 (DB_POOL_PRE_PING)
+# connect_args: SSL 연결 안정성 향상, TCP keepalive로 끊긴 연결을 ping 없이 감지
 engine = create_engine(
     settings.DATABASE_URL.unicode_string(),
-    pool_pre_ping=True,
-    pool_recycle=300,  # 5분마다 연결 재사용
-    pool_size=5,
-    max_overflow=10,
+    poolclass=timed_pool_class(QueuePool, "db"),
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
     connect_args={
         "connect_timeout": 10,
         "sslmode": "require",
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 3,
     },
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine, "db", statement_timing=settings.DB_STATEMENT_METRICS)
+
+
+# 세션은 첫 쿼리에서 커넥션을 체크아웃하고 commit/rollback 시 바로 반납한다 (요청 끝까지 잡지 않음).
+# 동기 / async 세션의 커넥션 보유 시간을 따로 집계하기 위해 클래스를 나눈다.
+class _SyncSession(Session):
+    pass
+
+
+class _AsyncBackingSession(Session):
+    """AsyncSession 내부의 동기 세션"""
+
+
+instrument_sessions(_SyncSession, "db")
+instrument_sessions(_AsyncBackingSession, "db_async")
+
+SessionLocal = sessionmaker(class_=_SyncSession, autocommit=False, autoflush=False, bind=engine)
 
 
 def get_db():
@@ -32,5 +63,55 @@ def get_db():
         yield db
     finally:
         db.close()
+        record_request_hold(db, "db")
+
 
+# 비동기 엔진 (asyncpg)
+# async 엔드포인트가 스레드풀 슬롯을 잡지 않고 DB 응답을 기다리도록 별도 풀을 사용한다.
+# asyncpg는 sslmode/channel_binding URL 파라미터를 받지 않으므로 connect_args로 전달한다.
+def _async_database_url():
+    url = make_url(settings.DATABASE_URL.unicode_string())
+    query = {
+        key: value
+        for key, value in url.query.items()
+        if key not in ("sslmode", "channel_binding")
+    }
+    return url.set(drivername="postgresql+asyncpg", query=query)
 
+
+_async_url = _async_database_url()
+_async_connect_args = {"timeout": 10, "ssl": "require"}
+if _async_url.host and "-pooler" in _async_url.host:
+    # NeonDB pooler(PgBouncer transaction 모드)는 prepared statement 캐시를 지원하지 않음
+    _async_connect_args["statement_cache_size"] = 0
+    _async_url = _async_url.update_query_dict({"prepared_statement_cache_size": "0"})
+
+async_engine = create_async_engine(
+    _async_url,
+    poolclass=timed_pool_class(AsyncAdaptedQueuePool, "db_async"),
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    connect_args=_async_connect_args,
+)
+instrument_engine(
+    async_engine.sync_engine, "db_async", statement_timing=settings.DB_STATEMENT_METRICS
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=_AsyncBackingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
+        record_request_hold(db.sync_session, "db_async")
@@ -0,0 +1,117 @@
+"""
+DB 커넥션 풀 / 쿼리 메트릭
+
+엔진마다 이름(label)을 붙여 GET /metrics 에 노출한다.
+- {label}_checkout_seconds      풀에서 커넥션을 얻기까지 걸린 시간 (대기 + 새 연결 + pre-ping)
+- {label}_pool_timeouts         풀 대기 시간 초과 (pool_timeout)
+- {label}_pre_ping_failures     pre-ping 으로 끊긴 연결을 발견한 횟수
+- {label}_disconnects           쿼리 도중 끊긴 연결 (pre-ping 을 끈 경우 여기서 드러남)
+- {label}_statement_seconds     SQL 문 실행 시간
+- collectors.{label}_pool       size / checked_out(사용 중) / overflow / checked_in(유휴)
+
+세션 단위 (instrument_sessions / record_request_hold)
+- {label}_connection_hold_seconds          트랜잭션 하나가 커넥션을 잡고 있던 시간 (첫 쿼리 ~ commit/rollback)
+- {label}_request_connection_hold_seconds  요청 하나에서 커넥션을 잡고 있던 시간 합계
+- {label}_sessions_unused                  DB를 한 번도 쓰지 않은 요청 (커넥션 체크아웃 없음)
+"""
+
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+from .metrics import metrics
+
+_STARTED_KEY = "statement_started"
+_HOLD_STARTED_KEY = "connection_hold_started"
+_HOLD_TOTAL_KEY = "connection_hold_seconds"
+
+
+def timed_pool_class(pool_class: type[Pool], label: str) -> type[Pool]:
+    """connect() 소요 시간을 기록하는 풀 클래스 (create_engine(poolclass=...) 에 전달)"""
+
+    class TimedPool(pool_class):  # type: ignore[misc, valid-type]
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                metrics.inc(f"{label}_pool_timeouts")
+                raise
+            finally:
+                metrics.observe(f"{label}_checkout_seconds", time.perf_counter() - started)
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def _pool_stats(pool: Pool) -> dict[str, Any]:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "checked_in": pool.checkedin(),
+    }
+
+
+def instrument_engine(engine: Engine, label: str, statement_timing: bool = True) -> None:
+    """엔진에 오류/쿼리 이벤트를 연결하고 풀 상태 수집기 등록 (async 엔진은 sync_engine 전달)"""
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context) -> None:
+        if context.is_pre_ping:
+            metrics.inc(f"{label}_pre_ping_failures")
+        elif context.is_disconnect:
+            metrics.inc(f"{label}_disconnects")
+        if statement_timing and context.execution_context is not None:
+            # 실패한 문은 after_cursor_execute 가 호출되지 않으므로 시작 시각을 정리
+            started = context.connection.info.get(_STARTED_KEY)
+            if started:
+                started.pop()
+
+    if statement_timing:
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+            conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+            started = conn.info[_STARTED_KEY].pop()
+            metrics.observe(f"{label}_statement_seconds", time.perf_counter() - started)
+
+    metrics.register_collector(f"{label}_pool", lambda: _pool_stats(engine.pool))
+
+
+def instrument_sessions(session_class: type[Session], label: str) -> None:
+    """세션 클래스에 커넥션 보유 시간 이벤트 연결 (AsyncSession 은 sync_session_class 전달)
+
+    Session 은 첫 쿼리에서 커넥션을 체크아웃하고 commit/rollback/close 에서 반납한다.
+    """
+
+    @event.listens_for(session_class, "after_begin")
+    def _after_begin(session, transaction, connection) -> None:
+        session.info.setdefault(_HOLD_STARTED_KEY, time.perf_counter())
+
+    @event.listens_for(session_class, "after_transaction_end")
+    def _after_transaction_end(session, transaction) -> None:
+        if transaction.parent is not None:
+            return
+        started = session.info.pop(_HOLD_STARTED_KEY, None)
+        if started is None:
+            return
+        held = time.perf_counter() - started
+        session.info[_HOLD_TOTAL_KEY] = session.info.get(_HOLD_TOTAL_KEY, 0.0) + held
+        metrics.observe(f"{label}_connection_hold_seconds", held)
+
+
+def record_request_hold(session: Session, label: str) -> None:
+    """요청 종료(세션 close) 후 호출: 요청 단위 커넥션 보유 시간 기록"""
+    held = session.info.pop(_HOLD_TOTAL_KEY, None)
+    if held is None:
+        metrics.inc(f"{label}_sessions_unused")
+    else:
+        metrics.observe(f"{label}_request_connection_hold_seconds", held)
@@ -6,25 +6,26 @@ FastAPI 의존성 함수들
 from typing import Optional
 
 import logging
+import time
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .auth import verify_token
 from .config import settings
-from .db import get_db
-from .models import User
+from .db import get_async_db, get_db
+from .read_queries import auth_user_stmt
+from .user_cache import AuthUser, user_auth_cache
 
 security = HTTPBearer()
 logger = logging.getLogger(__name__)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    """현재 로그인한 사용자 조회 (JWT Access Token 검증)"""
+def _user_id_from_credentials(credentials: HTTPAuthorizationCredentials) -> int:
+    """Access Token을 검증하고 sub(user id) 반환"""
     token = credentials.credentials
     if token:
         logger.warning("Received access token length=%s", len(token))
@@ -44,32 +45,76 @@ def get_current_user(
             detail="Invalid token payload",
         )
     try:
-        user_id = int(user_id_raw)
+        return int(user_id_raw)
     except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+
+def _cache_loaded_user(db_user: Optional[Row], started: float) -> AuthUser:
+    if db_user is None:
         logger.warning("User not found for token subject")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    user = AuthUser.from_user(db_user)
+    user_auth_cache.set(user, time.perf_counter() - started)
+    return user
+
+
+def _ensure_active(user: AuthUser) -> AuthUser:
     if user.status != "active":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is not active",
         )
-
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> AuthUser:
+    """현재 로그인한 사용자 조회 (JWT Access Token 검증)
+
+    인증/권한 판단용 필드만 담은 AuthUser를 반환하며, users 조회는 캐시된다.
+    """
+    user_id = _user_id_from_credentials(credentials)
+
+    user = user_auth_cache.get(user_id)
+    if user is None:
+        started = time.perf_counter()
+        db_user = db.execute(auth_user_stmt(user_id)).first()
+        # 조회 트랜잭션을 바로 끝내 핸들러가 DB를 쓰기 전까지 커넥션을 풀에 돌려준다
+        db.rollback()
+        user = _cache_loaded_user(db_user, started)
+
+    return _ensure_active(user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> AuthUser:
+    """get_current_user 의 비동기 버전 (async 엔드포인트용, 같은 캐시 사용)"""
+    user_id = _user_id_from_credentials(credentials)
+
+    user = user_auth_cache.get(user_id)
+    if user is None:
+        started = time.perf_counter()
+        db_user = (await db.execute(auth_user_stmt(user_id))).first()
+        await db.rollback()
+        user = _cache_loaded_user(db_user, started)
+
+    return _ensure_active(user)
+
+
 def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthUser = Depends(get_current_user),
+) -> AuthUser:
     """현재 활성 사용자 조회 (별칭)"""
     return current_user
 
@@ -77,7 +122,7 @@ def get_current_active_user(
 def require_role(required_role: str):
     """특정 역할이 필요한 의존성 팩토리"""
 
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    def role_checker(current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
         if current_user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,176 @@
+"""
+이미지 파생본(썸네일 / WebP / AVIF) 생성
+
+원본 객체 키 옆에 파생본을 저장한다.
+    objects/ab/cd/<sha256>.png        원본
+    objects/ab/cd/<sha256>.thumb.webp 썸네일 (THUMBNAIL_SIZE 박스에 맞춤)
+    objects/ab/cd/<sha256>.webp       원본 크기 WebP
+    objects/ab/cd/<sha256>.avif       원본 크기 AVIF (Pillow AVIF 플러그인이 있을 때만)
+
+디코딩/인코딩은 CPU 작업이므로 ProcessPoolExecutor에서 실행하고,
+스토리지 입출력과 DB 갱신은 스레드풀에서 처리한다.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from typing import Optional
+
+from PIL import Image, ImageOps
+from sqlalchemy import update
+
+from .config import settings
+from .db import SessionLocal
+from .metrics import metrics
+from .models import Avatar, Generation
+from .storage import get_storage_backend, key_from_url
+
+try:  # AVIF 인코더는 선택 의존성 (pillow-avif-plugin)
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SUFFIX = ".thumb.webp"
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def avif_supported() -> bool:
+    return ".avif" in Image.registered_extensions()
+
+
+def derivative_key(key: str, suffix: str) -> str:
+    """objects/ab/cd/<sha>.png + ".thumb.webp" → objects/ab/cd/<sha>.thumb.webp"""
+    return key.rsplit(".", 1)[0] + suffix
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=settings.DERIVATIVE_QUALITY)
+    return buffer.getvalue()
+
+
+def render_derivatives(
+    data: bytes, thumbnail_size: int, with_avif: bool
+) -> list[tuple[str, bytes, str]]:
+    """(suffix, 인코딩된 바이트, content_type) 목록 (프로세스 풀에서 실행)"""
+    with Image.open(BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        thumbnail = image.copy()
+        thumbnail.thumbnail((thumbnail_size, thumbnail_size), Image.LANCZOS)
+
+        outputs = [
+            (THUMBNAIL_SUFFIX, _encode(thumbnail, "WEBP"), "image/webp"),
+            (".webp", _encode(image, "WEBP"), "image/webp"),
+        ]
+        if with_avif:
+            outputs.append((".avif", _encode(image, "AVIF"), "image/avif"))
+        return outputs
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        with _pool_lock:
+            if _process_pool is None:
+                # API / 워커 프로세스는 멀티스레드라 fork 하면 자식이 다른 스레드가 잡고 있던
+                # 락(logging, 커넥션 풀, httpx)에서 멈출 수 있으므로 spawn 사용
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=settings.DERIVATIVE_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _process_pool
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        with _pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(
+                    max_workers=settings.DERIVATIVE_PROCESSES * 2,
+                    thread_name_prefix="derivatives",
+                )
+    return _thread_pool
+
+
+def build_derivatives(key: str) -> str:
+    """원본 key의 파생본을 만들어 저장하고 썸네일 URL 반환 (이미 있으면 재사용)"""
+    backend = get_storage_backend()
+    thumbnail_key = derivative_key(key, THUMBNAIL_SUFFIX)
+    if not backend.exists(thumbnail_key):
+        data = backend.read_bytes(key)
+        outputs = _get_process_pool().submit(
+            render_derivatives, data, settings.THUMBNAIL_SIZE, avif_supported()
+        ).result()
+        # 썸네일을 마지막에 저장 (썸네일이 있으면 나머지도 있다고 보고 재사용)
+        for suffix, encoded, content_type in sorted(
+            outputs, key=lambda output: output[0] == THUMBNAIL_SUFFIX
+        ):
+            backend.put_bytes(derivative_key(key, suffix), encoded, content_type)
+        metrics.inc("image_derivatives_built")
+    return backend.url_for(thumbnail_key)
+
+
+def _build_for(model, object_id: int, url_attr: str) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        row = db.get(model, object_id)
+        source_url = getattr(row, url_attr, None) if row else None
+        key = key_from_url(source_url)
+        if key is None:
+            return None
+        db.rollback()  # 이미지 처리 동안 트랜잭션을 잡고 있지 않도록
+
+        thumbnail_url = build_derivatives(key)
+        # 그 사이 원본 이미지가 바뀌었으면 반영하지 않음
+        db.execute(
+            update(model)
+            .where(model.id == object_id, getattr(model, url_attr) == source_url)
+            .values(thumbnail_url=thumbnail_url)
+        )
+        db.commit()
+        return thumbnail_url
+    except Exception as exc:
+        db.rollback()
+        metrics.inc("image_derivatives_failed")
+        logger.warning("Derivatives failed for %s %s: %s", model.__name__, object_id, exc)
+        raise
+    finally:
+        db.close()
+
+
+def build_generation_derivatives(generation_id: int) -> Optional[str]:
+    return _build_for(Generation, generation_id, "image_url")
+
+
+def build_avatar_derivatives(avatar_id: int) -> Optional[str]:
+    return _build_for(Avatar, avatar_id, "preview_image_url")
+
+
+def schedule_generation_derivatives(generation_id: int) -> Future:
+    return _get_thread_pool().submit(build_generation_derivatives, generation_id)
+
+
+def schedule_avatar_derivatives(avatar_id: int) -> Future:
+    return _get_thread_pool().submit(build_avatar_derivatives, avatar_id)
+
+
+def shutdown_pools() -> None:
+    global _process_pool, _thread_pool
+    with _pool_lock:
+        thread_pool, _thread_pool = _thread_pool, None
+        process_pool, _process_pool = _process_pool, None
+    if thread_pool is not None:
+        thread_pool.shutdown(wait=True)
+    if process_pool is not None:
+        process_pool.shutdown(wait=True)
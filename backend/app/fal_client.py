@@ -1,9 +1,82 @@
-from typing import Any
+import threading
+from typing import Any, Optional
 
 import httpx
 
 from .config import settings
 
+# 프로세스 전역 HTTP 클라이언트 (커넥션 풀/keep-alive 재사용)
+# 매 호출마다 TCP/TLS 핸드셰이크를 반복하지 않도록 공유한다.
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_client_lock = threading.Lock()
+
+_SUBMIT_TIMEOUT = 30
+_STATUS_TIMEOUT = 30
+_RESULT_TIMEOUT = 60
+_SYNC_RUN_TIMEOUT = 120
+
+
+def _client_options() -> dict[str, Any]:
+    return {
+        "http2": settings.FAL_HTTP2,
+        "limits": httpx.Limits(
+            max_connections=settings.FAL_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.FAL_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=settings.FAL_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": _timeout(_SUBMIT_TIMEOUT),
+    }
+
+
+def _timeout(seconds: float) -> httpx.Timeout:
+    return httpx.Timeout(seconds, connect=settings.FAL_HTTP_CONNECT_TIMEOUT)
+
+
+def get_client() -> httpx.Client:
+    """공유 sync 클라이언트 (워커 등 sync 코드 경로용)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """공유 async 클라이언트 (이벤트 루프 코드 경로용)"""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(**_client_options())
+    return _async_client
+
+
+def init_clients() -> None:
+    """앱 시작 시 클라이언트 생성"""
+    get_client()
+    get_async_client()
+
+
+def close_clients() -> None:
+    """sync 클라이언트 종료"""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+
+async def aclose_clients() -> None:
+    """앱 종료 시 sync/async 클라이언트 모두 종료"""
+    global _async_client
+    with _client_lock:
+        client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
+    close_clients()
+
 
 def _normalize_model_and_subpath() -> tuple[str, str]:
     model = settings.FAL_MODEL.strip("/")
@@ -30,6 +103,11 @@ def _build_sync_url() -> str:
     return f"{base_url}/{model}"
 
 
+def _build_submit_url() -> str:
+    _, subpath = _normalize_model_and_subpath()
+    return _build_url(f"/{subpath}") if subpath else _build_url("")
+
+
 def _headers() -> dict[str, str]:
     if not settings.FAL_API_KEY:
         raise RuntimeError("FAL_API_KEY is not configured")
@@ -39,56 +117,101 @@ def _headers() -> dict[str, str]:
     }
 
 
-def submit_generation(prompt: str) -> str:
-    payload = {
+def _generation_payload(prompt: str) -> dict[str, Any]:
+    return {
         "prompt": prompt,
         "num_images": 1,
         "enable_safety_checker": True,
     }
 
-    _, subpath = _normalize_model_and_subpath()
-    url = _build_url(f"/{subpath}") if subpath else _build_url("")
-    with httpx.Client(timeout=30) as client:
-        response = client.post(url, json=payload, headers=_headers())
-        response.raise_for_status()
-        data = response.json()
 
+def _parse_request_id(response: httpx.Response) -> str:
+    response.raise_for_status()
+    data = response.json()
     request_id = data.get("request_id") or data.get("requestId")
     if not request_id:
         raise RuntimeError("fal.ai queue response missing request_id")
     return request_id
 
 
+def _parse_status(response: httpx.Response, status_url: str) -> dict[str, Any]:
+    if response.status_code == 405:
+        raise RuntimeError(
+            "fal.ai queue status endpoint returned 405. "
+            "Check FAL_MODEL/FAL_SUBPATH (subpath must not be used for status). "
+            f"status_url={status_url}"
+        )
+    response.raise_for_status()
+    return response.json()
+
+
+def _submit_params(webhook_url: Optional[str]) -> Optional[dict[str, str]]:
+    # 완료 시 fal.ai가 결과를 webhook_url로 POST (app.callbacks)
+    return {"fal_webhook": webhook_url} if webhook_url else None
+
+
+def submit_generation(prompt: str, webhook_url: Optional[str] = None) -> str:
+    response = get_client().post(
+        _build_submit_url(),
+        json=_generation_payload(prompt),
+        params=_submit_params(webhook_url),
+        headers=_headers(),
+        timeout=_timeout(_SUBMIT_TIMEOUT),
+    )
+    return _parse_request_id(response)
+
+
 def get_status(request_id: str) -> dict[str, Any]:
     status_url = _build_url(f"/requests/{request_id}/status")
-    with httpx.Client(timeout=30) as client:
-        response = client.get(status_url, headers=_headers())
-        if response.status_code == 405:
-            raise RuntimeError(
-                "fal.ai queue status endpoint returned 405. "
-                "Check FAL_MODEL/FAL_SUBPATH (subpath must not be used for status). "
-                f"status_url={status_url}"
-            )
-        response.raise_for_status()
-        return response.json()
+    response = get_client().get(
+        status_url, headers=_headers(), timeout=_timeout(_STATUS_TIMEOUT)
+    )
+    return _parse_status(response, status_url)
 
 
 def get_result(request_id: str) -> dict[str, Any]:
     url = _build_url(f"/requests/{request_id}")
-    with httpx.Client(timeout=60) as client:
-        response = client.get(url, headers=_headers())
-        response.raise_for_status()
-        return response.json()
+    response = get_client().get(
+        url, headers=_headers(), timeout=_timeout(_RESULT_TIMEOUT)
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 def run_generation_sync(prompt: str) -> dict[str, Any]:
-    payload = {
-        "prompt": prompt,
-        "num_images": 1,
-        "enable_safety_checker": True,
-    }
-    url = _build_sync_url()
-    with httpx.Client(timeout=120) as client:
-        response = client.post(url, json=payload, headers=_headers())
-        response.raise_for_status()
-        return response.json()
+    response = get_client().post(
+        _build_sync_url(),
+        json=_generation_payload(prompt),
+        headers=_headers(),
+        timeout=_timeout(_SYNC_RUN_TIMEOUT),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def asubmit_generation(prompt: str, webhook_url: Optional[str] = None) -> str:
+    response = await get_async_client().post(
+        _build_submit_url(),
+        json=_generation_payload(prompt),
+        params=_submit_params(webhook_url),
+        headers=_headers(),
+        timeout=_timeout(_SUBMIT_TIMEOUT),
+    )
+    return _parse_request_id(response)
+
+
+async def aget_status(request_id: str) -> dict[str, Any]:
+    status_url = _build_url(f"/requests/{request_id}/status")
+    response = await get_async_client().get(
+        status_url, headers=_headers(), timeout=_timeout(_STATUS_TIMEOUT)
+    )
+    return _parse_status(response, status_url)
+
+
+async def aget_result(request_id: str) -> dict[str, Any]:
+    url = _build_url(f"/requests/{request_id}")
+    response = await get_async_client().get(
+        url, headers=_headers(), timeout=_timeout(_RESULT_TIMEOUT)
+    )
+    response.raise_for_status()
+    return response.json()
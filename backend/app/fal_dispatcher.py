@@ -0,0 +1,128 @@
+"""
+fal.ai 디스패처
+동시 실행 상한 + AIMD 적응형 제한으로 fal.ai 429/5xx 폭주를 막는다.
+
+- 성공 시 limit을 1/limit 씩 증가 (additive increase)
+- 429/5xx 수신 시 limit을 절반으로 감소 (multiplicative decrease), cooldown 동안 추가 감소 없음
+- Retry-After 헤더가 있으면 해당 시간 동안 신규 제출 중지
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import httpx
+
+from . import fal_client
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderThrottled(Exception):
+    """fal.ai가 429/5xx로 과부하를 알렸을 때 발생"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None) -> None:
+        super().__init__(f"fal.ai throttled the request (HTTP {status_code})")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _is_throttle_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        decrease_factor: float = 0.5,
+        cooldown_seconds: float = 5.0,
+    ) -> None:
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self._limit = float(max_limit)
+        self._last_decrease = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(math.floor(self._limit)))
+
+    def capacity(self, in_flight: int) -> int:
+        """현재 in_flight 기준으로 새로 제출 가능한 개수"""
+        with self._lock:
+            if time.monotonic() < self._paused_until:
+                return 0
+            return max(0, self.limit - in_flight)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            if now - self._last_decrease < self.cooldown_seconds:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+            logger.warning("fal.ai throttled, concurrency limit -> %s", self.limit)
+
+
+class FalDispatcher:
+    """fal_client 호출을 감싸 throttle 응답을 AdaptiveLimiter에 반영"""
+
+    def __init__(self, limiter: Optional[AdaptiveLimiter] = None) -> None:
+        self.limiter = limiter or AdaptiveLimiter(
+            max_limit=settings.FAL_MAX_CONCURRENCY,
+            min_limit=settings.FAL_MIN_CONCURRENCY,
+            cooldown_seconds=settings.FAL_THROTTLE_COOLDOWN_SECONDS,
+        )
+
+    def capacity(self, in_flight: int) -> int:
+        return self.limiter.capacity(in_flight)
+
+    def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        try:
+            return func(*args)
+        except httpx.HTTPStatusError as exc:
+            status_code = exc.response.status_code
+            if _is_throttle_status(status_code):
+                retry_after = _parse_retry_after(exc.response)
+                self.limiter.on_throttle(retry_after)
+                raise ProviderThrottled(status_code, retry_after) from exc
+            raise
+
+    def submit(self, prompt: str, webhook_url: Optional[str] = None) -> str:
+        request_id = self._call(fal_client.submit_generation, prompt, webhook_url)
+        if webhook_url:
+            # 콜백 모드에서는 result 호출이 없으므로 제출 성공을 기준으로 한도를 늘린다
+            self.limiter.on_success()
+        return request_id
+
+    def status(self, request_id: str) -> dict[str, Any]:
+        return self._call(fal_client.get_status, request_id)
+
+    def result(self, request_id: str) -> dict[str, Any]:
+        result = self._call(fal_client.get_result, request_id)
+        self.limiter.on_success()
+        return result
@@ -0,0 +1,307 @@
+"""
+Generation 상태 이벤트 (GET /generations/events SSE 스트림용 pub/sub)
+
+클라이언트가 GET /generations/{id} 를 폴링하지 않도록 상태가 바뀔 때마다 이벤트를 발행한다.
+- 이벤트 본문은 GET /generations/{id} 와 같은 GenerationResponse JSON
+- InMemoryBroker: 프로세스 내 팬아웃 (같은 프로세스에서 발행한 이벤트만 전달, 테스트용 기본값)
+- RedisBroker: REDIS_URL 채널로 발행하고, 프로세스마다 구독 연결 1개로 받아 로컬 팬아웃
+  (워커 프로세스의 전이까지 전달, redis 패키지 필요)
+- 구독자는 generation 별 최신 이벤트만 보관 (느린 클라이언트는 중간 상태를 건너뛰고 최신 상태를 받음)
+- 스트림은 이벤트가 없으면 GENERATION_EVENTS_KEEPALIVE_SECONDS 마다 미종료 generation 을 DB 에서 다시 읽는다
+  (메모리 브로커로는 오지 않는 워커 프로세스 / 다른 uvicorn 워커의 전이, Redis 재연결 중 놓친 이벤트 보정)
+"""
+
+import asyncio
+import logging
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Iterable, NamedTuple, Optional
+
+import orjson
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from .config import settings
+from .db import AsyncSessionLocal
+from .metrics import metrics
+from .models import TERMINAL_GENERATION_STATUSES
+from .read_queries import fetch_generations
+from .responses import GENERATION
+
+try:  # Redis 백엔드는 선택 의존성
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:
+    redis = None
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_CHANNEL = "avatarbank:generation-events"
+_REDIS_READY_TIMEOUT_SECONDS = 5.0
+_REDIS_RECONNECT_SECONDS = 1.0
+
+
+class GenerationEvent(NamedTuple):
+    generation_id: int
+    status: str
+    data: bytes  # GenerationResponse JSON
+
+
+class EventBrokerUnavailableError(Exception):
+    """이벤트 백엔드(Redis) 구독 연결을 만들 수 없음"""
+
+
+def generation_event(generation) -> GenerationEvent:
+    """Generation(ORM 또는 GenerationRow) → 이벤트 (commit 전에 만들어 만료된 속성을 다시 읽지 않음)"""
+    data = GENERATION.dump_json(GENERATION.validate_python(generation, from_attributes=True))
+    return GenerationEvent(generation.id, generation.status, data)
+
+
+class Subscription:
+    """한 스트림의 구독 (이벤트 루프에서 생성/소비, 발행은 어느 스레드에서든 가능)"""
+
+    def __init__(self, broker: "InMemoryBroker", generation_ids: Iterable[int]) -> None:
+        self.generation_ids = frozenset(generation_ids)
+        self._broker = broker
+        self._loop = asyncio.get_running_loop()
+        self._pending: dict[int, GenerationEvent] = {}
+        self._ready = asyncio.Event()
+
+    def _deliver(self, event: GenerationEvent) -> None:
+        self._pending[event.generation_id] = event
+        self._ready.set()
+
+    def push(self, event: GenerationEvent) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            # 루프가 이미 닫힘 (종료 중)
+            pass
+
+    async def get(self, timeout: float) -> list[GenerationEvent]:
+        """대기 중인 이벤트 반환 (timeout 동안 없으면 빈 목록)"""
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+    def close(self) -> None:
+        self._broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, event: GenerationEvent) -> None:
+        metrics.inc("generation_events_published")
+        self._fanout(event)
+
+    def _fanout(self, event: GenerationEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.generation_id, ()))
+        for subscription in subscribers:
+            subscription.push(event)
+
+    async def subscribe(self, generation_ids: Iterable[int]) -> Subscription:
+        subscription = Subscription(self, generation_ids)
+        with self._lock:
+            for generation_id in subscription.generation_ids:
+                self._subscribers.setdefault(generation_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for generation_id in subscription.generation_ids:
+                subscribers = self._subscribers.get(generation_id)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[generation_id]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            subscriptions = set().union(*self._subscribers.values()) if self._subscribers else set()
+            return {"subscriptions": len(subscriptions), "generations": len(self._subscribers)}
+
+    async def aclose(self) -> None:
+        pass
+
+
+class RedisBroker(InMemoryBroker):
+    """발행은 Redis 채널로, 수신은 프로세스당 구독 연결 1개 → 로컬 팬아웃"""
+
+    def __init__(self, url: str) -> None:
+        if redis is None:
+            raise RuntimeError("GENERATION_EVENTS_BACKEND=redis requires the redis package")
+        super().__init__()
+        self._url = url
+        # 발행은 워커 / 스레드풀의 동기 코드에서 호출된다
+        self._client = redis.Redis.from_url(url)
+        self._listener: Optional[asyncio.Task] = None
+        self._listening: Optional[asyncio.Event] = None
+
+    def publish(self, event: GenerationEvent) -> None:
+        metrics.inc("generation_events_published")
+        try:
+            self._client.publish(REDIS_CHANNEL, event.data)
+        except redis.RedisError as exc:
+            metrics.inc("generation_events_publish_errors")
+            logger.warning("Failed to publish generation %s event: %s", event.generation_id, exc)
+
+    async def subscribe(self, generation_ids: Iterable[int]) -> Subscription:
+        if self._listener is None or self._listener.done():
+            self._listening = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen(self._listening))
+        # 초기 상태 조회 전에 채널 구독이 끝나 있어야 그 사이 전이를 놓치지 않는다
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(self._listening.wait()), _REDIS_READY_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            raise EventBrokerUnavailableError("Redis subscription is not ready")
+        return await super().subscribe(generation_ids)
+
+    async def _listen(self, listening: asyncio.Event) -> None:
+        while True:
+            client = aioredis.Redis.from_url(self._url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(REDIS_CHANNEL)
+                    listening.set()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        payload = orjson.loads(message["data"])
+                        self._fanout(
+                            GenerationEvent(payload["id"], payload["status"], message["data"])
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                listening.clear()
+                metrics.inc("generation_events_redis_reconnects")
+                logger.warning("Generation event subscription lost: %s", exc)
+                await asyncio.sleep(_REDIS_RECONNECT_SECONDS)
+            finally:
+                await client.aclose()
+
+    async def aclose(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._client.close()
+
+
+_broker: Optional[InMemoryBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_event_broker() -> InMemoryBroker:
+    """GENERATION_EVENTS_BACKEND 설정에 맞는 브로커 (프로세스 전역 1개)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if settings.GENERATION_EVENTS_BACKEND == "redis":
+                    _broker = RedisBroker(str(settings.REDIS_URL))
+                else:
+                    _broker = InMemoryBroker()
+                metrics.register_collector("generation_events", _broker.stats)
+    return _broker
+
+
+def publish_generation(event: GenerationEvent) -> None:
+    get_event_broker().publish(event)
+
+
+async def close_event_broker() -> None:
+    global _broker
+    with _broker_lock:
+        broker, _broker = _broker, None
+    if broker is not None:
+        await broker.aclose()
+
+
+def _sse(event: GenerationEvent) -> bytes:
+    return b"event: generation\ndata: " + event.data + b"\n\n"
+
+
+async def load_generation_events(generation_ids: list[int]) -> list[GenerationEvent]:
+    """DB 의 현재 상태로 이벤트 생성"""
+    async with AsyncSessionLocal() as db:
+        return [generation_event(row) for row in await fetch_generations(db, generation_ids)]
+
+
+EventLoader = Callable[[list[int]], Awaitable[list[GenerationEvent]]]
+
+
+async def _stream(
+    subscription: Subscription,
+    initial: list[GenerationEvent],
+    interval: float,
+    reload: EventLoader,
+) -> AsyncIterator[bytes]:
+    remaining = set(subscription.generation_ids)
+    sent: dict[int, bytes] = {}
+    events = initial
+    while True:
+        changed = [event for event in events if sent.get(event.generation_id) != event.data]
+        for event in changed:
+            sent[event.generation_id] = event.data
+            metrics.inc("generation_events_sent")
+            yield _sse(event)
+            if event.status in TERMINAL_GENERATION_STATUSES:
+                remaining.discard(event.generation_id)
+        if not remaining:
+            # 모두 종료 상태 → 클라이언트는 end 를 받으면 EventSource 를 닫는다 (자동 재연결 방지)
+            yield b"event: end\ndata: {}\n\n"
+            return
+        if not changed:
+            yield b": keepalive\n\n"
+        events = await subscription.get(interval)
+        if not events:
+            metrics.inc("generation_events_reloads")
+            try:
+                events = await reload(sorted(remaining))
+            except Exception as exc:
+                logger.warning("Failed to reload generation states: %s", exc)
+
+
+class GenerationEventStream(StreamingResponse):
+    """초기 상태 → 상태 전이 이벤트를 SSE 로 전송, 모든 generation 이 종료 상태가 되면 end 후 종료
+
+    스트림을 시작하기 전에 연결이 끊겨도 구독이 해제되도록 응답 단위로 정리한다.
+    """
+
+    def __init__(
+        self,
+        subscription: Subscription,
+        initial: list[GenerationEvent],
+        reload: EventLoader = load_generation_events,
+    ) -> None:
+        super().__init__(
+            _stream(
+                subscription, initial, settings.GENERATION_EVENTS_KEEPALIVE_SECONDS, reload
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.subscription.close()
@@ -0,0 +1,265 @@
+"""
+Generation 작업 큐
+tasks 테이블을 내구성 있는 큐로 사용 (queued → running → success/failed)
+API는 enqueue만 하고, 실제 fal.ai 호출은 워커 프로세스(app.worker)가 담당
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .credits import refund_credits
+from .generation_events import GenerationEvent, generation_event, publish_generation
+from .models import (
+    TERMINAL_GENERATION_STATUSES,
+    Generation,
+    GenerationStatus,
+    Task,
+    TaskStatus,
+)
+from .rehost import schedule_rehost
+
+GENERATION_TASK_TYPE = "generation"
+
+# queue_depth 캐시 (POST /generations 마다 COUNT 쿼리를 보내지 않도록)
+_QUEUE_DEPTH_CACHE_SECONDS = 1.0
+_queue_depth_cache: tuple[float, int] = (0.0, 0)
+
+
+def _finish_task(task: Task, status: str, error: Optional[str] = None) -> None:
+    # 종료 상태 값(success/failed/canceled)은 TaskStatus와 GenerationStatus가 동일
+    task.status = status
+    task.finished_at = datetime.utcnow()
+    if error is not None:
+        task.last_error_message = error
+
+
+def _commit_and_publish(db: Session, generation: Generation) -> None:
+    """commit 후 상태 이벤트 발행 (이벤트는 commit 전에 만들어 만료된 속성을 다시 읽지 않음)"""
+    event = generation_event(generation)
+    db.commit()
+    publish_generation(event)
+
+
+def _lock_generation(
+    db: Session, task: Task, skip_locked: bool = False
+) -> Optional[Generation]:
+    """task 의 Generation 을 행 잠금으로 다시 읽음
+
+    결과 콜백(apply_generation_callback)도 같은 행을 잠그므로 종료 상태 확인과 쓰기가 겹치지 않는다.
+    skip_locked 이면 다른 트랜잭션이 잠그고 있을 때 None.
+    """
+    # populate_existing 이 아직 flush 되지 않은 변경(콜백의 request_id 등)을 덮어쓰지 않도록
+    db.flush()
+    return (
+        db.query(Generation)
+        .filter(Generation.id == task.generation_id)
+        .populate_existing()
+        .with_for_update(skip_locked=skip_locked)
+        .one_or_none()
+    )
+
+
+def enqueue_generation(db: Session, generation: Generation) -> Task:
+    """Generation 작업을 큐에 추가 (commit은 호출자가 수행)"""
+    task = Task(
+        generation=generation,
+        task_type=GENERATION_TASK_TYPE,
+        status=TaskStatus.QUEUED.value,
+        retry_count=0,
+    )
+    db.add(task)
+    return task
+
+
+def queue_depth(db: Session) -> int:
+    """대기(queued) 중인 generation 작업 수 (짧은 시간 캐시)"""
+    global _queue_depth_cache
+    cached_at, depth = _queue_depth_cache
+    now = time.monotonic()
+    if now - cached_at < _QUEUE_DEPTH_CACHE_SECONDS:
+        return depth
+
+    depth = (
+        db.query(func.count(Task.id))
+        .filter(
+            Task.task_type == GENERATION_TASK_TYPE,
+            Task.status == TaskStatus.QUEUED.value,
+        )
+        .scalar()
+    ) or 0
+    _queue_depth_cache = (now, depth)
+    return depth
+
+
+def claim_queued_tasks(db: Session, worker_id: str, limit: int) -> list[Task]:
+    """대기 중인 작업을 가져와 running 상태로 전환
+
+    PostgreSQL에서는 FOR UPDATE SKIP LOCKED로 여러 워커가 같은 작업을 집지 않도록 한다.
+    """
+    if limit <= 0:
+        return []
+
+    tasks = (
+        db.query(Task)
+        .filter(
+            Task.task_type == GENERATION_TASK_TYPE,
+            Task.status == TaskStatus.QUEUED.value,
+        )
+        .order_by(Task.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    now = datetime.utcnow()
+    for task in tasks:
+        task.status = TaskStatus.RUNNING.value
+        task.worker_id = worker_id
+        task.started_at = now
+    db.commit()
+    return tasks
+
+
+def list_running_tasks(db: Session, worker_id: str) -> list[Task]:
+    """이 워커가 fal.ai에 제출해 둔(request_id 보유) 작업 목록"""
+    return (
+        db.query(Task)
+        .join(Generation, Task.generation_id == Generation.id)
+        .filter(
+            Task.task_type == GENERATION_TASK_TYPE,
+            Task.status == TaskStatus.RUNNING.value,
+            Task.worker_id == worker_id,
+            Generation.request_id.isnot(None),
+        )
+        .order_by(Task.id)
+        .all()
+    )
+
+
+def count_running_tasks(db: Session, worker_id: str) -> int:
+    """이 워커가 제출해 둔 진행 중 작업 수 (콜백 모드에서 폴링 대신 사용)"""
+    return (
+        db.query(func.count(Task.id))
+        .filter(
+            Task.task_type == GENERATION_TASK_TYPE,
+            Task.status == TaskStatus.RUNNING.value,
+            Task.worker_id == worker_id,
+        )
+        .scalar()
+    ) or 0
+
+
+def mark_submitted(db: Session, task: Task, request_id: str) -> None:
+    """fal.ai 제출 완료 기록"""
+    generation = _lock_generation(db, task)
+    if generation.status in TERMINAL_GENERATION_STATUSES:
+        # 제출 응답보다 결과 콜백이 먼저 반영된 경우 (processing 으로 되돌리지 않음)
+        db.commit()
+        return
+    generation.request_id = request_id
+    generation.status = GenerationStatus.PROCESSING.value
+    _commit_and_publish(db, generation)
+
+
+def requeue_task(
+    db: Session, task: Task, reason: str, count_retry: bool = True
+) -> None:
+    """일시적 오류 시 재시도를 위해 다시 queued로 되돌림"""
+    task.status = TaskStatus.QUEUED.value
+    task.worker_id = None
+    task.started_at = None
+    if count_retry:
+        task.retry_count += 1
+    task.last_error_message = reason
+    db.commit()
+
+
+def complete_generation(db: Session, task: Task, result: dict[str, Any]) -> None:
+    """fal.ai 결과를 Generation에 반영"""
+    generation = _lock_generation(db, task)
+    if generation.status in TERMINAL_GENERATION_STATUSES:
+        _finish_task(task, generation.status)
+        db.commit()
+        return
+
+    images = result.get("images") or []
+    if images:
+        generation.image_url = images[0].get("url")
+    generation.seed = (
+        str(result.get("seed")) if result.get("seed") is not None else None
+    )
+    generation.nsfw_flag = any(result.get("has_nsfw_concepts") or [])
+    generation.status = GenerationStatus.SUCCESS.value
+    _finish_task(task, TaskStatus.SUCCESS.value)
+    _commit_and_publish(db, generation)
+
+    if settings.REHOST_IMAGES and generation.image_url:
+        # 임시 CDN URL을 백그라운드에서 자체 스토리지 URL로 교체
+        schedule_rehost(generation.id)
+
+
+def _fail_locked(
+    db: Session, task: Task, generation: Generation, reason: str
+) -> Optional[GenerationEvent]:
+    """잠근 Generation 실패 처리 및 환불, 발행할 이벤트 반환 (이미 종료됐으면 None, commit은 호출자)"""
+    if generation.status in TERMINAL_GENERATION_STATUSES:
+        _finish_task(task, generation.status)
+        return None
+
+    generation.status = GenerationStatus.FAILED.value
+    generation.fail_reason = reason
+    refund_credits(
+        db,
+        generation.buyer_id,
+        generation.credits_used,
+        reference_id=str(generation.id),
+    )
+    _finish_task(task, TaskStatus.FAILED.value, reason)
+    return generation_event(generation)
+
+
+def fail_generation(db: Session, task: Task, reason: str) -> None:
+    """Generation 실패 처리 및 선차감 크레딧 환불"""
+    event = _fail_locked(db, task, _lock_generation(db, task), reason)
+    db.commit()
+    if event is not None:
+        publish_generation(event)
+
+
+def list_stale_tasks(db: Session, timeout_seconds: int) -> list[Task]:
+    """timeout을 넘긴 running 작업 (워커 중단 등으로 방치된 작업)"""
+    cutoff = datetime.utcnow() - timedelta(seconds=timeout_seconds)
+    return (
+        db.query(Task)
+        .filter(
+            Task.task_type == GENERATION_TASK_TYPE,
+            Task.status == TaskStatus.RUNNING.value,
+            Task.started_at < cutoff,
+        )
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def fail_stale_tasks(db: Session, timeout_seconds: int) -> int:
+    """timeout을 넘긴 running 작업을 한 트랜잭션에서 실패 처리, 실패 처리한 수 반환
+
+    작업 행 잠금이 commit 까지 유지되도록 한 번만 commit 한다.
+    콜백이 반영 중인(잠긴) Generation 은 건너뛰고 다음 주기에 다시 확인한다.
+    """
+    events = []
+    for task in list_stale_tasks(db, timeout_seconds):
+        generation = _lock_generation(db, task, skip_locked=True)
+        if generation is None:
+            continue
+        event = _fail_locked(db, task, generation, "Generation timed out")
+        if event is not None:
+            events.append(event)
+    db.commit()
+    for event in events:
+        publish_generation(event)
+    return len(events)
@@ -0,0 +1,62 @@
+"""
+Generation 요청 idempotency 처리
+(buyer_id, idempotency_key) 유니크 인덱스가 최종 판정, 프로세스 내 LRU는 조회 캐시
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import Generation
+
+
+class IdempotencyCache:
+    """(buyer_id, idempotency_key) → generation_id LRU 캐시"""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[int, str], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, buyer_id: int, key: str) -> Optional[int]:
+        with self._lock:
+            generation_id = self._entries.get((buyer_id, key))
+            if generation_id is not None:
+                self._entries.move_to_end((buyer_id, key))
+            return generation_id
+
+    def set(self, buyer_id: int, key: str, generation_id: int) -> None:
+        with self._lock:
+            self._entries[(buyer_id, key)] = generation_id
+            self._entries.move_to_end((buyer_id, key))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+idempotency_cache = IdempotencyCache(settings.IDEMPOTENCY_CACHE_SIZE)
+
+
+def find_generation_by_key(
+    db: Session, buyer_id: int, key: str
+) -> Optional[Generation]:
+    """이미 처리된 idempotency_key면 해당 Generation 반환"""
+    generation_id = idempotency_cache.get(buyer_id, key)
+    if generation_id is not None:
+        generation = db.get(Generation, generation_id)
+        if generation is not None:
+            return generation
+
+    generation = (
+        db.query(Generation)
+        .filter(
+            Generation.buyer_id == buyer_id,
+            Generation.idempotency_key == key,
+        )
+        .first()
+    )
+    if generation is not None:
+        idempotency_cache.set(buyer_id, key, generation.id)
+    return generation
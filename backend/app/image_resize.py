@@ -0,0 +1,223 @@
+"""
+온디맨드 이미지 리사이즈 (/img/{key}?w=&h=&fmt=)
+
+- 원본은 스토리지 백엔드의 콘텐츠 주소 객체(objects/...)만 허용 → 내용이 바뀌지 않으므로 캐시 무효화 불필요
+- 디코딩/리사이즈/인코딩은 app.derivatives 의 프로세스 풀에서 실행
+- 결과는 IMG_CACHE_DIR 디스크 캐시에 저장, IMG_CACHE_MAX_BYTES 초과 시 LRU 순으로 삭제
+- 같은 변형(key, w, h, fmt)을 동시에 요청하면 렌더링은 한 번만 수행 (single-flight)
+- 캐시 조회(최초 인덱스 적재 포함)와 파일 읽기는 스레드풀에서 실행, 응답은 읽어 둔 바이트로 보냄
+  (응답 도중 다른 요청의 put 이 같은 파일을 삭제해도 영향 없음)
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, ImageOps
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+from .derivatives import _get_process_pool, avif_supported
+from .local_storage import _ensure_dir, write_file_atomically
+from .metrics import metrics
+from .storage import OBJECTS_PREFIX, get_storage_backend
+
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "png": ("PNG", "image/png"),
+    "avif": ("AVIF", "image/avif"),
+}
+
+_OBJECT_KEY = re.compile(
+    rf"^{OBJECTS_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.[A-Za-z0-9]+)+$"
+)
+
+
+class ImageVariantError(ValueError):
+    """잘못된 원본 키 / 크기 / 포맷"""
+
+
+def render_resized(
+    data: bytes, width: Optional[int], height: Optional[int], image_format: str, quality: int
+) -> bytes:
+    """w/h 중 하나만 주면 비율 유지, 둘 다 주면 중앙 기준으로 잘라 맞춤 (확대는 하지 않음)"""
+    with Image.open(BytesIO(data)) as opened:
+        image = ImageOps.exif_transpose(opened)
+        if image_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        source_width, source_height = image.size
+        if width and height:
+            scale = min(1.0, source_width / width, source_height / height)
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = ImageOps.fit(image, size, Image.LANCZOS)
+        else:
+            box = (width or source_width, height or source_height)
+            image = image.copy()
+            image.thumbnail(box, Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format=image_format, quality=quality)
+        return buffer.getvalue()
+
+
+class DiskLRUCache:
+    """크기 제한 디스크 캐시 (프로세스 내 인덱스 기준 LRU)"""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name[:2] / name
+
+    def _load(self) -> None:
+        """기존 캐시 파일을 접근 시각 순으로 인덱스에 적재 (최초 1회)"""
+        files = []
+        if self.directory.exists():
+            for entry in self.directory.glob("*/*"):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_atime, entry.name, st.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_bytes += size
+        self._loaded = True
+
+    def get(self, name: str) -> Optional[Path]:
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if name not in self._entries:
+                return None
+            path = self._path(name)
+            if not path.exists():
+                # 다른 프로세스가 삭제한 경우
+                self._total_bytes -= self._entries.pop(name)
+                return None
+            self._entries.move_to_end(name)
+            return path
+
+    def read(self, name: str) -> Optional[bytes]:
+        """캐시된 내용 (없거나 조회 직후 삭제됐으면 None)"""
+        path = self.get(name)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                size = self._entries.pop(name, None)
+                if size is not None:
+                    self._total_bytes -= size
+            return None
+
+    def put(self, name: str, data: bytes) -> Path:
+        path = self._path(name)
+        _ensure_dir(path.parent)
+        write_file_atomically(BytesIO(data), path)
+
+        evicted = []
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._total_bytes += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_name, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                evicted.append(old_name)
+        for old_name in evicted:
+            try:
+                os.unlink(self._path(old_name))
+            except FileNotFoundError:
+                pass
+        if evicted:
+            metrics.inc("img_cache_evictions", len(evicted))
+        return path
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total_bytes}
+
+
+image_cache = DiskLRUCache(settings.IMG_CACHE_DIR, settings.IMG_CACHE_MAX_BYTES)
+metrics.register_collector("img_cache", image_cache.stats)
+
+# 진행 중인 렌더링 (이벤트 루프 스레드에서만 접근)
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def variant_name(key: str, width: Optional[int], height: Optional[int], fmt: str) -> str:
+    """캐시 파일명 겸 ETag (원본이 불변이므로 같은 변형은 항상 같은 내용)"""
+    digest = hashlib.sha256(f"{key}|{width}|{height}".encode()).hexdigest()
+    return f"{digest}.{fmt}"
+
+
+def validate_variant(key: str, width: Optional[int], height: Optional[int], fmt: str) -> None:
+    if not _OBJECT_KEY.match(key):
+        raise ImageVariantError("Unknown image")
+    if fmt not in FORMATS or (fmt == "avif" and not avif_supported()):
+        raise ImageVariantError(f"Unsupported format: {fmt}")
+    if width is None and height is None:
+        raise ImageVariantError("w or h is required")
+
+
+async def _render(key: str, width: Optional[int], height: Optional[int], fmt: str, name: str) -> bytes:
+    data = await run_in_threadpool(get_storage_backend().read_bytes, key)
+    loop = asyncio.get_running_loop()
+    encoded = await loop.run_in_executor(
+        _get_process_pool(),
+        render_resized,
+        data,
+        width,
+        height,
+        FORMATS[fmt][0],
+        settings.DERIVATIVE_QUALITY,
+    )
+    metrics.inc("img_renders")
+    await run_in_threadpool(image_cache.put, name, encoded)
+    return encoded
+
+
+async def get_variant(key: str, width: Optional[int], height: Optional[int], fmt: str) -> bytes:
+    """변형 이미지 바이트 반환 (캐시에 없으면 렌더링, 동시 요청은 하나의 렌더링을 공유)"""
+    name = variant_name(key, width, height, fmt)
+    data = await run_in_threadpool(image_cache.read, name)
+    if data is not None:
+        metrics.inc("img_cache_hits")
+        return data
+    metrics.inc("img_cache_misses")
+
+    future = _inflight.get(name)
+    if future is not None:
+        metrics.inc("img_renders_coalesced")
+        return await asyncio.shield(future)
+
+    future = asyncio.ensure_future(_render(key, width, height, fmt, name))
+    _inflight[name] = future
+    try:
+        return await asyncio.shield(future)
+    finally:
+        if future.done():
+            _inflight.pop(name, None)
+        else:
+            # 첫 요청이 취소돼도 렌더링은 계속되고, 끝나면 목록에서 제거
+            future.add_done_callback(lambda _: _inflight.pop(name, None))
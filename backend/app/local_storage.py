@@ -3,89 +3,74 @@
 
 서버의 로컬 디스크에 파일을 저장합니다.
 로컬 테스트 환경에서 빠른 업로드 속도를 위해 사용합니다.
+
+- 고정 크기 청크로 임시 파일에 기록 → fsync → rename 으로 원자적으로 교체하므로
+  /static 에서 쓰다 만 파일이 서빙되지 않습니다.
+- 폴더 생성(mkdir)은 폴더당 한 번만 수행합니다.
+- 블로킹 함수이므로 async 경로에서는 스레드풀에서 호출합니다 (app.uploads 참고).
 """
-import uuid
 import os
+import tempfile
+import threading
 from pathlib import Path
 from typing import BinaryIO
 
 from .config import settings
 
+# 파일 전체를 메모리에 올리지 않고 청크 단위로 복사
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# 이미 생성 확인한 폴더 (mkdir 시스템 콜 반복 방지)
+_created_dirs: set[str] = set()
+_created_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> None:
+    key = str(path)
+    if key in _created_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    with _created_dirs_lock:
+        _created_dirs.add(key)
+
 
 def get_upload_dir() -> Path:
     """업로드 디렉토리 경로 반환"""
     upload_dir = Path(settings.UPLOAD_DIR)
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(upload_dir)
     return upload_dir
 
 
-def upload_file_to_local(
-    file_content: BinaryIO,
-    file_name: str,
-    folder: str = "training",
-    content_type: str = "image/jpeg",
-) -> str:
-    """
-    파일을 로컬 디스크에 저장하고 URL 반환
-    
-    Args:
-        file_content: 파일 내용 (BinaryIO)
-        file_name: 원본 파일명
-        folder: 저장할 폴더 경로 (예: "training-requests/1", "avatars/1")
-        content_type: 파일 MIME 타입
-    
-    Returns:
-        파일 URL (예: "/static/training-requests/1/preview.jpg")
-    """
-    upload_dir = get_upload_dir()
-    
-    # 고유한 파일명 생성
-    file_ext = Path(file_name).suffix or ".jpg"
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    
-    # 전체 경로 생성
-    folder_path = upload_dir / folder
-    folder_path.mkdir(parents=True, exist_ok=True)
-    
-    file_path = folder_path / unique_filename
-    
+def write_file_atomically(file_content: BinaryIO, file_path: Path) -> int:
+    """같은 폴더의 임시 파일에 청크 단위로 기록한 뒤 fsync 후 rename, 기록한 바이트 수 반환"""
     try:
-        # 파일을 처음으로 되돌림 (읽기 후 위치 초기화)
-        file_content.seek(0)
-        
-        # 파일 저장
-        with open(file_path, "wb") as f:
-            f.write(file_content.read())
-        
-        # URL 생성 (정적 파일 서빙 경로)
-        # 예: /static/training-requests/1/preview.jpg
-        static_url = f"/static/{folder}/{unique_filename}"
-        return static_url
-        
-    except Exception as e:
-        raise Exception(f"Failed to upload file to local storage: {str(e)}")
-
-
-def upload_multiple_files_to_local(
-    files: list[BinaryIO],
-    file_names: list[str],
-    folder: str = "training",
-    content_type: str = "image/jpeg",
-) -> list[str]:
-    """
-    여러 파일을 로컬 디스크에 저장하고 URL 리스트 반환
-    
-    Args:
-        files: 파일 내용 리스트
-        file_names: 원본 파일명 리스트
-        folder: 저장할 폴더 경로
-        content_type: 파일 MIME 타입
-    
-    Returns:
-        파일 URL 리스트
-    """
-    urls = []
-    for file_content, file_name in zip(files, file_names):
-        url = upload_file_to_local(file_content, file_name, folder, content_type)
-        urls.append(url)
-    return urls
+        fd, tmp_path = tempfile.mkstemp(
+            dir=file_path.parent, prefix=".upload-", suffix=".part"
+        )
+    except FileNotFoundError:
+        # 캐시된 폴더가 외부에서 삭제된 경우 다시 생성
+        with _created_dirs_lock:
+            _created_dirs.discard(str(file_path.parent))
+        _ensure_dir(file_path.parent)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=file_path.parent, prefix=".upload-", suffix=".part"
+        )
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = file_content.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+                written += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return written
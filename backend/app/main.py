@@ -1,25 +1,86 @@
+import json
 from datetime import datetime
-from typing import List
-
-from fastapi import Depends, FastAPI, File, Form, HTTPException, UploadFile, status
+from typing import List, Optional
+
+from fastapi import (
+    Depends,
+    FastAPI,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
+from PIL import UnidentifiedImageError
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .auth import (
-    authenticate_user,
+    aauthenticate_user,
     create_access_token,
     create_refresh_token,
-    get_password_hash,
     get_user_by_email,
     get_user_by_nickname,
     verify_token,
 )
+from .callbacks import (
+    SIGNATURE_HEADER,
+    apply_generation_callback,
+    verify_generation_token,
+    verify_signature,
+)
 from .config import settings
-from .db import Base, engine, get_db
-from .dependencies import get_current_user
-from .models import Avatar, Generation, GenerationStatus, Transaction, TrainingRequest, User
-from .fal_client import run_generation_sync
+from .db import Base, engine, get_async_db, get_db
+from .dependencies import get_current_user, get_current_user_async
+from .fal_client import aclose_clients, init_clients
+from .credits import InsufficientCreditsError, debit_credits
+from .derivatives import schedule_avatar_derivatives
+from .derivatives import shutdown_pools as shutdown_derivative_pools
+from .generation_events import (
+    EventBrokerUnavailableError,
+    GenerationEventStream,
+    close_event_broker,
+    generation_event,
+    get_event_broker,
+)
+from .generation_queue import enqueue_generation, queue_depth
+from .image_resize import (
+    FORMATS,
+    ImageVariantError,
+    get_variant,
+    validate_variant,
+    variant_name,
+)
+from .idempotency import find_generation_by_key, idempotency_cache
+from .metrics import metrics
+from .pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, NEXT_CURSOR_HEADER
+from .models import Avatar, Generation, GenerationStatus, TrainingRequest, User
+from .password_hashing import PasswordHasherBusyError, ahash_password
+from .password_hashing import shutdown_executor as shutdown_password_executor
+from .read_queries import (
+    fetch_avatar_page,
+    fetch_generation,
+    fetch_generation_page,
+    fetch_generations,
+    fetch_training_request_page,
+)
+from .rehost import shutdown_executor as shutdown_rehost_executor
+from .responses import (
+    AVATAR_LIST,
+    GENERATION,
+    GENERATION_LIST,
+    TRAINING_REQUEST_LIST,
+    orm_json_response,
+)
+from .static_files import IMMUTABLE_CACHE_CONTROL, CachedStaticFiles
 from .schemas import (
     AdminUpgradeRequest,
     AvatarResponse,
@@ -28,14 +89,30 @@ from .schemas import (
     GenerationResponse,
     RefreshTokenRequest,
     RefreshTokenResponse,
+    PresignedUpload,
     TrainingRequestResponse,
+    TrainingUploadInitRequest,
+    TrainingUploadInitResponse,
     UserLoginRequest,
     UserLoginResponse,
     UserRegisterRequest,
     UserBase,
 )
+from .storage import (
+    LocalStorageBackend,
+    StoredObject,
+    UploadVerificationError,
+    add_references,
+    content_key,
+    get_storage_backend,
+    key_from_url,
+    release_reference,
+    verify_local_upload_signature,
+)
+from .uploads import spool_request_body, store_files_concurrently, upload_entries
+from .user_cache import AuthUser, user_auth_cache
 
-app = FastAPI(title=settings.PROJECT_NAME)
+app = FastAPI(title=settings.PROJECT_NAME, default_response_class=ORJSONResponse)
 
 # CORS 설정
 app.add_middleware(
@@ -48,6 +125,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # 로컬 스토리지 사용 시 정적 파일 서빙 설정
@@ -58,8 +136,8 @@ if settings.STORAGE_TYPE == "local":
     upload_dir = Path(settings.UPLOAD_DIR)
     upload_dir.mkdir(parents=True, exist_ok=True)
     
-    # /static 경로로 업로드된 파일 서빙
-    app.mount("/static", StaticFiles(directory=str(upload_dir)), name="static")
+    # /static 경로로 업로드된 파일 서빙 (immutable 캐시, ETag/Range, 파생 포맷 협상)
+    app.mount("/static", CachedStaticFiles(directory=str(upload_dir)), name="static")
 
 
 @app.on_event("startup")
@@ -67,6 +145,17 @@ def on_startup() -> None:
     # 초기 단계에서는 자동으로 테이블을 생성하도록 두고,
     # 이후 Alembic 마이그레이션으로 전환한다.
     Base.metadata.create_all(bind=engine)
+    init_clients()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    # 진행 중인 재호스팅이 공유 HTTP 클라이언트를 쓰므로 먼저 끝낸다
+    await run_in_threadpool(shutdown_rehost_executor)
+    await run_in_threadpool(shutdown_derivative_pools)
+    await run_in_threadpool(shutdown_password_executor)
+    await close_event_broker()
+    await aclose_clients()
 
 
 @app.get("/health", tags=["system"])
@@ -74,50 +163,72 @@ def health_check() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["system"])
+def get_metrics() -> dict:
+    return metrics.snapshot()
+
+
+def _password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login requests. Please retry later.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.post("/auth/register", response_model=UserBase, status_code=status.HTTP_201_CREATED, tags=["auth"])
-def register(
+async def register(
     payload: UserRegisterRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> UserBase:
     """회원가입"""
     # 이메일 중복 확인
-    existing_user = get_user_by_email(db, payload.email)
+    existing_user = await db.run_sync(get_user_by_email, payload.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    existing_nickname = get_user_by_nickname(db, payload.nickname)
+    existing_nickname = await db.run_sync(get_user_by_nickname, payload.nickname)
     if existing_nickname:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Nickname already in use",
         )
 
+    # bcrypt는 해싱 전용 풀에서 실행 (요청 스레드풀을 점유하지 않음)
+    try:
+        password_hash = await ahash_password(payload.password)
+    except PasswordHasherBusyError:
+        raise _password_hasher_busy()
+
     # 새 사용자 생성
     new_user = User(
         email=payload.email,
         nickname=payload.nickname,
-        password_hash=get_password_hash(payload.password),
+        password_hash=password_hash,
         role=payload.role,
         locale=payload.locale,
         credit_balance=0,
         status="active",
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return UserBase.model_validate(new_user)
 
 
 @app.post("/auth/login", response_model=UserLoginResponse, tags=["auth"])
-def login(
+async def login(
     payload: UserLoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> UserLoginResponse:
     """로그인"""
-    user = authenticate_user(db, payload.email, payload.password)
+    try:
+        user = await aauthenticate_user(db, payload.email, payload.password)
+    except PasswordHasherBusyError:
+        raise _password_hasher_busy()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -125,9 +236,9 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # last_login_at 업데이트
+    # last_login_at 업데이트 (cost가 바뀌어 재해싱된 password_hash 도 함께 저장)
     user.last_login_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
     # JWT 토큰 생성
     access_token = create_access_token(data={"sub": user.id})
@@ -188,15 +299,22 @@ def refresh_token(
 
 @app.get("/auth/me", response_model=UserBase, tags=["auth"])
 def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
 ) -> UserBase:
     """현재 로그인한 사용자 정보 조회"""
-    return UserBase.model_validate(current_user)
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    return UserBase.model_validate(user)
 
 
 @app.post("/auth/upgrade-to-seller", response_model=UserBase, tags=["auth"])
 def upgrade_to_seller(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> UserBase:
     """Deprecated: user-initiated upgrade is not allowed."""
@@ -218,7 +336,7 @@ def _is_admin_email(email: str) -> bool:
 @app.post("/admin/influencer-approve", response_model=UserBase, tags=["admin"])
 def admin_approve_influencer(
     payload: AdminUpgradeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> UserBase:
     from .models import UserRole
@@ -253,26 +371,42 @@ def admin_approve_influencer(
     target_user.role = UserRole.INFLUENCER.value
     db.commit()
     db.refresh(target_user)
+    user_auth_cache.invalidate(target_user.id)
 
     return UserBase.model_validate(target_user)
 
 
 @app.post("/generations", response_model=GenerationResponse, tags=["generation"])
-def create_generation(
+async def create_generation(
     payload: GenerationCreateRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
 ) -> GenerationResponse:
-    # TODO: 프롬프트 필터링, idempotency 체크 구현
+    # TODO: 프롬프트 필터링 구현
+
+    # 크레딧/큐 로직은 동기 Session API를 그대로 쓰되, 스레드풀 대신 async 커넥션 위에서 실행
+    return await db.run_sync(_create_generation, payload, current_user)
 
-    # 인증된 사용자를 buyer로 사용
-    buyer = current_user
+
+def _create_generation(
+    db: Session, payload: GenerationCreateRequest, buyer: AuthUser
+) -> GenerationResponse:
+    # 같은 idempotency_key 재요청이면 원래 결과를 그대로 반환 (크레딧/fal.ai 재사용 없음)
+    existing = find_generation_by_key(db, buyer.id, payload.idempotency_key)
+    if existing is not None:
+        return GenerationResponse.model_validate(existing)
 
     total_credits = 1 + payload.option_credits
-    if buyer.credit_balance < total_credits:
+
+    # 백프레셔: 처리할 수 없는 양의 작업은 받지 않고 재시도를 유도
+    depth = queue_depth(db)
+    metrics.set_gauge("generation_queue_depth", depth)
+    if depth >= settings.GENERATION_QUEUE_MAX_DEPTH:
+        metrics.inc("generation_rejected_backpressure")
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Insufficient credits.",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation queue is full. Please retry later.",
+            headers={"Retry-After": str(settings.GENERATION_RETRY_AFTER_SECONDS)},
         )
 
     if payload.avatar_id is not None:
@@ -283,111 +417,210 @@ def create_generation(
                 detail="Avatar not found. Please select an avatar first.",
             )
 
-    # 크레딧 선차감
-    before = buyer.credit_balance
-    buyer.credit_balance -= total_credits
-
     generation = Generation(
         avatar_id=payload.avatar_id,
         buyer_id=buyer.id,
         credits_used=total_credits,
         prompt=payload.prompt,
+        idempotency_key=payload.idempotency_key,
         status=GenerationStatus.PENDING.value,
     )
     db.add(generation)
 
-    tx = Transaction(
-        user_id=buyer.id,
-        type="generation",
-        amount=-total_credits,
-        currency="CREDIT",
-        credit_before=before,
-        credit_after=buyer.credit_balance,
-        reference_id=None,
-    )
-    db.add(tx)
-    db.commit()
-    db.refresh(generation)
-
     try:
-        response_payload = run_generation_sync(payload.prompt)
-        images = response_payload.get("images") or []
-        if images:
-            generation.image_url = images[0].get("url")
-        generation.seed = (
-            str(response_payload.get("seed"))
-            if response_payload.get("seed") is not None
-            else None
-        )
-        generation.nsfw_flag = any(
-            response_payload.get("has_nsfw_concepts") or []
-        )
-        generation.status = GenerationStatus.SUCCESS.value
-        db.commit()
-        db.refresh(generation)
-    except Exception as exc:
-        generation.status = GenerationStatus.FAILED.value
-        generation.fail_reason = str(exc)
-
-        refund_before = buyer.credit_balance
-        buyer.credit_balance += total_credits
-        tx_refund = Transaction(
-            user_id=buyer.id,
-            type="refund",
-            amount=total_credits,
-            currency="CREDIT",
-            credit_before=refund_before,
-            credit_after=buyer.credit_balance,
-            reference_id=str(generation.id),
-        )
-        db.add(tx_refund)
+        # Generation을 먼저 flush해 idempotency_key를 선점
+        # 동시에 같은 키로 들어온 요청은 유니크 인덱스에서 막혀 아래에서 기존 결과를 반환
+        db.flush()
+
+        # 크레딧 선차감
+        debit_credits(db, buyer.id, total_credits, reference_id=str(generation.id))
+
+        # 실제 생성은 워커(app.worker)가 처리하므로 큐에 넣고 바로 pending 응답
+        enqueue_generation(db, generation)
         db.commit()
-        db.refresh(generation)
+    except InsufficientCreditsError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient credits.",
+        )
+    except IntegrityError:
+        db.rollback()
+        existing = find_generation_by_key(db, buyer.id, payload.idempotency_key)
+        if existing is None:
+            raise
+        return GenerationResponse.model_validate(existing)
+
+    db.refresh(generation)
+    idempotency_cache.set(buyer.id, payload.idempotency_key, generation.id)
 
     return GenerationResponse.model_validate(generation)
 
 
+def _parse_generation_ids(raw: str) -> list[int]:
+    try:
+        generation_ids = sorted({int(part) for part in raw.split(",") if part.strip()})
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated generation ids",
+        )
+    if not generation_ids or len(generation_ids) > settings.GENERATION_EVENTS_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must contain 1 to {settings.GENERATION_EVENTS_MAX_IDS} generation ids",
+        )
+    return generation_ids
+
+
+# /generations/{generation_id} 보다 먼저 등록해야 "events" 가 id 로 매칭되지 않는다
+@app.get("/generations/events", tags=["generation"])
+async def stream_generation_events(
+    ids: str = Query(..., description="쉼표로 구분한 generation id (예: 1,2,3)"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Generation 상태 스트림 (Server-Sent Events, GET /generations/{id} 폴링 대체)
+
+    현재 상태를 먼저 `event: generation` 으로 보내고, 이후 상태가 바뀔 때마다 같은 형식으로 보낸다.
+    모두 종료 상태(success/failed/canceled)가 되면 `event: end` 를 보내고 연결을 닫는다.
+    """
+    generation_ids = _parse_generation_ids(ids)
+    try:
+        # 초기 상태를 읽기 전에 구독해야 그 사이의 전이를 놓치지 않는다
+        subscription = await get_event_broker().subscribe(generation_ids)
+    except EventBrokerUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Generation events are unavailable. Please retry later.",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        generations = await fetch_generations(db, generation_ids)
+        # 스트리밍하는 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션 종료
+        await db.rollback()
+        if len(generations) != len(generation_ids):
+            raise HTTPException(status_code=404, detail="Generation not found.")
+    except BaseException:
+        subscription.close()
+        raise
+
+    return GenerationEventStream(
+        subscription, [generation_event(generation) for generation in generations]
+    )
+
+
 @app.get("/generations/{generation_id}", response_model=GenerationResponse, tags=["generation"])
-def get_generation(
+async def get_generation(
     generation_id: int,
-    db: Session = Depends(get_db),
-) -> GenerationResponse:
-    generation = db.query(Generation).filter(Generation.id == generation_id).first()
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    generation = await fetch_generation(db, generation_id)
     if not generation:
         raise HTTPException(status_code=404, detail="Generation not found.")
 
-    return GenerationResponse.model_validate(generation)
+    return orm_json_response(GENERATION, generation)
 
 
-@app.get("/my/generations", response_model=list[GenerationResponse], tags=["generation"])
-def list_my_generations(
+@app.post("/callbacks/generations", tags=["generation"])
+async def generation_callback(
+    request: Request,
+    generation_id: Optional[int] = Query(None),
+    token: Optional[str] = Query(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> list[GenerationResponse]:
-    """현재 로그인 사용자가 생성한 이미지 목록 (최신순)"""
-    generations = (
-        db.query(Generation)
-        .filter(Generation.buyer_id == current_user.id)
-        .order_by(Generation.created_at.desc())
-        .all()
+):
+    """GPU 워커 / fal.ai webhook 결과 콜백 (HMAC 서명 검증, request_id 기준 멱등)"""
+    raw_body = await request.body()
+    signed = verify_signature(raw_body, request.headers.get(SIGNATURE_HEADER))
+    if not signed and not (
+        generation_id is not None and verify_generation_token(generation_id, token)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid callback signature",
+        )
+
+    try:
+        body = json.loads(raw_body)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+
+    generation = await run_in_threadpool(
+        apply_generation_callback, db, body, None if signed else generation_id
     )
-    return [GenerationResponse.model_validate(g) for g in generations]
+    if generation is None:
+        raise HTTPException(status_code=404, detail="Generation not found.")
+
+    return {"generation_id": generation.id, "status": generation.status}
+
+
+@app.get("/my/generations", response_model=list[GenerationResponse], tags=["generation"])
+async def list_my_generations(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
+) -> Response:
+    """현재 로그인 사용자가 생성한 이미지 목록 (최신순, 다음 페이지 커서는 X-Next-Cursor 헤더)"""
+    generations, next_cursor = await fetch_generation_page(db, current_user.id, cursor, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return orm_json_response(GENERATION_LIST, generations, headers)
 
 
 # Training Requests API
 @app.get("/my/training-requests", response_model=list[TrainingRequestResponse], tags=["training"])
-def list_my_training_requests(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> list[TrainingRequestResponse]:
+async def list_my_training_requests(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
+) -> Response:
     """내 학습 요청 목록 조회"""
-    requests = (
-        db.query(TrainingRequest)
-        .filter(TrainingRequest.user_id == current_user.id)
-        .order_by(TrainingRequest.created_at.desc())
-        .all()
+    requests, next_cursor = await fetch_training_request_page(
+        db, current_user.id, cursor, limit
     )
-    return [TrainingRequestResponse.model_validate(r) for r in requests]
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return orm_json_response(TRAINING_REQUEST_LIST, requests, headers)
+
+
+def _validate_training_request(
+    is_real_person: bool,
+    instagram_id: Optional[str],
+    front_count: int,
+    side_count: int,
+    fullbody_count: int,
+    other_count: int,
+) -> None:
+    """학습 요청 공통 검증 (multipart 업로드 / presigned 업로드)"""
+    # 실존인물인 경우 Instagram ID 필수
+    if is_real_person is True and not instagram_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Instagram ID is required for real person avatars",
+        )
+
+    # 최소 사진 개수 검증
+    if front_count < 4:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least 4 front photos are required",
+        )
+    if side_count < 4:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least 4 side photos are required",
+        )
+    if fullbody_count < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least 1 full body photo is required",
+        )
+    if other_count < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least 1 other photo is required",
+        )
 
 
 @app.post(
@@ -397,8 +630,8 @@ def list_my_training_requests(
     tags=["training"],
 )
 async def create_training_request(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
     avatar_name: str = Form(...),
     negative_prompt: str = Form(...),
     credit_per_generation: int = Form(...),
@@ -414,47 +647,18 @@ async def create_training_request(
     other_photos: List[UploadFile] = File(default=[]),
 ):
     """학습 요청 생성"""
-    from fastapi import UploadFile, File, Form
-    from io import BytesIO
     from .models import TrainingRequestStatus
-    from .config import settings
-    
-    # 스토리지 타입에 따라 적절한 함수 선택
-    if settings.STORAGE_TYPE == "local":
-        from .local_storage import upload_file_to_local as upload_file, upload_multiple_files_to_local as upload_multiple_files
-    else:
-        from .s3_utils import upload_file_to_s3 as upload_file, upload_multiple_files_to_s3 as upload_multiple_files
-
-    # 실존인물인 경우 Instagram ID 필수
-    if is_real_person is True and not instagram_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Instagram ID is required for real person avatars",
-        )
 
-    # 최소 사진 개수 검증
-    if len(front_photos) < 4:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least 4 front photos are required",
-        )
-    if len(side_photos) < 4:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least 4 side photos are required",
-        )
-    if len(fullbody_photos) < 1:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least 1 full body photo is required",
-        )
-    if len(other_photos) < 1:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least 1 other photo is required",
-        )
+    _validate_training_request(
+        is_real_person,
+        instagram_id,
+        len(front_photos),
+        len(side_photos),
+        len(fullbody_photos),
+        len(other_photos),
+    )
 
-    # TrainingRequest를 먼저 생성하여 ID 획득
+    # TrainingRequest 생성 (업로드 키가 내용 해시 기반이므로 ID를 미리 얻을 필요 없음)
     training_request = TrainingRequest(
         user_id=current_user.id,
         avatar_name=avatar_name,
@@ -469,71 +673,41 @@ async def create_training_request(
     )
 
     db.add(training_request)
-    db.flush()  # ID를 얻기 위해 flush (아직 commit하지 않음)
-    training_request_id = training_request.id
 
-    # 이미지 업로드 (training_request_id 폴더에 저장)
-    preview_image_url = None
-    front_photos_urls = []
-    side_photos_urls = []
-    fullbody_photos_urls = []
-    other_photos_urls = []
+    # 이미지 업로드 (내용 해시 기반 키로 저장, 같은 사진은 다시 쓰지 않음)
+    # 모든 사진을 한 번에 동시 업로드하므로 전체 시간은 가장 느린 업로드 하나와 비슷하다.
+    photo_groups = [
+        upload_entries([preview_image], "preview"),
+        upload_entries(front_photos, "front"),
+        upload_entries(side_photos, "side"),
+        upload_entries(fullbody_photos, "fullbody"),
+        upload_entries(other_photos, "other"),
+    ]
 
     try:
-        # 폴더 경로: training-requests/{training_request_id}/
-        folder_path = f"training-requests/{training_request_id}"
-
-        # 대표 이미지 업로드
-        preview_content = await preview_image.read()
-        preview_image_url = upload_file(
-            BytesIO(preview_content),
-            preview_image.filename or "preview.jpg",
-            folder=folder_path,
-            content_type=preview_image.content_type or "image/jpeg",
-        )
-
-        # 정면 사진들 업로드
-        if front_photos:
-            front_contents = [await photo.read() for photo in front_photos]
-            front_filenames = [photo.filename or f"front_{i}.jpg" for i, photo in enumerate(front_photos)]
-            front_photos_urls = upload_multiple_files(
-                [BytesIO(content) for content in front_contents],
-                front_filenames,
-                folder=folder_path,
-            )
-
-        # 측면 사진들 업로드
-        if side_photos:
-            side_contents = [await photo.read() for photo in side_photos]
-            side_filenames = [photo.filename or f"side_{i}.jpg" for i, photo in enumerate(side_photos)]
-            side_photos_urls = upload_multiple_files(
-                [BytesIO(content) for content in side_contents],
-                side_filenames,
-                folder=folder_path,
-            )
-
-        # 전신 사진들 업로드
-        if fullbody_photos:
-            fullbody_contents = [await photo.read() for photo in fullbody_photos]
-            fullbody_filenames = [photo.filename or f"fullbody_{i}.jpg" for i, photo in enumerate(fullbody_photos)]
-            fullbody_photos_urls = upload_multiple_files(
-                [BytesIO(content) for content in fullbody_contents],
-                fullbody_filenames,
-                folder=folder_path,
-            )
-
-        # 기타 사진들 업로드
-        if other_photos:
-            other_contents = [await photo.read() for photo in other_photos]
-            other_filenames = [photo.filename or f"other_{i}.jpg" for i, photo in enumerate(other_photos)]
-            other_photos_urls = upload_multiple_files(
-                [BytesIO(content) for content in other_contents],
-                other_filenames,
-                folder=folder_path,
-            )
+        stored = await store_files_concurrently(
+            get_storage_backend(),
+            [entry for group in photo_groups for entry in group],
+        )
+        await db.run_sync(add_references, stored)
+        urls = [obj.url for obj in stored]
+
+        # 입력 순서대로 그룹별 URL 분리
+        grouped_urls = []
+        offset = 0
+        for group in photo_groups:
+            grouped_urls.append(urls[offset:offset + len(group)])
+            offset += len(group)
+        (
+            preview_image_urls,
+            front_photos_urls,
+            side_photos_urls,
+            fullbody_photos_urls,
+            other_photos_urls,
+        ) = grouped_urls
 
         # 업로드된 URL들을 TrainingRequest에 저장
-        training_request.preview_image_url = preview_image_url
+        training_request.preview_image_url = preview_image_urls[0]
         training_request.front_photos_urls = front_photos_urls if front_photos_urls else None
         training_request.side_photos_urls = side_photos_urls if side_photos_urls else None
         training_request.fullbody_photos_urls = fullbody_photos_urls if fullbody_photos_urls else None
@@ -541,58 +715,289 @@ async def create_training_request(
 
     except Exception as e:
         # 이미지 업로드 실패 시 롤백
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload images: {str(e)}",
         )
 
     # 모든 업로드가 성공하면 commit
-    db.commit()
-    db.refresh(training_request)
+    await db.commit()
+    await db.refresh(training_request)
+
+    return TrainingRequestResponse.model_validate(training_request)
+
+
+@app.post(
+    "/my/training-requests/uploads",
+    response_model=TrainingUploadInitResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["training"],
+)
+async def init_training_request_upload(
+    payload: TrainingUploadInitRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
+) -> TrainingUploadInitResponse:
+    """학습 요청 1단계: 사진별 presigned PUT URL 발급 (이미지는 API 서버를 거치지 않음)"""
+    from .models import TrainingRequestStatus
+
+    _validate_training_request(
+        payload.is_real_person,
+        payload.instagram_id,
+        len(payload.front_photos),
+        len(payload.side_photos),
+        len(payload.fullbody_photos),
+        len(payload.other_photos),
+    )
+
+    groups = [
+        ("preview_image", [payload.preview_image]),
+        ("front_photos", payload.front_photos),
+        ("side_photos", payload.side_photos),
+        ("fullbody_photos", payload.fullbody_photos),
+        ("other_photos", payload.other_photos),
+    ]
+    for _, slots in groups:
+        for slot in slots:
+            if slot.size > settings.UPLOAD_MAX_PHOTO_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"{slot.file_name} exceeds {settings.UPLOAD_MAX_PHOTO_BYTES} bytes",
+                )
+
+    backend = get_storage_backend()
+    keyed = [
+        (group, index, slot, content_key(slot.sha256, slot.file_name))
+        for group, slots in groups
+        for index, slot in enumerate(slots)
+    ]
+    # 같은 내용이 이미 저장되어 있으면 URL을 발급하지 않는다 (업로드 생략)
+    existing_sizes = await run_in_threadpool(
+        backend.object_sizes, [key for _, _, _, key in keyed]
+    )
+
+    urls_by_group: dict[str, list[str]] = {group: [] for group, _ in groups}
+    for group, _, _, key in keyed:
+        urls_by_group[group].append(backend.url_for(key))
+
+    training_request = TrainingRequest(
+        user_id=current_user.id,
+        avatar_name=payload.avatar_name,
+        negative_prompt=payload.negative_prompt,
+        credit_per_generation=payload.credit_per_generation,
+        national=payload.national,
+        gender=payload.gender,
+        description=payload.description,
+        is_real_person=payload.is_real_person,
+        instagram_id=payload.instagram_id if payload.is_real_person is True else None,
+        preview_image_url=urls_by_group["preview_image"][0],
+        front_photos_urls=urls_by_group["front_photos"],
+        side_photos_urls=urls_by_group["side_photos"],
+        fullbody_photos_urls=urls_by_group["fullbody_photos"],
+        other_photos_urls=urls_by_group["other_photos"],
+        upload_manifest=[
+            {
+                "key": key,
+                "size": slot.size,
+                "sha256": slot.sha256,
+                "content_type": slot.content_type,
+            }
+            for _, _, slot, key in keyed
+        ],
+        status=TrainingRequestStatus.UPLOADING.value,
+    )
+    db.add(training_request)
+    await db.commit()
+
+    uploads = []
+    issued: set[str] = set()
+    for group, index, slot, key in keyed:
+        upload = PresignedUpload(group=group, index=index, key=key)
+        if existing_sizes.get(key) != slot.size and key not in issued:
+            issued.add(key)
+            presigned = backend.presign_put(
+                key,
+                slot.content_type,
+                slot.size,
+                slot.sha256,
+                settings.UPLOAD_URL_EXPIRES_SECONDS,
+            )
+            upload.url = presigned.url
+            upload.headers = presigned.headers
+        uploads.append(upload)
+
+    return TrainingUploadInitResponse(
+        training_request_id=training_request.id,
+        expires_in=settings.UPLOAD_URL_EXPIRES_SECONDS,
+        uploads=uploads,
+    )
+
+
+@app.post(
+    "/my/training-requests/{training_request_id}/confirm",
+    response_model=TrainingRequestResponse,
+    tags=["training"],
+)
+async def confirm_training_request_upload(
+    training_request_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
+) -> TrainingRequestResponse:
+    """학습 요청 2단계: 업로드된 객체의 존재/크기를 한 번에 확인하고 요청 확정"""
+    from .models import TrainingRequestStatus
+
+    training_request = await db.scalar(
+        select(TrainingRequest).where(
+            TrainingRequest.id == training_request_id,
+            TrainingRequest.user_id == current_user.id,
+        )
+    )
+    if not training_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Training request not found",
+        )
+    if training_request.status != TrainingRequestStatus.UPLOADING.value:
+        # 이미 확정된 요청 (confirm 재시도)
+        return TrainingRequestResponse.model_validate(training_request)
+
+    manifest = training_request.upload_manifest or []
+    backend = get_storage_backend()
+    sizes = await run_in_threadpool(
+        backend.object_sizes, [item["key"] for item in manifest]
+    )
+    missing = [item["key"] for item in manifest if sizes.get(item["key"]) != item["size"]]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "Some photos are missing or incomplete", "keys": missing},
+        )
+
+    # 동시 confirm 시 참조 수가 두 번 증가하지 않도록 상태 전이를 조건부 UPDATE로 수행
+    result = await db.execute(
+        update(TrainingRequest)
+        .where(
+            TrainingRequest.id == training_request_id,
+            TrainingRequest.status == TrainingRequestStatus.UPLOADING.value,
+        )
+        .values(
+            status=TrainingRequestStatus.REQUESTED.value,
+            upload_manifest=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        await db.run_sync(
+            add_references,
+            [
+                StoredObject(
+                    key=item["key"],
+                    url=backend.url_for(item["key"]),
+                    size=item["size"],
+                    sha256=item["sha256"],
+                    content_type=item["content_type"],
+                    created=False,
+                )
+                for item in manifest
+            ],
+        )
+    await db.commit()
+    await db.refresh(training_request)
 
     return TrainingRequestResponse.model_validate(training_request)
 
 
+@app.put("/uploads/{key:path}", tags=["training"])
+async def receive_local_upload(
+    key: str,
+    request: Request,
+    size: int = Query(...),
+    expires: int = Query(...),
+    sig: str = Query(...),
+) -> Response:
+    """STORAGE_TYPE=local 에서 presigned PUT URL 역할 (서명/만료/크기/해시 검증)"""
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if not verify_local_upload_signature(key, size, expires, sig):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid or expired upload signature",
+        )
+
+    body = await spool_request_body(request, max_bytes=size)
+    if body is None:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Upload is larger than the signed size",
+        )
+    try:
+        with body:
+            await run_in_threadpool(backend.receive_upload, body, key, size)
+    except UploadVerificationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return Response(status_code=status.HTTP_200_OK)
+
+
+@app.get("/img/{key:path}", tags=["images"])
+async def resize_image(
+    key: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=settings.IMG_MAX_DIMENSION),
+    h: Optional[int] = Query(None, ge=1, le=settings.IMG_MAX_DIMENSION),
+    fmt: str = Query("webp"),
+) -> Response:
+    """저장된 이미지를 요청 크기/포맷으로 변환 (디스크 LRU 캐시, 동일 변형 동시 요청은 1회 렌더링)"""
+    try:
+        validate_variant(key, w, h, fmt)
+    except ImageVariantError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    name = variant_name(key, w, h, fmt)
+    headers = {"cache-control": IMMUTABLE_CACHE_CONTROL, "etag": f'"{name}"'}
+    # 원본과 변형이 모두 불변이므로 ETag가 같으면 캐시 확인 없이 304
+    if request.headers.get("if-none-match") == headers["etag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    try:
+        data = await get_variant(key, w, h, fmt)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    except UnidentifiedImageError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Not an image")
+
+    return Response(content=data, headers=headers, media_type=FORMATS[fmt][1])
+
+
 # Avatars API
 @app.get("/my/avatars", response_model=list[AvatarResponse], tags=["avatars"])
-def list_my_avatars(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> list[AvatarResponse]:
+async def list_my_avatars(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
+) -> Response:
     """내 아바타 목록 조회"""
-    avatars = (
-        db.query(Avatar)
-        .filter(Avatar.user_id == current_user.id)
-        .order_by(Avatar.created_at.desc())
-        .all()
-    )
-    return [AvatarResponse.model_validate(a) for a in avatars]
+    avatars, next_cursor = await fetch_avatar_page(db, current_user.id, cursor, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return orm_json_response(AVATAR_LIST, avatars, headers)
 
 
 @app.put("/my/avatars/{avatar_id}", response_model=AvatarResponse, tags=["avatars"])
 async def update_avatar(
     avatar_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthUser = Depends(get_current_user_async),
     title: str = Form(None),
     credit_per_generation: int = Form(None),
     description: str = Form(None),
     preview_image: UploadFile = File(None),
 ):
     """아바타 수정"""
-    from fastapi import UploadFile, File, Form
-    from io import BytesIO
-    from .config import settings
-    
-    # 스토리지 타입에 따라 적절한 함수 선택
-    if settings.STORAGE_TYPE == "local":
-        from .local_storage import upload_file_to_local as upload_file
-    else:
-        from .s3_utils import upload_file_to_s3 as upload_file
-
     # 아바타 조회 및 권한 확인
-    avatar = db.query(Avatar).filter(Avatar.id == avatar_id).first()
+    avatar = await db.get(Avatar, avatar_id)
     if not avatar:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -605,34 +1010,47 @@ async def update_avatar(
             detail="You don't have permission to update this avatar",
         )
 
-    # 수정 가능한 필드만 업데이트
-    if title is not None:
-        avatar.title = title
-    if credit_per_generation is not None:
-        avatar.credit_per_generation = credit_per_generation
-    if description is not None:
-        avatar.description = description
-
-    # 이미지 업로드 (avatars/{avatar_id}/ 폴더에 저장)
+    # 이미지 업로드 (내용 해시 기반 키, 같은 이미지를 다시 저장하면 쓰기 생략)
+    # 업로드하는 동안 커넥션을 잡고 있지 않도록 조회 트랜잭션을 먼저 끝내고, 업로드 후 다시 읽는다
+    stored = None
     if preview_image:
+        await db.rollback()
         try:
-            image_content = await preview_image.read()
-            folder_path = f"avatars/{avatar_id}"
-            preview_image_url = upload_file(
-                BytesIO(image_content),
+            stored = await run_in_threadpool(
+                get_storage_backend().put,
+                preview_image.file,
                 preview_image.filename or "preview.jpg",
-                folder=folder_path,
-                content_type=preview_image.content_type or "image/jpeg",
+                preview_image.content_type or "image/jpeg",
             )
-            avatar.preview_image_url = preview_image_url
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to upload image: {str(e)}",
             )
+        await db.refresh(avatar)
 
-    db.commit()
-    db.refresh(avatar)
+    # 수정 가능한 필드만 업데이트
+    if title is not None:
+        avatar.title = title
+    if credit_per_generation is not None:
+        avatar.credit_per_generation = credit_per_generation
+    if description is not None:
+        avatar.description = description
+
+    preview_changed = False
+    if stored is not None and stored.url != avatar.preview_image_url:
+        previous_key = key_from_url(avatar.preview_image_url)
+        if previous_key:
+            await db.run_sync(release_reference, previous_key)
+        await db.run_sync(add_references, [stored])
+        avatar.preview_image_url = stored.url
+        avatar.thumbnail_url = None
+        preview_changed = True
+
+    await db.commit()
+    await db.refresh(avatar)
+    if preview_changed and settings.IMAGE_DERIVATIVES:
+        schedule_avatar_derivatives(avatar.id)
 
     return AvatarResponse.model_validate(avatar)
 
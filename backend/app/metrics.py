@@ -0,0 +1,64 @@
+"""
+프로세스 내 메트릭 레지스트리
+카운터/게이지/타이밍을 모아 GET /metrics 로 노출
+"""
+
+import threading
+from typing import Any, Callable
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+        self._timings: dict[str, dict[str, float]] = {}
+        self._collectors: dict[str, Callable[[], dict[str, Any]]] = {}
+
+    def inc(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """소요 시간 기록 (count/sum/max, 초 단위)"""
+        with self._lock:
+            timing = self._timings.get(name)
+            if timing is None:
+                timing = {"count": 0, "sum": 0.0, "max": 0.0}
+                self._timings[name] = timing
+            timing["count"] += 1
+            timing["sum"] += seconds
+            if seconds > timing["max"]:
+                timing["max"] = seconds
+
+    def register_collector(
+        self, name: str, collector: Callable[[], dict[str, Any]]
+    ) -> None:
+        """snapshot 시점에 호출되어 값을 제공하는 수집기 등록 (캐시 통계 등)"""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            timings = {
+                name: {
+                    **timing,
+                    "avg": timing["sum"] / timing["count"] if timing["count"] else 0.0,
+                }
+                for name, timing in self._timings.items()
+            }
+            snapshot = {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": timings,
+            }
+            collectors = dict(self._collectors)
+        snapshot["collectors"] = {name: collect() for name, collect in collectors.items()}
+        return snapshot
+
+
+metrics = MetricsRegistry()
@@ -6,10 +6,12 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -56,6 +58,9 @@ class AvatarStatus(str, Enum):
 
 class Avatar(Base):
     __tablename__ = "avatars"
+    __table_args__ = (
+        Index("ix_avatars_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -73,6 +78,7 @@ class Avatar(Base):
     nsfw_allowed = Column(Boolean, nullable=False, default=False)
     is_public = Column(Boolean, nullable=False, default=False)
     preview_image_url = Column(String, nullable=True)
+    thumbnail_url = Column(String, nullable=True)  # preview_image 썸네일 (app.derivatives)
     status = Column(String, nullable=False, default=AvatarStatus.PENDING)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(
@@ -88,8 +94,23 @@ class GenerationStatus(str, Enum):
     CANCELED = "canceled"
 
 
+TERMINAL_GENERATION_STATUSES = {
+    GenerationStatus.SUCCESS.value,
+    GenerationStatus.FAILED.value,
+    GenerationStatus.CANCELED.value,
+}
+
+
 class Generation(Base):
     __tablename__ = "generations"
+    __table_args__ = (
+        # 같은 buyer의 동일 idempotency_key 재요청은 하나의 Generation으로 수렴
+        UniqueConstraint(
+            "buyer_id", "idempotency_key", name="uq_generations_buyer_idempotency_key"
+        ),
+        # /my/generations 커서 페이지네이션용
+        Index("ix_generations_buyer_created_id", "buyer_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     avatar_id = Column(Integer, ForeignKey("avatars.id"), nullable=True)
@@ -98,7 +119,9 @@ class Generation(Base):
     prompt = Column(Text, nullable=False)
     seed = Column(String, nullable=True)
     request_id = Column(String, nullable=True)
+    idempotency_key = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    thumbnail_url = Column(String, nullable=True)  # image_url 썸네일 (app.derivatives)
     status = Column(String, nullable=False, default=GenerationStatus.PENDING)
     fail_reason = Column(Text, nullable=True)
     nsfw_flag = Column(Boolean, nullable=False, default=False)
@@ -146,6 +169,8 @@ class Task(Base):
     retry_count = Column(Integer, nullable=False, default=0)
     last_error_message = Column(Text, nullable=True)
 
+    generation = relationship("Generation")
+
 
 class ErrorLog(Base):
     __tablename__ = "error_logs"
@@ -232,6 +257,7 @@ class PayoutRequest(Base):
 
 
 class TrainingRequestStatus(str, Enum):
+    UPLOADING = "uploading"  # presigned URL 발급 후 confirm 대기
     REQUESTED = "requested"
     APPROVED_TRAINING = "approved_training"
     REJECTED = "rejected"
@@ -239,6 +265,9 @@ class TrainingRequestStatus(str, Enum):
 
 class TrainingRequest(Base):
     __tablename__ = "training_requests"
+    __table_args__ = (
+        Index("ix_training_requests_user_created_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -256,6 +285,8 @@ class TrainingRequest(Base):
     side_photos_urls = Column(JSONB, nullable=True)
     fullbody_photos_urls = Column(JSONB, nullable=True)
     other_photos_urls = Column(JSONB, nullable=True)
+    # 직접 업로드 대기 중인 객체 목록 [{key, size, sha256, content_type}] (confirm 후 비움)
+    upload_manifest = Column(JSONB, nullable=True)
     status = Column(String, nullable=False, default=TrainingRequestStatus.REQUESTED.value)
     admin_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # 승인/반려한 관리자
     admin_notes = Column(Text, nullable=True)  # 관리자 메모
@@ -264,3 +295,15 @@ class TrainingRequest(Base):
         DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+
+class StorageObject(Base):
+    """콘텐츠 주소 기반 저장 객체 (키 = sha256 기반 경로) 및 참조 수"""
+
+    __tablename__ = "storage_objects"
+
+    key = Column(String, primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(Integer, nullable=False)
+    content_type = Column(String, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
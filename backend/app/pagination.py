@@ -0,0 +1,42 @@
+"""
+커서 기반(keyset) 페이지네이션
+(created_at, id) 내림차순 정렬을 기준으로 다음 페이지 시작 위치를 불투명 커서로 전달
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at_raw, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at_raw), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def split_page(rows: list[Any], limit: int) -> tuple[list[Any], Optional[str]]:
+    """limit + 1 개 조회한 결과를 (한 페이지, 다음 페이지 커서)로 분리"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
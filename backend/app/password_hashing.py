@@ -0,0 +1,108 @@
+"""
+비밀번호 해싱 전용 워커 풀
+
+bcrypt는 한 번에 수백 ms의 CPU를 쓰므로 요청 핸들러(Starlette 스레드풀)에서 직접 돌리면
+로그인이 몰릴 때 다른 엔드포인트가 스레드를 얻지 못한다.
+- 크기가 정해진 별도 스레드풀(PASSWORD_HASH_WORKERS)에서 실행 (bcrypt C 구현은 GIL을 놓음)
+- 대기 작업이 PASSWORD_HASH_MAX_PENDING 을 넘으면 PasswordHasherBusyError (호출자가 503 처리)
+- password_hash_queue_seconds(풀 대기) / password_hash_seconds(해싱) 메트릭 기록
+- BCRYPT_ROUNDS 와 cost가 다른 해시는 검증 성공 시 새 해시를 돌려줌 (로그인 시 재해싱)
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from passlib.context import CryptContext
+
+from .config import settings
+from .metrics import metrics
+
+T = TypeVar("T")
+
+# 비밀번호 해싱 컨텍스트 (min/max를 같은 값으로 두어 cost를 올리거나 내리면 모두 재해싱 대상)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class PasswordHasherBusyError(Exception):
+    """해싱 대기열이 가득 참"""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash",
+                )
+    return _executor
+
+
+def _pending_stats() -> dict[str, int]:
+    return {"pending": _pending}
+
+
+metrics.register_collector("password_hash", _pending_stats)
+
+
+async def _run(func: Callable[..., T], *args) -> T:
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            metrics.inc("password_hash_rejected")
+            raise PasswordHasherBusyError("Password hashing queue is full")
+        _pending += 1
+
+    queued = time.perf_counter()
+
+    def task() -> T:
+        global _pending
+        started = time.perf_counter()
+        metrics.observe("password_hash_queue_seconds", started - queued)
+        try:
+            return func(*args)
+        finally:
+            metrics.observe("password_hash_seconds", time.perf_counter() - started)
+            with _pending_lock:
+                _pending -= 1
+
+    try:
+        future = _get_executor().submit(task)
+    except BaseException:
+        with _pending_lock:
+            _pending -= 1
+        raise
+    # 요청이 취소되어도 제출된 작업은 끝까지 실행되고 그때 pending 이 줄어든다
+    return await asyncio.wrap_future(future)
+
+
+async def ahash_password(password: str) -> str:
+    return await _run(pwd_context.hash, password)
+
+
+async def averify_and_update(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """(일치 여부, cost가 바뀐 경우 새 해시) 반환"""
+    return await _run(pwd_context.verify_and_update, password, hashed_password)
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
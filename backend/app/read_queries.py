@@ -0,0 +1,119 @@
+"""
+읽기 전용 조회 계층 (ORM 인스턴스 없이 Core select)
+
+조회 후 직렬화만 하는 엔드포인트가 ORM 객체를 identity map / 변경 추적에 올리지 않도록
+응답 스키마에 필요한 컬럼만 select 하고 결과는 namedtuple 행 객체로 받는다.
+- 응답 스키마 필드 이름으로 컬럼 목록/행 타입을 만들므로 스키마에 필드를 추가하면 함께 조회됨
+- lambda_stmt 로 문장 구성/컴파일 결과를 캐시 (호출마다 select() 를 다시 만들지 않음)
+- namedtuple 은 튜플 기반이라 ORM 인스턴스보다 작고, 속성 접근이 C 레벨이라
+  pydantic from_attributes 검증(app.responses)이 SQLAlchemy Row 보다 빠르다
+"""
+
+from collections import namedtuple
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import lambda_stmt, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from .models import Avatar, Generation, TrainingRequest, User
+from .pagination import decode_cursor, split_page
+from .schemas import AvatarResponse, GenerationResponse, TrainingRequestResponse
+
+
+def _columns(model: Any, schema: Any) -> tuple:
+    return tuple(model.__table__.c[name] for name in schema.model_fields)
+
+
+GenerationRow = namedtuple("GenerationRow", GenerationResponse.model_fields)
+AvatarRow = namedtuple("AvatarRow", AvatarResponse.model_fields)
+TrainingRequestRow = namedtuple("TrainingRequestRow", TrainingRequestResponse.model_fields)
+
+GENERATION_COLUMNS = _columns(Generation, GenerationResponse)
+AVATAR_COLUMNS = _columns(Avatar, AvatarResponse)
+TRAINING_REQUEST_COLUMNS = _columns(TrainingRequest, TrainingRequestResponse)
+AUTH_USER_COLUMNS = (User.id, User.email, User.role, User.status)
+
+
+def auth_user_stmt(user_id: int) -> StatementLambdaElement:
+    """get_current_user 용 (id, email, role, status)"""
+    return lambda_stmt(lambda: select(*AUTH_USER_COLUMNS).where(User.id == user_id))
+
+
+def generation_stmt(generation_id: int) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(*GENERATION_COLUMNS).where(Generation.id == generation_id)
+    )
+
+
+def generations_stmt(generation_ids: list[int]) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(*GENERATION_COLUMNS).where(Generation.id.in_(generation_ids))
+    )
+
+
+def page_stmt(
+    model: Any,
+    columns: tuple,
+    owner_column: Any,
+    owner_id: int,
+    cursor: Optional[str],
+    limit: int,
+) -> StatementLambdaElement:
+    """owner_column == owner_id 인 행을 (created_at, id) 내림차순으로 limit + 1 개 조회"""
+    stmt = lambda_stmt(lambda: select(*columns).where(owner_column == owner_id))
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt += lambda s: s.where(
+            tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+        )
+    fetch = limit + 1
+    stmt += lambda s: s.order_by(model.created_at.desc(), model.id.desc()).limit(fetch)
+    return stmt
+
+
+async def fetch_generation(db: AsyncSession, generation_id: int) -> Optional[GenerationRow]:
+    row = (await db.execute(generation_stmt(generation_id))).first()
+    return GenerationRow._make(row) if row is not None else None
+
+
+async def fetch_generations(db: AsyncSession, generation_ids: list[int]) -> list[GenerationRow]:
+    result = await db.execute(generations_stmt(generation_ids))
+    return [GenerationRow._make(row) for row in result]
+
+
+async def _fetch_page(
+    db: AsyncSession, stmt: StatementLambdaElement, row_type: type[NamedTuple], limit: int
+) -> tuple[list[Any], Optional[str]]:
+    result = await db.execute(stmt)
+    return split_page([row_type._make(row) for row in result], limit)
+
+
+async def fetch_generation_page(
+    db: AsyncSession, buyer_id: int, cursor: Optional[str], limit: int
+) -> tuple[list[Any], Optional[str]]:
+    stmt = page_stmt(
+        Generation, GENERATION_COLUMNS, Generation.buyer_id, buyer_id, cursor, limit
+    )
+    return await _fetch_page(db, stmt, GenerationRow, limit)
+
+
+async def fetch_avatar_page(
+    db: AsyncSession, user_id: int, cursor: Optional[str], limit: int
+) -> tuple[list[Any], Optional[str]]:
+    stmt = page_stmt(Avatar, AVATAR_COLUMNS, Avatar.user_id, user_id, cursor, limit)
+    return await _fetch_page(db, stmt, AvatarRow, limit)
+
+
+async def fetch_training_request_page(
+    db: AsyncSession, user_id: int, cursor: Optional[str], limit: int
+) -> tuple[list[Any], Optional[str]]:
+    stmt = page_stmt(
+        TrainingRequest,
+        TRAINING_REQUEST_COLUMNS,
+        TrainingRequest.user_id,
+        user_id,
+        cursor,
+        limit,
+    )
+    return await _fetch_page(db, stmt, TrainingRequestRow, limit)
@@ -0,0 +1,145 @@
+"""
+fal.ai 결과 이미지 재호스팅
+
+fal.ai 결과 URL은 임시 CDN이므로, 완료된 Generation의 이미지를 스트리밍으로 받아
+스토리지 백엔드(app.storage)에 저장하고 image_url을 영구 URL로 교체한다.
+
+- 공유 httpx 클라이언트로 청크 단위 수신, 버퍼는 REHOST_SPOOL_BYTES 까지만 메모리 사용
+- Content-Type / 크기(REHOST_MAX_BYTES) 검증
+- 프로세스 전역 스레드풀(REHOST_WORKERS)에서 실행 (워커 루프/이벤트 루프를 막지 않음)
+"""
+
+import logging
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from sqlalchemy import update
+
+from .config import settings
+from .db import SessionLocal
+from .derivatives import schedule_generation_derivatives
+from .fal_client import get_client
+from .metrics import metrics
+from .models import Generation, GenerationStatus
+from .storage import StoredObject, add_references, get_storage_backend, is_stored_url
+
+logger = logging.getLogger(__name__)
+
+_IMAGE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+}
+_CHUNK_SIZE = 64 * 1024
+_FETCH_TIMEOUT = 60.0
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class RehostError(Exception):
+    """원본 이미지를 가져올 수 없거나 검증에 실패"""
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.REHOST_WORKERS,
+                    thread_name_prefix="rehost",
+                )
+    return _executor
+
+
+def fetch_and_store(url: str) -> StoredObject:
+    """URL의 이미지를 스트리밍으로 받아 스토리지에 저장"""
+    with get_client().stream("GET", url, timeout=_FETCH_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise RehostError(f"GET {url} returned {response.status_code}")
+
+        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        file_ext = _IMAGE_EXTENSIONS.get(content_type)
+        if file_ext is None:
+            raise RehostError(f"Unsupported content type: {content_type or 'missing'}")
+
+        declared_size = response.headers.get("content-length")
+        if declared_size and int(declared_size) > settings.REHOST_MAX_BYTES:
+            raise RehostError(f"Image too large: {declared_size} bytes")
+
+        with tempfile.SpooledTemporaryFile(max_size=settings.REHOST_SPOOL_BYTES) as buffer:
+            received = 0
+            for chunk in response.iter_bytes(_CHUNK_SIZE):
+                received += len(chunk)
+                if received > settings.REHOST_MAX_BYTES:
+                    raise RehostError(f"Image exceeds {settings.REHOST_MAX_BYTES} bytes")
+                buffer.write(chunk)
+            if received == 0:
+                raise RehostError("Empty image body")
+
+            return get_storage_backend().put(buffer, f"generation{file_ext}", content_type)
+
+
+def rehost_generation(generation_id: int) -> bool:
+    """Generation 이미지를 재호스팅하고 image_url 교체 (이미 교체됐으면 False)"""
+    db = SessionLocal()
+    try:
+        generation = db.get(Generation, generation_id)
+        if (
+            generation is None
+            or generation.status != GenerationStatus.SUCCESS.value
+            or not generation.image_url
+            or is_stored_url(generation.image_url)
+        ):
+            return False
+        source_url = generation.image_url
+        db.rollback()  # 다운로드 동안 트랜잭션을 잡고 있지 않도록
+
+        started = time.perf_counter()
+        stored = fetch_and_store(source_url)
+
+        # 그 사이 다른 프로세스가 교체했으면 덮어쓰지 않음
+        result = db.execute(
+            update(Generation)
+            .where(Generation.id == generation_id, Generation.image_url == source_url)
+            .values(image_url=stored.url)
+        )
+        if result.rowcount:
+            add_references(db, [stored])
+        db.commit()
+        if result.rowcount and settings.IMAGE_DERIVATIVES:
+            schedule_generation_derivatives(generation_id)
+
+        metrics.observe("rehost_seconds", time.perf_counter() - started)
+        metrics.inc("rehost_succeeded")
+        return bool(result.rowcount)
+    except Exception as exc:
+        db.rollback()
+        metrics.inc("rehost_failed")
+        logger.warning("Rehost failed for generation %s: %s", generation_id, exc)
+        raise
+    finally:
+        db.close()
+
+
+def schedule_rehost(generation_id: int) -> Future:
+    """백그라운드 스레드풀에서 재호스팅 (실패는 로그/메트릭만 남고 원래 URL 유지)"""
+    return _get_executor().submit(rehost_generation, generation_id)
+
+
+def rehost_generations(generation_ids: Iterable[int]) -> list[Future]:
+    """여러 Generation을 동시에 재호스팅 (백필용)"""
+    executor = _get_executor()
+    return [executor.submit(rehost_generation, gid) for gid in generation_ids]
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
@@ -0,0 +1,43 @@
+"""
+빠른 JSON 응답 경로
+
+FastAPI 기본 경로는 응답 모델마다 model_validate → response_model 재검증 → jsonable_encoder → json.dumps 를 거친다.
+목록/상세 엔드포인트는 TypeAdapter 로 ORM 행을 한 번에 검증하고 pydantic-core 에서 바로 JSON 바이트로 직렬화한다.
+나머지 엔드포인트는 기본 응답 클래스를 ORJSONResponse 로 두어 인코딩만 빠르게 한다.
+"""
+
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from .schemas import (
+    AvatarResponse,
+    GenerationResponse,
+    TrainingRequestResponse,
+)
+
+GENERATION = TypeAdapter(GenerationResponse)
+GENERATION_LIST = TypeAdapter(list[GenerationResponse])
+TRAINING_REQUEST_LIST = TypeAdapter(list[TrainingRequestResponse])
+AVATAR_LIST = TypeAdapter(list[AvatarResponse])
+
+
+def orm_json_response(
+    adapter: TypeAdapter,
+    content: Any,
+    headers: Optional[Mapping[str, str]] = None,
+    status_code: int = 200,
+) -> Response:
+    """ORM 객체(또는 목록)를 adapter 스키마로 검증해 JSON 바이트 응답 생성
+
+    엔드포인트의 response_model 은 OpenAPI 문서용으로 그대로 두고, 이 응답을 반환하면
+    FastAPI 는 응답 재검증/인코딩을 건너뛴다.
+    """
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -71,6 +71,7 @@ class GenerationResponse(BaseModel):
     prompt: str
     request_id: Optional[str] = None
     image_url: Optional[str]
+    thumbnail_url: Optional[str] = None
     seed: Optional[str] = None
     status: str
     fail_reason: Optional[str]
@@ -93,6 +94,45 @@ class TrainingRequestResponse(BaseModel):
         from_attributes = True
 
 
+class UploadSlot(BaseModel):
+    file_name: str
+    content_type: str = "image/jpeg"
+    size: int = Field(gt=0)
+    sha256: str = Field(pattern="^[0-9a-f]{64}$")
+
+
+class TrainingUploadInitRequest(BaseModel):
+    avatar_name: str
+    negative_prompt: str
+    credit_per_generation: int
+    national: str
+    gender: str
+    description: str
+    is_real_person: bool = False
+    instagram_id: Optional[str] = None
+    preview_image: UploadSlot
+    front_photos: list[UploadSlot] = []
+    side_photos: list[UploadSlot] = []
+    fullbody_photos: list[UploadSlot] = []
+    other_photos: list[UploadSlot] = []
+
+
+class PresignedUpload(BaseModel):
+    group: str
+    index: int
+    key: str
+    # None이면 같은 내용이 이미 저장되어 있어 업로드 불필요
+    url: Optional[str] = None
+    method: str = "PUT"
+    headers: dict[str, str] = {}
+
+
+class TrainingUploadInitResponse(BaseModel):
+    training_request_id: int
+    expires_in: int
+    uploads: list[PresignedUpload]
+
+
 # Avatar 스키마
 class AvatarResponse(BaseModel):
     id: int
@@ -101,6 +141,7 @@ class AvatarResponse(BaseModel):
     nationality: Optional[str] = None
     gender: Optional[str] = None
     preview_image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
     credit_per_generation: Optional[int] = None
     negative_prompt: Optional[str] = None
     status: str
@@ -0,0 +1,220 @@
+"""
+/static 정적 파일 서빙 (STORAGE_TYPE=local)
+
+- 콘텐츠 주소(sha256) / UUID 파일명은 내용이 바뀌지 않으므로 1년 immutable 캐시
+- 강한 ETag (sha256 파일명은 파일명 자체, 그 외는 크기+mtime) → If-None-Match 304
+- 단일 Range 요청(206 / 416), If-Range 지원
+- 원본 png/jpg 요청 시 Accept 헤더에 따라 같은 폴더의 .avif / .webp 파생본을 대신 전송 (Vary: Accept)
+- 서버가 ASGI pathsend / zerocopysend 확장을 지원하면 sendfile 경로 사용, 아니면 청크 전송
+"""
+
+import os
+import re
+import stat
+from email.utils import formatdate
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from .config import settings
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+_SHA256_NAME = re.compile(r"^[0-9a-f]{64}(\.[A-Za-z0-9]+)+$")
+_UUID_NAME = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\.[A-Za-z0-9]+$"
+)
+_NEGOTIABLE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+# Accept 헤더 값 → 파생본 확장자 (app.derivatives 와 동일한 이름 규칙)
+_VARIANTS = (("image/avif", ".avif"), ("image/webp", ".webp"))
+_MEDIA_TYPES = {".avif": "image/avif", ".webp": "image/webp"}
+
+
+def is_immutable_name(name: str) -> bool:
+    return bool(_SHA256_NAME.match(name) or _UUID_NAME.match(name))
+
+
+def _etag(path: Path, stat_result: os.stat_result) -> str:
+    if _SHA256_NAME.match(path.name):
+        return f'"{path.name}"'
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+class _Unsatisfiable(Exception):
+    pass
+
+
+def _parse_range(value: str, size: int) -> Optional[tuple[int, int]]:
+    """단일 bytes 범위를 (start, end 포함)으로 변환, 다중 범위/형식 오류는 None (전체 응답)"""
+    unit, _, ranges = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    start_text, _, end_text = ranges.strip().partition("-")
+    try:
+        if not start_text:
+            suffix = int(end_text)
+            if suffix <= 0:
+                raise _Unsatisfiable
+            return max(size - suffix, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise _Unsatisfiable
+    return start, min(end, size - 1)
+
+
+class StaticFileResponse(Response):
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        headers: dict[str, str],
+        media_type: Optional[str],
+        byte_range: Optional[tuple[int, int]] = None,
+        status_code: int = 200,
+    ) -> None:
+        self.path = path
+        self.byte_range = byte_range
+        self.offset, last = byte_range if byte_range else (0, size - 1)
+        self.count = last - self.offset + 1
+        self.status_code = 206 if byte_range else status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(self.count)
+        if byte_range:
+            self.headers["content-range"] = f"bytes {self.offset}-{last}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if scope["method"].upper() == "HEAD" or self.count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if self.byte_range is None and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+            return
+        if "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file.fileno(),
+                        "offset": self.offset,
+                        "count": self.count,
+                    }
+                )
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if self.offset:
+                await file.seek(self.offset)
+            remaining = self.count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class CachedStaticFiles(StaticFiles):
+    def _negotiate(
+        self, path: Path, stat_result: os.stat_result, accept: str
+    ) -> tuple[Path, os.stat_result, Optional[str]]:
+        for media_type, suffix in _VARIANTS:
+            if media_type not in accept:
+                continue
+            variant = path.with_suffix(suffix)
+            try:
+                variant_stat = os.stat(variant)
+            except OSError:
+                continue
+            if stat.S_ISREG(variant_stat.st_mode):
+                return variant, variant_stat, _MEDIA_TYPES[suffix]
+        return path, stat_result, None
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        path = Path(full_path)
+        media_type = None
+        negotiable = (
+            settings.STATIC_NEGOTIATE_IMAGE_FORMATS
+            and _SHA256_NAME.match(path.name) is not None
+            and path.suffix.lower() in _NEGOTIABLE_SUFFIXES
+        )
+        if negotiable:
+            path, stat_result, media_type = self._negotiate(
+                path, stat_result, request_headers.get("accept", "")
+            )
+
+        etag = _etag(path, stat_result)
+        last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+        headers = {
+            "accept-ranges": "bytes",
+            "cache-control": (
+                IMMUTABLE_CACHE_CONTROL
+                if is_immutable_name(path.name)
+                else REVALIDATE_CACHE_CONTROL
+            ),
+            "etag": etag,
+            "last-modified": last_modified,
+        }
+        if negotiable:
+            headers["vary"] = "Accept"
+
+        if status_code == 200 and self.is_not_modified(Headers(headers), request_headers):
+            return NotModifiedResponse(Headers(headers))
+
+        byte_range = None
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if status_code == 200 and range_header and if_range in (None, etag, last_modified):
+            try:
+                byte_range = _parse_range(range_header, stat_result.st_size)
+            except _Unsatisfiable:
+                return Response(
+                    status_code=416,
+                    headers={**headers, "content-range": f"bytes */{stat_result.st_size}"},
+                )
+
+        return StaticFileResponse(
+            path,
+            stat_result.st_size,
+            headers,
+            media_type or guess_type(path.name)[0] or "application/octet-stream",
+            byte_range,
+            status_code,
+        )
@@ -0,0 +1,429 @@
+"""
+콘텐츠 주소 기반(content-addressed) 스토리지
+
+업로드 내용을 스트리밍하면서 SHA-256을 계산하고, 해시로 만든 키
+(objects/ab/cd/<sha256>.jpg)에 저장한다. 같은 내용이 이미 있으면 쓰기를 건너뛴다.
+참조 수는 storage_objects 테이블에서 관리한다 (add_references / release_reference).
+
+STORAGE_TYPE 에 따라 LocalStorageBackend / S3StorageBackend 중 하나를 사용한다.
+
+클라이언트 직접 업로드(presign_put): 클라이언트가 미리 알려준 sha256/크기로 키를 정하고,
+S3는 x-amz-checksum-sha256 이 서명된 presigned PUT URL을, 로컬은 HMAC 서명된
+/uploads/{key} URL을 발급한다. 두 경우 모두 내용이 해시와 다르면 저장되지 않는다.
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional
+from urllib.parse import urlencode
+
+from botocore.exceptions import ClientError
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .local_storage import (
+    COPY_CHUNK_SIZE,
+    _ensure_dir,
+    get_upload_dir,
+    write_file_atomically,
+)
+from .models import StorageObject
+
+OBJECTS_PREFIX = "objects"
+
+# S3 업로드 전 해시 계산용 버퍼: 이 크기까지는 메모리, 넘으면 임시 파일
+_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    key: str
+    url: str
+    size: int
+    sha256: str
+    content_type: str
+    created: bool  # False면 기존 객체를 재사용 (쓰기 생략)
+
+
+@dataclass(frozen=True)
+class PresignedPut:
+    url: str
+    headers: dict[str, str]
+
+
+class UploadVerificationError(ValueError):
+    """직접 업로드된 내용이 선언한 크기/해시와 다름"""
+
+
+def content_key(sha256: str, file_name: str) -> str:
+    file_ext = Path(file_name).suffix.lower() or ".jpg"
+    return f"{OBJECTS_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{file_ext}"
+
+
+def _copy_and_hash(source: BinaryIO, target: BinaryIO) -> tuple[str, int]:
+    """source를 청크 단위로 target에 복사하면서 SHA-256과 크기 계산"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        target.write(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class StorageBackend(ABC):
+    @abstractmethod
+    def put(
+        self, file_content: BinaryIO, file_name: str, content_type: str = "image/jpeg"
+    ) -> StoredObject:
+        """내용을 해시 키로 저장 (이미 있으면 쓰기 생략)"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        ...
+
+    @abstractmethod
+    def read_bytes(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> bool:
+        """파생 이미지 등 키가 정해진 객체 저장 (이미 있으면 False)"""
+
+    @abstractmethod
+    def object_sizes(self, keys: Iterable[str]) -> dict[str, Optional[int]]:
+        """키별 저장된 크기 (없으면 None)를 한 번에 조회"""
+
+    @abstractmethod
+    def presign_put(
+        self, key: str, content_type: str, size: int, sha256: str, expires_in: int
+    ) -> PresignedPut:
+        """클라이언트가 직접 업로드할 PUT URL과 함께 보내야 할 헤더"""
+
+
+def _local_upload_signature(key: str, size: int, expires: int) -> str:
+    message = f"{key}:{size}:{expires}".encode()
+    return hmac.new(
+        settings.JWT_SECRET_KEY.encode(), message, hashlib.sha256
+    ).hexdigest()
+
+
+def verify_local_upload_signature(key: str, size: int, expires: int, sig: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_local_upload_signature(key, size, expires), sig)
+
+
+class LocalStorageBackend(StorageBackend):
+    def _write(
+        self, file_content: BinaryIO, key_for_sha: Callable[[str, int], str]
+    ) -> tuple[str, str, int, bool]:
+        """incoming 임시 파일에 해시하며 기록 후 키 경로로 rename (이미 있으면 생략)"""
+        upload_dir = get_upload_dir()
+        incoming_dir = upload_dir / OBJECTS_PREFIX / ".incoming"
+        _ensure_dir(incoming_dir)
+
+        fd, tmp_path = tempfile.mkstemp(dir=incoming_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                sha256, size = _copy_and_hash(file_content, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            key = key_for_sha(sha256, size)
+            target = upload_dir / key
+            created = not target.exists()
+            if created:
+                _ensure_dir(target.parent)
+                os.replace(tmp_path, target)
+            else:
+                os.unlink(tmp_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return key, sha256, size, created
+
+    def put(
+        self, file_content: BinaryIO, file_name: str, content_type: str = "image/jpeg"
+    ) -> StoredObject:
+        file_content.seek(0)
+        key, sha256, size, created = self._write(
+            file_content, lambda sha256, size: content_key(sha256, file_name)
+        )
+        return StoredObject(
+            key=key,
+            url=self.url_for(key),
+            size=size,
+            sha256=sha256,
+            content_type=content_type,
+            created=created,
+        )
+
+    def exists(self, key: str) -> bool:
+        return (get_upload_dir() / key).exists()
+
+    def url_for(self, key: str) -> str:
+        return f"{settings.STATIC_URL_PREFIX}/{key}"
+
+    def read_bytes(self, key: str) -> bytes:
+        return (get_upload_dir() / key).read_bytes()
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> bool:
+        target = get_upload_dir() / key
+        if target.exists():
+            return False
+        _ensure_dir(target.parent)
+        write_file_atomically(BytesIO(data), target)
+        return True
+
+    def object_sizes(self, keys: Iterable[str]) -> dict[str, Optional[int]]:
+        upload_dir = get_upload_dir()
+        sizes: dict[str, Optional[int]] = {}
+        for key in keys:
+            try:
+                sizes[key] = os.stat(upload_dir / key).st_size
+            except FileNotFoundError:
+                sizes[key] = None
+        return sizes
+
+    def presign_put(
+        self, key: str, content_type: str, size: int, sha256: str, expires_in: int
+    ) -> PresignedPut:
+        expires = int(time.time()) + expires_in
+        query = urlencode(
+            {
+                "size": size,
+                "expires": expires,
+                "sig": _local_upload_signature(key, size, expires),
+            }
+        )
+        return PresignedPut(
+            url=f"/uploads/{key}?{query}", headers={"Content-Type": content_type}
+        )
+
+    def receive_upload(self, file_content: BinaryIO, key: str, expected_size: int) -> bool:
+        """presign_put URL로 들어온 내용을 저장 (크기/해시가 키와 다르면 UploadVerificationError)"""
+
+        def _verified_key(sha256: str, size: int) -> str:
+            if size != expected_size or Path(key).stem != sha256:
+                raise UploadVerificationError(
+                    f"Uploaded content does not match {key} ({size} bytes)"
+                )
+            return key
+
+        _, _, _, created = self._write(file_content, _verified_key)
+        return created
+
+
+class S3StorageBackend(StorageBackend):
+    def put(
+        self, file_content: BinaryIO, file_name: str, content_type: str = "image/jpeg"
+    ) -> StoredObject:
+        from .s3_utils import TRANSFER_CONFIG, get_s3_client
+
+        file_content.seek(0)
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY) as spooled:
+            sha256, size = _copy_and_hash(file_content, spooled)
+            key = content_key(sha256, file_name)
+
+            created = not self.exists(key)
+            if created:
+                spooled.seek(0)
+                get_s3_client().upload_fileobj(
+                    spooled,
+                    settings.S3_BUCKET,
+                    key,
+                    ExtraArgs={"ContentType": content_type},
+                    Config=TRANSFER_CONFIG,
+                )
+
+        return StoredObject(
+            key=key,
+            url=self.url_for(key),
+            size=size,
+            sha256=sha256,
+            content_type=content_type,
+            created=created,
+        )
+
+    def exists(self, key: str) -> bool:
+        from .s3_utils import get_s3_client
+
+        try:
+            get_s3_client().head_object(Bucket=settings.S3_BUCKET, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def url_for(self, key: str) -> str:
+        return f"https://{settings.S3_BUCKET}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+    def read_bytes(self, key: str) -> bytes:
+        from .s3_utils import get_s3_client
+
+        response = get_s3_client().get_object(Bucket=settings.S3_BUCKET, Key=key)
+        return response["Body"].read()
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> bool:
+        from .s3_utils import get_s3_client
+
+        if self.exists(key):
+            return False
+        get_s3_client().put_object(
+            Bucket=settings.S3_BUCKET, Key=key, Body=data, ContentType=content_type
+        )
+        return True
+
+    def object_sizes(self, keys: Iterable[str]) -> dict[str, Optional[int]]:
+        from .s3_utils import _get_upload_executor, get_s3_client
+
+        client = get_s3_client()
+
+        def _size(key: str) -> Optional[int]:
+            try:
+                return client.head_object(Bucket=settings.S3_BUCKET, Key=key)["ContentLength"]
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                    return None
+                raise
+
+        # 키가 sha256 접두사로 흩어져 있어 prefix 목록 조회 대신 HEAD를 병렬로 수행
+        keys = list(dict.fromkeys(keys))
+        return dict(zip(keys, _get_upload_executor().map(_size, keys)))
+
+    def presign_put(
+        self, key: str, content_type: str, size: int, sha256: str, expires_in: int
+    ) -> PresignedPut:
+        from .s3_utils import get_s3_client
+
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        # Content-Type/Content-Length/x-amz-checksum-sha256 이 서명에 포함되므로
+        # 클라이언트는 아래 헤더를 그대로 보내야 하고, S3가 내용 해시를 검증한다.
+        url = get_s3_client().generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": settings.S3_BUCKET,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+                "ChecksumSHA256": checksum,
+            },
+            ExpiresIn=expires_in,
+        )
+        return PresignedPut(
+            url=url,
+            headers={
+                "Content-Type": content_type,
+                "Content-Length": str(size),
+                "x-amz-checksum-sha256": checksum,
+            },
+        )
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_storage_backend() -> StorageBackend:
+    """STORAGE_TYPE 설정에 맞는 스토리지 백엔드 (프로세스 전역 1개)"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.STORAGE_TYPE == "local":
+                    _backend = LocalStorageBackend()
+                else:
+                    _backend = S3StorageBackend()
+    return _backend
+
+
+def add_references(db: Session, objects: Iterable[StoredObject]) -> None:
+    """저장된 객체들의 참조 수 증가 (commit은 호출자가 수행)"""
+    objects = list(objects)
+    counts = Counter(obj.key for obj in objects)
+    if not counts:
+        return
+
+    by_key = {obj.key: obj for obj in objects}
+    rows = [
+        {
+            "key": key,
+            "sha256": by_key[key].sha256,
+            "size": by_key[key].size,
+            "content_type": by_key[key].content_type,
+            "ref_count": count,
+            "created_at": datetime.utcnow(),
+        }
+        for key, count in counts.items()
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f"Unsupported dialect for storage references: {dialect}")
+
+    stmt = insert(StorageObject.__table__).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StorageObject.__table__.c.key],
+        set_={"ref_count": StorageObject.__table__.c.ref_count + stmt.excluded.ref_count},
+    )
+    db.execute(stmt)
+
+
+def release_reference(db: Session, key: str) -> None:
+    """참조 수 감소 (commit은 호출자가 수행)
+
+    참조 수가 0이 되어도 객체와 storage_objects 행은 삭제하지 않는다 (정리 작업 없음).
+    같은 내용이 다시 업로드되면 add_references 로 다시 참조된다.
+    """
+    db.execute(
+        update(StorageObject.__table__)
+        .where(
+            StorageObject.__table__.c.key == key,
+            StorageObject.__table__.c.ref_count > 0,
+        )
+        .values(ref_count=StorageObject.__table__.c.ref_count - 1)
+    )
+
+
+def is_stored_url(url: str) -> bool:
+    """현재 스토리지 백엔드의 콘텐츠 주소 객체 URL인지 여부"""
+    return url.startswith(get_storage_backend().url_for(f"{OBJECTS_PREFIX}/"))
+
+
+def key_from_url(url: Optional[str]) -> Optional[str]:
+    """이 백엔드가 발급한 URL이면 객체 키를 반환 (그 외 URL은 None)"""
+    if not url:
+        return None
+    marker = f"/{OBJECTS_PREFIX}/"
+    index = url.find(marker)
+    if index < 0:
+        return None
+    return url[index + 1:]
@@ -0,0 +1,71 @@
+"""
+검증된 JWT 캐시
+같은 Access Token이 수명(1시간) 동안 수백 번 재사용되므로,
+서명 검증을 통과한 payload를 토큰 다이제스트(sha256) 기준 LRU에 exp 시각까지 보관한다.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from .config import settings
+from .metrics import metrics
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict[str, Any]]:
+        key = self._key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, payload: dict[str, Any]) -> None:
+        """exp 가 없는 토큰은 캐시하지 않음"""
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+verified_token_cache = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+metrics.register_collector("auth_token_cache", verified_token_cache.stats)
@@ -0,0 +1,67 @@
+"""
+업로드 파일을 스토리지로 동시 전송하는 유틸리티
+
+UploadFile.file(SpooledTemporaryFile)을 그대로 StorageBackend.put 에 넘겨
+파일 전체를 메모리에 올리지 않고 청크 단위로 해시 계산/전송한다.
+블로킹 I/O는 스레드풀에서 실행하고, 동시 업로드 수는 UPLOAD_CONCURRENCY로 제한한다.
+"""
+
+import asyncio
+import tempfile
+from typing import BinaryIO, Optional, Sequence
+
+from fastapi import Request, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+from .storage import StorageBackend, StoredObject
+
+
+async def store_files_concurrently(
+    backend: StorageBackend,
+    files: Sequence[tuple[BinaryIO, str, str]],
+) -> list[StoredObject]:
+    """(파일 객체, 파일명, content_type) 목록을 동시에 저장하고 입력 순서대로 결과 반환"""
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+
+    async def _upload(
+        file_content: BinaryIO, file_name: str, content_type: str
+    ) -> StoredObject:
+        async with semaphore:
+            return await run_in_threadpool(
+                backend.put, file_content, file_name, content_type
+            )
+
+    return list(
+        await asyncio.gather(
+            *(_upload(file_content, name, ctype) for file_content, name, ctype in files)
+        )
+    )
+
+
+def upload_entries(
+    photos: Sequence[UploadFile], default_prefix: str
+) -> list[tuple[BinaryIO, str, str]]:
+    """UploadFile 목록을 store_files_concurrently 입력 형식으로 변환"""
+    return [
+        (
+            photo.file,
+            photo.filename or f"{default_prefix}_{i}.jpg",
+            photo.content_type or "image/jpeg",
+        )
+        for i, photo in enumerate(photos)
+    ]
+
+
+async def spool_request_body(request: Request, max_bytes: int) -> Optional[BinaryIO]:
+    """요청 본문을 임시 파일에 받는다 (max_bytes 초과 시 None)"""
+    body = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            body.close()
+            return None
+        body.write(chunk)
+    body.seek(0)
+    return body
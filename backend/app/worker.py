@@ -0,0 +1,144 @@
+"""
+Generation 워커 프로세스
+
+tasks 큐에서 작업을 가져와 fal.ai queue API(submit → status → result)로 실행한다.
+GENERATION_CALLBACK_URL 이 설정되어 있으면 fal_webhook 으로 제출하고 상태 조회를 하지 않는다
+(결과는 POST /callbacks/generations 로 반영, app.callbacks 참고).
+API 서버와 별도 프로세스로 실행:
+
+    cd backend
+    python -m app.worker
+"""
+
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+from .callbacks import callback_url_for
+from .config import settings
+from .db import SessionLocal
+from .fal_client import close_clients
+from .fal_dispatcher import FalDispatcher, ProviderThrottled
+from .generation_queue import (
+    claim_queued_tasks,
+    complete_generation,
+    count_running_tasks,
+    fail_generation,
+    fail_stale_tasks,
+    list_running_tasks,
+    mark_submitted,
+    requeue_task,
+)
+from .derivatives import shutdown_pools as shutdown_derivative_pools
+from .rehost import shutdown_executor as shutdown_rehost_executor
+
+logger = logging.getLogger(__name__)
+
+_FAL_COMPLETED = "COMPLETED"
+
+
+class GenerationWorker:
+    def __init__(self, worker_id: Optional[str] = None) -> None:
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.dispatcher = FalDispatcher()
+        self._stopping = False
+
+    def stop(self, *_args) -> None:
+        logger.info("Worker %s stopping", self.worker_id)
+        self._stopping = True
+
+    def run_forever(self) -> None:
+        logger.info("Worker %s started", self.worker_id)
+        while not self._stopping:
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Worker iteration failed")
+            time.sleep(settings.GENERATION_WORKER_POLL_INTERVAL)
+
+    def run_once(self) -> None:
+        db = SessionLocal()
+        try:
+            fail_stale_tasks(db, settings.GENERATION_TASK_TIMEOUT_SECONDS)
+            if settings.GENERATION_CALLBACK_URL:
+                in_flight = count_running_tasks(db, self.worker_id)
+            else:
+                in_flight = self._poll_running(db)
+            self._submit_queued(db, in_flight)
+        finally:
+            db.close()
+
+    def _submit_queued(self, db, in_flight: int) -> None:
+        limit = min(
+            settings.GENERATION_WORKER_BATCH_SIZE,
+            self.dispatcher.capacity(in_flight),
+        )
+        tasks = claim_queued_tasks(db, self.worker_id, limit)
+        for index, task in enumerate(tasks):
+            try:
+                request_id = self.dispatcher.submit(
+                    task.generation.prompt, callback_url_for(task.generation_id)
+                )
+            except ProviderThrottled as exc:
+                # 과부하는 요청 자체의 실패가 아니므로 재시도 횟수를 소모하지 않고 되돌림
+                logger.warning("Submit throttled for task %s: %s", task.id, exc)
+                for pending_task in tasks[index:]:
+                    requeue_task(db, pending_task, str(exc), count_retry=False)
+                return
+            except Exception as exc:
+                logger.warning("Submit failed for task %s: %s", task.id, exc)
+                if task.retry_count < settings.GENERATION_MAX_RETRIES:
+                    requeue_task(db, task, str(exc))
+                else:
+                    fail_generation(db, task, str(exc))
+                continue
+            mark_submitted(db, task, request_id)
+
+    def _poll_running(self, db) -> int:
+        """제출된 작업들의 상태를 확인하고, 아직 진행 중인 작업 수를 반환"""
+        in_flight = 0
+        for task in list_running_tasks(db, self.worker_id):
+            request_id = task.generation.request_id
+            try:
+                status_payload = self.dispatcher.status(request_id)
+            except Exception as exc:
+                # 상태 조회 실패는 일시적 오류로 보고 다음 주기에 재시도
+                logger.warning("Status check failed for task %s: %s", task.id, exc)
+                in_flight += 1
+                continue
+            if status_payload.get("status") != _FAL_COMPLETED:
+                in_flight += 1
+                continue
+
+            try:
+                result = self.dispatcher.result(request_id)
+            except ProviderThrottled as exc:
+                logger.warning("Result fetch throttled for task %s: %s", task.id, exc)
+                in_flight += 1
+                continue
+            except Exception as exc:
+                logger.warning("Generation %s failed: %s", task.generation_id, exc)
+                fail_generation(db, task, str(exc))
+                continue
+            complete_generation(db, task, result)
+        return in_flight
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    worker = GenerationWorker()
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    try:
+        worker.run_forever()
+    finally:
+        shutdown_rehost_executor()
+        shutdown_derivative_pools()
+        close_clients()
+
+
+if __name__ == "__main__":
+    main()
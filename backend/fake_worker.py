@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+로컬 테스트용 가짜 GPU 워커
+
+queued 상태의 generation 작업을 가져와 실제 생성 없이 결과를
+RUNPODS_HMAC_SECRET 으로 서명해 POST /callbacks/generations 로 보낸다.
+(GENERATION_CALLBACK_URL 을 설정하지 않은 app.worker 와 동시에 실행하지 말 것)
+
+Usage:
+    cd backend
+    python fake_worker.py                      # http://localhost:8000 으로 콜백
+    CALLBACK_API_URL=http://api:8000 python fake_worker.py
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app.callbacks import SIGNATURE_HEADER, sign_body
+from app.db import SessionLocal
+from app.generation_queue import claim_queued_tasks, mark_submitted
+
+API_URL = os.environ.get("CALLBACK_API_URL", "http://localhost:8000")
+WORKER_ID = "fake-worker"
+POLL_INTERVAL = 1.0
+
+
+def _fake_result(request_id: str) -> dict:
+    return {
+        "request_id": request_id,
+        "status": "OK",
+        "payload": {
+            "images": [{"url": f"https://placehold.co/1024x1024.png?text={request_id[:8]}"}],
+            "seed": random.randint(0, 2**31 - 1),
+            "has_nsfw_concepts": [False],
+        },
+    }
+
+
+def process_once(client: httpx.Client) -> int:
+    db = SessionLocal()
+    try:
+        tasks = claim_queued_tasks(db, WORKER_ID, limit=10)
+        for task in tasks:
+            request_id = str(uuid.uuid4())
+            mark_submitted(db, task, request_id)
+
+            body = json.dumps(_fake_result(request_id)).encode()
+            response = client.post(
+                f"{API_URL}/callbacks/generations",
+                content=body,
+                headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign_body(body)},
+            )
+            print(f"[INFO] generation {task.generation_id} → {response.status_code} {response.text}")
+        return len(tasks)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print(f"[INFO] fake worker → {API_URL}/callbacks/generations")
+    with httpx.Client(timeout=10.0) as client:
+        while True:
+            process_once(client)
+            time.sleep(POLL_INTERVAL)
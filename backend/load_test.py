@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+API 동시성 부하 테스트
+
+동시 요청 수를 단계적으로 늘려 가며 처리량(req/s)과 지연(p50/p99)을 측정한다.
+동기 엔드포인트는 Starlette 스레드풀(기본 40) 크기에서, async 엔드포인트는
+DB 풀(ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW) 크기에서 처리량이 꺾이는지 비교할 때 사용한다.
+(같은 DB로 변경 전/후 커밋을 각각 띄워 실행)
+--login-storm N 을 주면 측정하는 동안 N개의 동시 로그인 요청을 계속 보내
+로그인 처리량과, 그 사이 다른 엔드포인트의 p99 지연을 함께 출력한다.
+
+Usage:
+    cd backend
+    python load_test.py --token <access_token>
+    python load_test.py --url http://localhost:8000 --token <access_token> \\
+        --path "/my/generations?limit=20" --path /generations/1 --concurrency 10,50,200
+    python load_test.py --token <access_token> --login-storm 50 \\
+        --login-email user@example.com --login-password <password>
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Optional
+
+import httpx
+
+DEFAULT_PATHS = ["/my/generations?limit=20", "/my/avatars?limit=20"]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    paths: list[str],
+    deadline: float,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    index = 0
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def _login_worker(
+    client: httpx.AsyncClient,
+    credentials: dict,
+    deadline: float,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/auth/login", json=credentials)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+async def run_level(
+    url: str,
+    token: str,
+    paths: list[str],
+    concurrency: int,
+    duration: float,
+    login_storm: int = 0,
+    login_credentials: Optional[dict] = None,
+) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    login_latencies: list[float] = []
+    login_errors: list[int] = []
+    connections = concurrency + login_storm
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(
+        base_url=url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=30.0,
+    ) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_worker(client, paths, deadline, latencies, errors) for _ in range(concurrency)),
+            *(
+                _login_worker(client, login_credentials, deadline, login_latencies, login_errors)
+                for _ in range(login_storm)
+            ),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "logins": len(login_latencies),
+        "login_errors": len(login_errors),
+        "login_rps": len(login_latencies) / elapsed,
+        "login_p99_ms": _percentile(login_latencies, 99) * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    paths = args.path or DEFAULT_PATHS
+    levels = [int(value) for value in args.concurrency.split(",")]
+    login_credentials = None
+    if args.login_storm:
+        login_credentials = {"email": args.login_email, "password": args.login_password}
+    print(
+        f"[INFO] {args.url} paths={paths} duration={args.duration}s "
+        f"login_storm={args.login_storm}"
+    )
+    header = f"{'conc':>6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}"
+    if args.login_storm:
+        header += f" {'logins':>7} {'login err':>9} {'login/s':>8} {'login p99':>10}"
+    print(header)
+    for concurrency in levels:
+        result = await run_level(
+            args.url,
+            args.token,
+            paths,
+            concurrency,
+            args.duration,
+            args.login_storm,
+            login_credentials,
+        )
+        line = (
+            f"{result['concurrency']:>6} {result['requests']:>9} {result['errors']:>7} "
+            f"{result['rps']:>9.1f} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}"
+        )
+        if args.login_storm:
+            line += (
+                f" {result['logins']:>7} {result['login_errors']:>9} "
+                f"{result['login_rps']:>8.1f} {result['login_p99_ms']:>10.1f}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API 동시성 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Access Token (Bearer)")
+    parser.add_argument("--path", action="append", help="GET 경로 (여러 번 지정 가능)")
+    parser.add_argument("--concurrency", default="10,50,100,200")
+    parser.add_argument("--duration", type=float, default=10.0, help="단계별 측정 시간(초)")
+    parser.add_argument("--login-storm", type=int, default=0, help="동시 로그인 요청 수")
+    parser.add_argument("--login-email")
+    parser.add_argument("--login-password")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Add idempotency_key column (unique per buyer) to generations table.
+
+Usage:
+    cd backend
+    python migrations/add_generation_idempotency_key.py
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import engine  # noqa: E402
+
+
+def add_idempotency_key_column() -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "ALTER TABLE generations "
+                "ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS "
+                "uq_generations_buyer_idempotency_key "
+                "ON generations (buyer_id, idempotency_key)"
+            )
+        )
+
+
+if __name__ == "__main__":
+    add_idempotency_key_column()
+    print("Done: added generations.idempotency_key column (if missing).")
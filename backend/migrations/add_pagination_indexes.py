@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Add composite (owner, created_at, id) indexes for cursor pagination on
+/my/generations, /my/avatars and /my/training-requests.
+
+Indexes are built CONCURRENTLY so the tables stay writable.
+
+Usage:
+    cd backend
+    python migrations/add_pagination_indexes.py
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import engine  # noqa: E402
+
+INDEXES = [
+    ("ix_generations_buyer_created_id", "generations", "buyer_id, created_at, id"),
+    ("ix_avatars_user_created_id", "avatars", "user_id, created_at, id"),
+    (
+        "ix_training_requests_user_created_id",
+        "training_requests",
+        "user_id, created_at, id",
+    ),
+]
+
+
+def add_pagination_indexes() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT"
+    ) as connection:
+        for index_name, table_name, columns in INDEXES:
+            connection.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                    f"ON {table_name} ({columns})"
+                )
+            )
+
+
+if __name__ == "__main__":
+    add_pagination_indexes()
+    print("Done: added pagination indexes (if missing).")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Add thumbnail_url columns to generations and avatars tables (image derivatives).
+
+Usage:
+    cd backend
+    python migrations/add_thumbnail_url_columns.py
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import engine  # noqa: E402
+
+
+def add_thumbnail_url_columns() -> None:
+    with engine.begin() as connection:
+        for table in ("generations", "avatars"):
+            connection.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS thumbnail_url VARCHAR")
+            )
+
+
+if __name__ == "__main__":
+    add_thumbnail_url_columns()
+    print("Done: added generations/avatars.thumbnail_url columns (if missing).")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Add upload_manifest column to training_requests table (presigned direct uploads).
+
+Usage:
+    cd backend
+    python migrations/add_training_request_upload_manifest.py
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import engine  # noqa: E402
+
+
+def add_upload_manifest_column() -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "ALTER TABLE training_requests "
+                "ADD COLUMN IF NOT EXISTS upload_manifest JSONB"
+            )
+        )
+
+
+if __name__ == "__main__":
+    add_upload_manifest_column()
+    print("Done: added training_requests.upload_manifest column (if missing).")
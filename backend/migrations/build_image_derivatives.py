@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Backfill: build thumbnails / WebP (and AVIF when available) derivatives for stored
+generation images and avatar previews that have no thumbnail_url yet.
+
+Only images already in our storage are processed (run rehost_generation_images.py first).
+
+Usage:
+    cd backend
+    python migrations/build_image_derivatives.py
+"""
+
+import sys
+from concurrent.futures import wait
+from pathlib import Path
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import SessionLocal  # noqa: E402
+from app.derivatives import (  # noqa: E402
+    schedule_avatar_derivatives,
+    schedule_generation_derivatives,
+    shutdown_pools,
+)
+from app.models import Avatar, Generation  # noqa: E402
+from app.storage import is_stored_url  # noqa: E402
+
+BATCH_SIZE = 500
+
+
+def _backfill(model, url_column, schedule) -> tuple[int, int]:
+    built = failed = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(model.id, url_column)
+                .filter(
+                    model.id > last_id,
+                    url_column.isnot(None),
+                    model.thumbnail_url.is_(None),
+                )
+                .order_by(model.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+        finally:
+            db.close()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        futures = [schedule(row_id) for row_id, url in rows if is_stored_url(url)]
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                failed += 1
+            elif future.result():
+                built += 1
+        print(f"  {model.__tablename__} up to id {last_id}: built={built}, failed={failed}")
+    return built, failed
+
+
+def build_image_derivatives() -> None:
+    generations = _backfill(Generation, Generation.image_url, schedule_generation_derivatives)
+    avatars = _backfill(Avatar, Avatar.preview_image_url, schedule_avatar_derivatives)
+    print(f"Done: generations built={generations[0]} failed={generations[1]}, "
+          f"avatars built={avatars[0]} failed={avatars[1]}.")
+
+
+if __name__ == "__main__":
+    try:
+        build_image_derivatives()
+    finally:
+        shutdown_pools()
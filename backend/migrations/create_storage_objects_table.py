@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Create storage_objects table (content-addressed objects and their reference counts).
+
+Usage:
+    cd backend
+    python migrations/create_storage_objects_table.py
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import engine  # noqa: E402
+
+
+def create_storage_objects_table() -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS storage_objects ("
+                "key VARCHAR PRIMARY KEY, "
+                "sha256 VARCHAR(64) NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "content_type VARCHAR, "
+                "ref_count INTEGER NOT NULL DEFAULT 0, "
+                "created_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc')"
+                ")"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_storage_objects_sha256 "
+                "ON storage_objects (sha256)"
+            )
+        )
+
+
+if __name__ == "__main__":
+    create_storage_objects_table()
+    print("Done: created storage_objects table (if missing).")
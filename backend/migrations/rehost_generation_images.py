@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Backfill: copy images of successful generations from the provider CDN into our storage
+and point generations.image_url at the permanent URL.
+
+Runs on the rehost thread pool (REHOST_WORKERS concurrent downloads), keyset-paginated by id.
+
+Usage:
+    cd backend
+    python migrations/rehost_generation_images.py
+"""
+
+import sys
+from concurrent.futures import wait
+from pathlib import Path
+
+# Add backend folder to Python path
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.db import SessionLocal  # noqa: E402
+from app.fal_client import close_clients  # noqa: E402
+from app.models import Generation, GenerationStatus  # noqa: E402
+from app.rehost import rehost_generations, shutdown_executor  # noqa: E402
+from app.storage import is_stored_url  # noqa: E402
+
+BATCH_SIZE = 500
+
+
+def _next_batch(last_id: int) -> list[tuple[int, str]]:
+    db = SessionLocal()
+    try:
+        return (
+            db.query(Generation.id, Generation.image_url)
+            .filter(
+                Generation.id > last_id,
+                Generation.status == GenerationStatus.SUCCESS.value,
+                Generation.image_url.isnot(None),
+            )
+            .order_by(Generation.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def rehost_generation_images() -> tuple[int, int]:
+    rehosted = failed = 0
+    last_id = 0
+    while True:
+        rows = _next_batch(last_id)
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        futures = rehost_generations(
+            generation_id for generation_id, image_url in rows if not is_stored_url(image_url)
+        )
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                failed += 1
+            elif future.result():
+                rehosted += 1
+        print(f"  up to generation {last_id}: rehosted={rehosted}, failed={failed}")
+    return rehosted, failed
+
+
+if __name__ == "__main__":
+    try:
+        rehosted, failed = rehost_generation_images()
+    finally:
+        shutdown_executor()
+        close_clients()
+    print(f"Done: rehosted {rehosted} generation images ({failed} failed).")
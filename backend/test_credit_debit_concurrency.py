@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+import sys
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateSchema, DropSchema
+
+from app.credits import InsufficientCreditsError, debit_credits
+from app.db import Base
+from app.models import Transaction, User
+
+THREAD_COUNT = 8
+ATTEMPTS_PER_THREAD = 50
+INITIAL_BALANCE = 200  # THREAD_COUNT * ATTEMPTS_PER_THREAD 보다 작게 두어 경합 유도
+
+
+def _create_engine(db_path: str):
+    """(엔진, 임시 스키마) 반환, SQLite 는 임시 디렉토리의 파일이므로 스키마 없음"""
+    # CREDIT_STRESS_DATABASE_URL 로 로컬 PostgreSQL 등을 지정할 수 있다.
+    # 기존 users/transactions 를 건드리지 않도록 일회용 스키마에 테이블을 만들고 그 스키마만 삭제한다.
+    database_url = os.environ.get("CREDIT_STRESS_DATABASE_URL")
+    if database_url:
+        schema = f"credit_stress_{uuid.uuid4().hex[:12]}"
+        engine = create_engine(database_url, pool_size=THREAD_COUNT)
+        with engine.begin() as conn:
+            conn.execute(CreateSchema(schema))
+        return engine.execution_options(schema_translate_map={None: schema}), schema
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"timeout": 30, "check_same_thread": False},
+        pool_size=THREAD_COUNT,
+    )
+    return engine, None
+
+
+def _drop_schema(engine, schema) -> None:
+    if schema is None:
+        return
+    with engine.begin() as conn:
+        conn.execute(DropSchema(schema, cascade=True))
+
+
+def _run_stress(engine):
+    tables = [User.__table__, Transaction.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = SessionLocal()
+    user = User(
+        email="stress@example.com",
+        nickname="stress",
+        password_hash="-",
+        role="buyer",
+        credit_balance=INITIAL_BALANCE,
+        status="active",
+        locale="en",
+    )
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    results = {"debited": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def worker():
+        session = SessionLocal()
+        try:
+            for _ in range(ATTEMPTS_PER_THREAD):
+                try:
+                    debit_credits(session, user_id, 1)
+                    session.commit()
+                    outcome = "debited"
+                except InsufficientCreditsError:
+                    session.rollback()
+                    outcome = "rejected"
+                with lock:
+                    results[outcome] += 1
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(THREAD_COUNT)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        final_balance = db.get(User, user_id).credit_balance
+        tx_count = db.query(func.count(Transaction.id)).scalar()
+        tx_sum = db.query(func.sum(Transaction.amount)).scalar()
+    finally:
+        db.close()
+
+    total = THREAD_COUNT * ATTEMPTS_PER_THREAD
+    print(
+        f"[INFO] {engine.dialect.name}: {total} debits in {elapsed * 1000:.1f} ms "
+        f"({total / elapsed:.0f} ops/s), debited={results['debited']}, "
+        f"rejected={results['rejected']}, final_balance={final_balance}"
+    )
+
+    assert final_balance == 0
+    assert results["debited"] == INITIAL_BALANCE
+    assert tx_count == INITIAL_BALANCE
+    assert tx_sum == -INITIAL_BALANCE
+    print("[SUCCESS] 동시 차감에서도 잔액이 음수가 되지 않음")
+
+
+def test_credit_debit_concurrency():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine, schema = _create_engine(os.path.join(tmp_dir, "credits.db"))
+        try:
+            _run_stress(engine)
+        finally:
+            _drop_schema(engine, schema)
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    test_credit_debit_concurrency()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+import sys
+import os
+import tempfile
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from PIL import Image
+
+from app import storage
+from app.config import settings
+from app.derivatives import (
+    THUMBNAIL_SUFFIX,
+    avif_supported,
+    build_derivatives,
+    derivative_key,
+    render_derivatives,
+    shutdown_pools,
+)
+from app.metrics import metrics
+
+
+def _image_bytes(width: int, height: int, mode: str = "RGB") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, (width, height), (10, 120, 200)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _open(data: bytes):
+    with Image.open(BytesIO(data)) as image:
+        return image.format, image.size
+
+
+def _check_render():
+    outputs = render_derivatives(_image_bytes(300, 150, "P"), 64, with_avif=False)
+    assert [(suffix, content_type) for suffix, _, content_type in outputs] == [
+        (THUMBNAIL_SUFFIX, "image/webp"),
+        (".webp", "image/webp"),
+    ]
+    assert _open(outputs[0][1]) == ("WEBP", (64, 32))
+    assert _open(outputs[1][1]) == ("WEBP", (300, 150))
+
+    # 썸네일 크기보다 작은 원본은 확대하지 않음
+    outputs = render_derivatives(_image_bytes(40, 20), 64, with_avif=False)
+    assert _open(outputs[0][1]) == ("WEBP", (40, 20))
+
+
+def _check_build(upload_dir: str):
+    backend = storage.get_storage_backend()
+    stored = backend.put(BytesIO(_image_bytes(600, 400)), "source.png", "image/png")
+    stem = stored.key[: -len(".png")]
+    assert derivative_key(stored.key, THUMBNAIL_SUFFIX) == f"{stem}.thumb.webp"
+
+    built = metrics.snapshot()["counters"].get("image_derivatives_built", 0)
+    thumbnail_url = build_derivatives(stored.key)
+    thumbnail_key = derivative_key(stored.key, THUMBNAIL_SUFFIX)
+    assert thumbnail_url == backend.url_for(thumbnail_key)
+
+    expected = {
+        thumbnail_key: ("WEBP", (settings.THUMBNAIL_SIZE, settings.THUMBNAIL_SIZE * 2 // 3)),
+        derivative_key(stored.key, ".webp"): ("WEBP", (600, 400)),
+    }
+    if avif_supported():
+        expected[derivative_key(stored.key, ".avif")] = ("AVIF", (600, 400))
+    for key, (image_format, size) in expected.items():
+        with open(os.path.join(upload_dir, key), "rb") as file:
+            assert _open(file.read()) == (image_format, size), key
+
+    # 썸네일이 이미 있으면 다시 만들지 않음
+    assert build_derivatives(stored.key) == thumbnail_url
+    assert metrics.snapshot()["counters"]["image_derivatives_built"] == built + 1
+
+
+def test_derivatives():
+    _check_render()
+    print("[SUCCESS] 썸네일 / 원본 크기 WebP 렌더링")
+
+    original = (settings.UPLOAD_DIR, settings.STORAGE_TYPE, settings.THUMBNAIL_SIZE)
+    original_backend = storage._backend
+    with tempfile.TemporaryDirectory() as upload_dir:
+        settings.UPLOAD_DIR = upload_dir
+        settings.STORAGE_TYPE = "local"
+        settings.THUMBNAIL_SIZE = 120
+        storage._backend = None
+        try:
+            _check_build(upload_dir)
+            print("[SUCCESS] 원본 키 옆에 파생본 저장, 재호출 시 재사용")
+        finally:
+            settings.UPLOAD_DIR, settings.STORAGE_TYPE, settings.THUMBNAIL_SIZE = original
+            storage._backend = original_backend
+            shutdown_pools()
+
+
+if __name__ == "__main__":
+    test_derivatives()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app import fal_client
+from app.config import settings
+
+REQUEST_COUNT = 50
+
+
+class _StubFalHandler(BaseHTTPRequestHandler):
+    """fal.ai queue status 엔드포인트를 흉내내는 로컬 스텁"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive 허용
+    disable_nagle_algorithm = True
+    connection_count = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        with _StubFalHandler.lock:
+            _StubFalHandler.connection_count += 1
+        super().setup()
+
+    def do_GET(self):
+        body = b'{"status": "IN_PROGRESS"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _run_benchmark(label, call):
+    _StubFalHandler.connection_count = 0
+    started = time.perf_counter()
+    for i in range(REQUEST_COUNT):
+        call(f"req-{i}")
+    elapsed = time.perf_counter() - started
+    connections = _StubFalHandler.connection_count
+    print(
+        f"[INFO] {label}: {REQUEST_COUNT} requests, {connections} connections, "
+        f"{elapsed * 1000:.1f} ms ({elapsed / REQUEST_COUNT * 1000:.3f} ms/req)"
+    )
+    return connections, elapsed
+
+
+def test_fal_client_pool():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubFalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    original_base_url = settings.FAL_API_BASE_URL
+    original_api_key = settings.FAL_API_KEY
+    settings.FAL_API_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.FAL_API_KEY = "test"
+    fal_client.close_clients()
+
+    try:
+        # 기존 방식: 호출마다 새 httpx.Client 생성
+        def fresh_client_status(request_id):
+            url = fal_client._build_url(f"/requests/{request_id}/status")
+            with httpx.Client(timeout=30) as client:
+                return client.get(url, headers=fal_client._headers()).json()
+
+        fresh_connections, fresh_elapsed = _run_benchmark(
+            "fresh client per call", fresh_client_status
+        )
+        pooled_connections, pooled_elapsed = _run_benchmark(
+            "shared pooled client", fal_client.get_status
+        )
+
+        assert fresh_connections == REQUEST_COUNT
+        assert pooled_connections <= settings.FAL_HTTP_MAX_KEEPALIVE
+        print(
+            f"[SUCCESS] 커넥션 {fresh_connections} → {pooled_connections}, "
+            f"speedup x{fresh_elapsed / pooled_elapsed:.1f}"
+        )
+    finally:
+        fal_client.close_clients()
+        settings.FAL_API_BASE_URL = original_base_url
+        settings.FAL_API_KEY = original_api_key
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    test_fal_client_pool()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app import fal_client
+from app.fal_dispatcher import AdaptiveLimiter, FalDispatcher, ProviderThrottled
+
+
+def _check_additive_increase():
+    limiter = AdaptiveLimiter(max_limit=8, min_limit=1, cooldown_seconds=0)
+    limiter._limit = 2.0
+    # 2 → 2.5 → 2.9 → 3.24 (성공마다 1/현재 limit 증가)
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.limit == 2
+    assert abs(limiter._limit - 2.9) < 1e-9
+    limiter.on_success()
+    assert limiter.limit == 3
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+    assert limiter._limit == 8.0
+    assert limiter.capacity(in_flight=3) == 5
+    assert limiter.capacity(in_flight=20) == 0
+
+
+def _check_multiplicative_decrease():
+    limiter = AdaptiveLimiter(max_limit=8, min_limit=2, cooldown_seconds=0)
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    limiter.on_throttle()
+    assert limiter.limit == 2
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 2
+    assert limiter._limit == 2.0
+
+    # cooldown 동안에는 연속된 429 로 한 번만 감소
+    limiter = AdaptiveLimiter(max_limit=8, min_limit=1, cooldown_seconds=60)
+    for _ in range(5):
+        limiter.on_throttle()
+    assert limiter.limit == 4
+
+    # Retry-After 동안 신규 제출 중지 (한도 감소는 cooldown 과 별개)
+    limiter.on_throttle(retry_after=60)
+    assert limiter.limit == 4
+    assert limiter.capacity(in_flight=0) == 0
+
+
+def _raise_status(status_code, headers=None):
+    def call(*_args):
+        request = httpx.Request("POST", "https://queue.fal.run/test")
+        response = httpx.Response(status_code, headers=headers, request=request)
+        raise httpx.HTTPStatusError("error", request=request, response=response)
+
+    return call
+
+
+def _check_dispatcher():
+    limiter = AdaptiveLimiter(max_limit=8, min_limit=1, cooldown_seconds=0)
+    dispatcher = FalDispatcher(limiter)
+    original_submit = fal_client.submit_generation
+    original_result = fal_client.get_result
+    try:
+        for status_code in (429, 500, 503):
+            fal_client.submit_generation = _raise_status(status_code)
+            try:
+                dispatcher.submit("prompt")
+            except ProviderThrottled as exc:
+                assert exc.status_code == status_code
+            else:
+                raise AssertionError("ProviderThrottled expected")
+        assert limiter.limit == 1
+
+        # 4xx(429 제외)는 요청 자체의 오류 → 한도 유지, 그대로 전달
+        fal_client.submit_generation = _raise_status(400)
+        try:
+            dispatcher.submit("prompt")
+        except httpx.HTTPStatusError:
+            pass
+        else:
+            raise AssertionError("HTTPStatusError expected")
+        assert limiter.limit == 1
+
+        fal_client.submit_generation = _raise_status(429, {"Retry-After": "30"})
+        try:
+            dispatcher.submit("prompt")
+        except ProviderThrottled as exc:
+            assert exc.retry_after == 30.0
+        assert dispatcher.capacity(in_flight=0) == 0
+
+        limiter._paused_until = 0.0
+        fal_client.get_result = lambda request_id: {"request_id": request_id}
+        dispatcher.result("req-1")
+        dispatcher.result("req-2")
+        assert limiter.limit == 2
+    finally:
+        fal_client.submit_generation = original_submit
+        fal_client.get_result = original_result
+
+
+def test_fal_dispatcher():
+    _check_additive_increase()
+    print("[SUCCESS] 성공 시 1/limit 씩 증가, max_limit 에서 멈춤")
+    _check_multiplicative_decrease()
+    print("[SUCCESS] 429/5xx 시 절반으로 감소, min_limit / cooldown / Retry-After 적용")
+    _check_dispatcher()
+    print("[SUCCESS] FalDispatcher 가 throttle 응답만 limiter 에 반영")
+
+
+if __name__ == "__main__":
+    test_fal_dispatcher()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.callbacks import (
+    apply_generation_callback,
+    callback_url_for,
+    sign_body,
+    verify_generation_token,
+    verify_signature,
+)
+from app.config import settings
+from app.db import Base
+from app.generation_queue import (
+    GENERATION_TASK_TYPE,
+    fail_stale_tasks,
+    mark_submitted,
+)
+from app.models import Generation, Task, Transaction, User
+
+CREDITS = 3
+
+
+def _check_signatures():
+    body = json.dumps({"request_id": "req-1", "status": "OK"}).encode()
+    signature = sign_body(body)
+    assert verify_signature(body, signature)
+    assert not verify_signature(body + b" ", signature)
+    assert not verify_signature(body, None)
+    assert not verify_signature(body, "")
+    assert not verify_signature(body, signature[len("sha256="):])
+    assert not verify_signature(body, "sha256=" + "0" * 64)
+
+    original_url = settings.GENERATION_CALLBACK_URL
+    settings.GENERATION_CALLBACK_URL = "https://api.example.com/callbacks/generations"
+    try:
+        url = callback_url_for(7)
+    finally:
+        settings.GENERATION_CALLBACK_URL = original_url
+    token = url.split("token=")[1]
+    assert verify_generation_token(7, token)
+    assert not verify_generation_token(8, token)
+    assert not verify_generation_token(7, token[:-1] + ("0" if token[-1] != "0" else "1"))
+    assert not verify_generation_token(7, None)
+
+
+def _add_generation(db, user_id, request_id=None):
+    generation = Generation(
+        buyer_id=user_id,
+        credits_used=CREDITS,
+        prompt="prompt",
+        status="pending",
+        request_id=request_id,
+    )
+    db.add(generation)
+    db.flush()
+    task = Task(
+        generation=generation,
+        task_type=GENERATION_TASK_TYPE,
+        status="running",
+        worker_id="worker-1",
+        started_at=datetime.utcnow(),
+        retry_count=0,
+    )
+    db.add(task)
+    db.commit()
+    return generation.id, task.id
+
+
+def test_generation_callbacks():
+    _check_signatures()
+    print("[SUCCESS] HMAC 서명 / generation 토큰 검증")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'callbacks.db')}")
+        tables = [User.__table__, Generation.__table__, Task.__table__, Transaction.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = SessionLocal()
+        try:
+            user = User(
+                email="callback@example.com",
+                nickname="callback",
+                password_hash="-",
+                role="buyer",
+                credit_balance=0,
+                status="active",
+                locale="en",
+            )
+            db.add(user)
+            db.commit()
+            user_id = user.id
+
+            # 제출 응답(mark_submitted)보다 webhook 이 먼저 도착
+            generation_id, task_id = _add_generation(db, user_id)
+            body = {"request_id": "req-early", "status": "OK", "payload": {"seed": 42}}
+            generation = apply_generation_callback(db, body, generation_id)
+            assert generation.status == "success"
+            assert generation.request_id == "req-early"
+            mark_submitted(db, db.get(Task, task_id), "req-early")
+            db.expire_all()
+            generation = db.get(Generation, generation_id)
+            assert generation.status == "success"
+            assert generation.seed == "42"
+            assert db.get(Task, task_id).status == "success"
+            print("[SUCCESS] webhook 선도착 후 제출 기록이 상태를 되돌리지 않음")
+
+            # 실패 콜백 → 1회 환불, 같은 콜백 재전송은 변경 없음
+            generation_id, task_id = _add_generation(db, user_id, request_id="req-fail")
+            body = {"request_id": "req-fail", "status": "ERROR", "error": "boom"}
+            for _ in range(3):
+                generation = apply_generation_callback(db, body)
+                assert generation.id == generation_id
+                assert generation.status == "failed"
+                db.expire_all()
+                assert db.get(User, user_id).credit_balance == CREDITS
+                assert db.query(func.count(Transaction.id)).scalar() == 1
+            assert db.get(Generation, generation_id).fail_reason == "boom"
+
+            # 종료 후 성공 콜백이 와도 결과를 덮어쓰지 않음
+            generation = apply_generation_callback(
+                db, {"request_id": "req-fail", "status": "OK", "payload": {"seed": 1}}
+            )
+            assert generation.status == "failed" and generation.seed is None
+            print("[SUCCESS] 종료 상태 이후 재전송된 콜백은 중복 환불/덮어쓰기 없음")
+
+            # request_id 불일치 / 대상 없음
+            generation_id, _ = _add_generation(db, user_id, request_id="req-a")
+            assert apply_generation_callback(
+                db, {"request_id": "req-b", "status": "OK"}, generation_id
+            ) is None
+            assert db.get(Generation, generation_id).status == "pending"
+            assert apply_generation_callback(db, {"request_id": "missing", "status": "OK"}) is None
+            assert apply_generation_callback(db, {"status": "OK"}) is None
+            print("[SUCCESS] request_id 불일치 / 알 수 없는 콜백 무시")
+
+            # 시간 초과 처리: 이미 종료된 Generation 은 다시 환불하지 않음
+            db.query(Task).update({Task.started_at: datetime.utcnow() - timedelta(hours=1)})
+            db.query(Task).filter(Task.generation_id == generation_id).update(
+                {Task.status: "running"}
+            )
+            db.query(Task).filter(Task.generation_id != generation_id).update(
+                {Task.status: "running"}
+            )
+            db.commit()
+            assert fail_stale_tasks(db, timeout_seconds=60) == 1
+            db.expire_all()
+            assert db.get(Generation, generation_id).status == "failed"
+            assert db.get(User, user_id).credit_balance == CREDITS * 2
+            assert db.query(func.count(Transaction.id)).scalar() == 2
+            assert db.query(func.count(Task.id)).filter(Task.status == "running").scalar() == 0
+            print("[SUCCESS] 시간 초과 작업은 종료되지 않은 Generation 만 실패/환불")
+        finally:
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    test_generation_callbacks()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import sys
+import os
+import asyncio
+import threading
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.generation_events import (
+    GenerationEventStream,
+    InMemoryBroker,
+    generation_event,
+)
+from app.read_queries import GenerationRow
+
+
+def _event(generation_id: int, status: str):
+    row = GenerationRow(
+        id=generation_id,
+        avatar_id=None,
+        buyer_id=1,
+        credits_used=1,
+        prompt="prompt",
+        request_id=None,
+        image_url=None,
+        thumbnail_url=None,
+        seed=None,
+        status=status,
+        fail_reason=None,
+        nsfw_flag=None,
+        created_at=datetime(2026, 1, 1),
+    )
+    return generation_event(row)
+
+
+async def _run() -> None:
+    broker = InMemoryBroker()
+    subscription = await broker.subscribe([1, 2])
+    assert broker.stats() == {"subscriptions": 1, "generations": 2}
+
+    # 워커/스레드풀처럼 다른 스레드에서 발행, 같은 generation 은 최신 이벤트만 남음
+    def publish() -> None:
+        broker.publish(_event(1, "processing"))
+        broker.publish(_event(1, "success"))
+        broker.publish(_event(3, "success"))
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    thread.join()
+    events = await subscription.get(timeout=1.0)
+    assert [(event.generation_id, event.status) for event in events] == [(1, "success")]
+    assert await subscription.get(timeout=0.05) == []
+
+    # 초기 상태 → 전이 → 모두 종료되면 end
+    stream = GenerationEventStream(subscription, [_event(1, "success"), _event(2, "processing")])
+    chunks = []
+
+    async def consume() -> None:
+        async for chunk in stream.body_iterator:
+            chunks.append(chunk)
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.05)
+    broker.publish(_event(2, "failed"))
+    await asyncio.wait_for(consumer, timeout=1.0)
+
+    assert len(chunks) == 4
+    assert chunks[0].startswith(b"event: generation\ndata: {\"id\":1,")
+    assert b'"status":"failed"' in chunks[2]
+    assert chunks[-1].startswith(b"event: end")
+
+    subscription.close()
+    assert broker.stats() == {"subscriptions": 0, "generations": 0}
+
+    # 다른 프로세스(워커)의 전이는 브로커로 오지 않음 → 주기적으로 DB 상태를 다시 읽어 전달
+    states = {3: "processing"}
+
+    async def reload(generation_ids):
+        assert generation_ids == [3]
+        return [_event(3, states[3])]
+
+    original_interval = settings.GENERATION_EVENTS_KEEPALIVE_SECONDS
+    settings.GENERATION_EVENTS_KEEPALIVE_SECONDS = 0.02
+    try:
+        subscription = await broker.subscribe([3])
+        stream = GenerationEventStream(subscription, [_event(3, "processing")], reload=reload)
+        chunks = []
+
+        async def consume_reloaded() -> None:
+            async for chunk in stream.body_iterator:
+                chunks.append(chunk)
+                if len(chunks) == 3:
+                    states[3] = "success"
+
+        await asyncio.wait_for(consume_reloaded(), timeout=1.0)
+    finally:
+        settings.GENERATION_EVENTS_KEEPALIVE_SECONDS = original_interval
+        subscription.close()
+
+    generation_chunks = [chunk for chunk in chunks if chunk.startswith(b"event: generation")]
+    assert len(generation_chunks) == 2
+    assert b'"status":"success"' in generation_chunks[1]
+    assert b": keepalive\n\n" in chunks
+    assert chunks[-1].startswith(b"event: end")
+
+
+def test_generation_events():
+    asyncio.run(_run())
+    print("[SUCCESS] generation 상태 이벤트 팬아웃 / SSE 스트림 확인")
+
+
+if __name__ == "__main__":
+    test_generation_events()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import sys
+import os
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.main import _create_generation
+from app.models import Generation, Task, Transaction, User
+from app.schemas import GenerationCreateRequest
+from app.user_cache import AuthUser
+
+THREAD_COUNT = 8
+INITIAL_BALANCE = 10
+OPTION_CREDITS = 2
+
+
+def test_generation_idempotency():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp_dir, 'idempotency.db')}",
+            connect_args={"timeout": 30, "check_same_thread": False},
+            pool_size=THREAD_COUNT,
+        )
+        tables = [User.__table__, Generation.__table__, Task.__table__, Transaction.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = SessionLocal()
+        user = User(
+            email="idempotency@example.com",
+            nickname="idempotency",
+            password_hash="-",
+            role="buyer",
+            credit_balance=INITIAL_BALANCE,
+            status="active",
+            locale="en",
+        )
+        db.add(user)
+        db.commit()
+        buyer = AuthUser(id=user.id, email=user.email, role=user.role, status=user.status)
+        db.close()
+
+        payload = GenerationCreateRequest(
+            prompt="prompt", option_credits=OPTION_CREDITS, idempotency_key="same-key"
+        )
+        barrier = threading.Barrier(THREAD_COUNT)
+        results = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker():
+            session = SessionLocal()
+            try:
+                barrier.wait()
+                response = _create_generation(session, payload, buyer)
+                with lock:
+                    results.append(response.id)
+            except Exception as exc:
+                with lock:
+                    errors.append(exc)
+            finally:
+                session.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(THREAD_COUNT)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        db = SessionLocal()
+        try:
+            generation_count = db.query(func.count(Generation.id)).scalar()
+            task_count = db.query(func.count(Task.id)).scalar()
+            tx_count = db.query(func.count(Transaction.id)).scalar()
+            balance = db.get(User, buyer.id).credit_balance
+        finally:
+            db.close()
+            engine.dispose()
+
+    print(
+        f"[INFO] {THREAD_COUNT} concurrent requests: ids={sorted(set(results))}, "
+        f"generations={generation_count}, tasks={task_count}, debits={tx_count}"
+    )
+    assert errors == []
+    assert len(results) == THREAD_COUNT
+    assert len(set(results)) == 1
+    assert generation_count == 1
+    assert task_count == 1
+    assert tx_count == 1
+    assert balance == INITIAL_BALANCE - (1 + OPTION_CREDITS)
+    print("[SUCCESS] 같은 idempotency_key 동시 요청은 Generation/차감/작업을 한 번만 생성")
+
+
+if __name__ == "__main__":
+    test_generation_idempotency()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+import sys
+import os
+import asyncio
+import tempfile
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from PIL import Image
+
+from app import image_resize, storage
+from app.config import settings
+from app.derivatives import shutdown_pools
+from app.image_resize import DiskLRUCache
+from app.main import app
+from app.metrics import metrics
+
+
+def _counter(name: str) -> int:
+    return metrics.snapshot()["counters"].get(name, 0)
+
+
+def _png(width: int, height: int) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _check_lru(cache_dir: str):
+    cache = DiskLRUCache(cache_dir, max_bytes=10)
+    cache.put("aa.bin", b"1234")
+    cache.put("bb.bin", b"5678")
+    assert cache.read("aa.bin") == b"1234"  # aa 가 최근 사용으로 이동
+    cache.put("cc.bin", b"9012")
+
+    assert cache.read("bb.bin") is None
+    assert not os.path.exists(os.path.join(cache_dir, "bb", "bb.bin"))
+    assert cache.read("aa.bin") == b"1234"
+    assert cache.read("cc.bin") == b"9012"
+    assert cache.stats() == {"entries": 2, "bytes": 8}
+
+    # 인덱스 적재 후 외부에서 삭제된 파일은 miss 로 처리
+    os.unlink(os.path.join(cache_dir, "cc", "cc.bin"))
+    assert cache.read("cc.bin") is None
+    assert cache.stats() == {"entries": 1, "bytes": 4}
+
+
+async def _check_endpoint(key: str):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        url = f"/img/{key}?w=50&h=30&fmt=webp"
+        renders = _counter("img_renders")
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/webp"
+        with Image.open(BytesIO(response.content)) as image:
+            assert image.format == "WEBP"
+            assert image.size == (50, 30)
+        assert _counter("img_renders") == renders + 1
+        print("[SUCCESS] 200x100 PNG → 50x30 WebP 렌더링")
+
+        # 같은 변형은 디스크 캐시에서 전송
+        hits = _counter("img_cache_hits")
+        cached = await client.get(url)
+        assert cached.content == response.content
+        assert _counter("img_cache_hits") == hits + 1
+        assert _counter("img_renders") == renders + 1
+        etag = cached.headers["etag"]
+        assert (await client.get(url, headers={"if-none-match": etag})).status_code == 304
+
+        # 비율 유지 리사이즈 / 다른 포맷
+        response = await client.get(f"/img/{key}?w=40&fmt=png")
+        with Image.open(BytesIO(response.content)) as image:
+            assert image.format == "PNG"
+            assert image.size == (40, 20)
+        print("[SUCCESS] 두 번째 요청은 디스크 캐시에서 전송 (If-None-Match 304)")
+
+        # 같은 변형 동시 요청 → 렌더링 1회
+        renders = _counter("img_renders")
+        url = f"/img/{key}?w=64&fmt=jpeg"
+        responses = await asyncio.gather(*(client.get(url) for _ in range(4)))
+        assert all(response.status_code == 200 for response in responses)
+        assert len({response.content for response in responses}) == 1
+        assert _counter("img_renders") == renders + 1
+        assert image_resize._inflight == {}
+        print("[SUCCESS] 같은 변형 동시 요청 4건에 렌더링 1회")
+
+        assert (await client.get(f"/img/{key}?fmt=webp")).status_code == 400
+        assert (await client.get("/img/avatars/1.png?w=10")).status_code == 400
+        missing = f"{storage.OBJECTS_PREFIX}/00/00/{'0' * 64}.png"
+        assert (await client.get(f"/img/{missing}?w=10")).status_code == 404
+
+
+def test_image_resize():
+    original = (
+        settings.UPLOAD_DIR,
+        settings.STORAGE_TYPE,
+        storage._backend,
+        image_resize.image_cache,
+    )
+    with tempfile.TemporaryDirectory() as upload_dir, tempfile.TemporaryDirectory() as cache_dir:
+        settings.UPLOAD_DIR = upload_dir
+        settings.STORAGE_TYPE = "local"
+        storage._backend = None
+        image_resize.image_cache = DiskLRUCache(cache_dir, 1024 * 1024)
+        try:
+            stored = storage.get_storage_backend().put(
+                BytesIO(_png(200, 100)), "source.png", "image/png"
+            )
+            asyncio.run(_check_endpoint(stored.key))
+
+            _check_lru(os.path.join(cache_dir, "lru"))
+            print("[SUCCESS] 용량 초과 시 가장 오래 사용하지 않은 항목부터 삭제")
+        finally:
+            (
+                settings.UPLOAD_DIR,
+                settings.STORAGE_TYPE,
+                storage._backend,
+                image_resize.image_cache,
+            ) = original
+            shutdown_pools()
+
+
+if __name__ == "__main__":
+    test_image_resize()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import sys
+import os
+import base64
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base, get_async_db
+from app.dependencies import get_current_user_async
+from app.main import app
+from app.models import Generation, User
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.user_cache import AuthUser
+
+ROW_COUNT = 23
+PAGE_LIMIT = 5
+
+
+def _add_users(db):
+    users = [
+        User(
+            email=f"{name}@example.com",
+            nickname=name,
+            password_hash="-",
+            role="buyer",
+            credit_balance=0,
+            status="active",
+            locale="en",
+        )
+        for name in ("pager", "other")
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def _walk_pages(client):
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": PAGE_LIMIT}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/my/generations", params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages += 1
+        ids.extend(item["id"] for item in page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            assert len(page) <= PAGE_LIMIT
+            return ids, pages
+        assert len(page) == PAGE_LIMIT
+
+
+def test_pagination():
+    created_at = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "pagination.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        Base.metadata.create_all(engine, tables=[User.__table__, Generation.__table__])
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        db = SessionLocal()
+        user, other = _add_users(db)
+        started = datetime(2026, 1, 1)
+        # created_at 이 같은 행이 페이지 경계에 걸리도록 3개씩 같은 시각 사용
+        db.execute(
+            insert(Generation),
+            [
+                {
+                    "buyer_id": owner.id,
+                    "credits_used": 1,
+                    "prompt": f"prompt {i}",
+                    "status": "success",
+                    "created_at": started + timedelta(seconds=i // 3),
+                }
+                for i in range(ROW_COUNT)
+                for owner in (user, other)
+            ],
+        )
+        db.commit()
+        expected = [
+            generation.id
+            for generation in db.query(Generation)
+            .filter(Generation.buyer_id == user.id)
+            .order_by(Generation.created_at.desc(), Generation.id.desc())
+        ]
+        current_user = AuthUser(id=user.id, email=user.email, role=user.role, status=user.status)
+        db.close()
+
+        async def override_async_db():
+            async with AsyncSessionLocal() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db] = override_async_db
+        app.dependency_overrides[get_current_user_async] = lambda: current_user
+        try:
+            client = TestClient(app)
+            ids, pages = _walk_pages(client)
+            assert len(expected) == ROW_COUNT
+            assert ids == expected
+            assert len(set(ids)) == ROW_COUNT
+            assert pages == -(-ROW_COUNT // PAGE_LIMIT)
+            print(f"[SUCCESS] {ROW_COUNT}개를 {PAGE_LIMIT}개씩 {pages}페이지: 중복/누락 없음")
+
+            malformed = [
+                "not-a-cursor!",
+                base64.urlsafe_b64encode(b'"x"').decode(),
+                base64.urlsafe_b64encode(b'["not-a-date", 1]').decode(),
+                base64.urlsafe_b64encode(b"[1, 2]").decode(),
+            ]
+            for cursor in malformed:
+                response = client.get("/my/generations", params={"cursor": cursor})
+                assert response.status_code == 400, cursor
+                assert response.json()["detail"] == "Invalid cursor"
+            print("[SUCCESS] 잘못된 커서는 400")
+        finally:
+            app.dependency_overrides.pop(get_async_db, None)
+            app.dependency_overrides.pop(get_current_user_async, None)
+            engine.dispose()
+            async_engine.sync_engine.dispose()
+
+
+if __name__ == "__main__":
+    test_pagination()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import sys
+import os
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models import Generation, User
+from app.read_queries import GENERATION_COLUMNS, GenerationRow, auth_user_stmt, page_stmt
+from app.responses import GENERATION_LIST, orm_json_response
+from app.user_cache import AuthUser
+
+ROW_COUNT = 5000
+
+
+def _measure(label, run):
+    tracemalloc.start()
+    started = time.perf_counter()
+    body = run()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"[INFO] {label}: {elapsed / ROW_COUNT * 1e6:.1f} us/row, "
+        f"peak {peak / 1024 / 1024:.1f} MiB"
+    )
+    return body, elapsed, peak
+
+
+def test_read_queries():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'read.db')}")
+        tables = [User.__table__, Generation.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = SessionLocal()
+        user = User(
+            email="reader@example.com",
+            nickname="reader",
+            password_hash="-",
+            role="buyer",
+            credit_balance=0,
+            status="active",
+            locale="en",
+        )
+        db.add(user)
+        db.commit()
+        started = datetime(2026, 1, 1)
+        db.execute(
+            insert(Generation),
+            [
+                {
+                    "buyer_id": user.id,
+                    "credits_used": 1,
+                    "prompt": f"prompt {i} " * 8,
+                    "image_url": f"https://cdn.example.com/objects/{i:064x}.png",
+                    "status": "success",
+                    "created_at": started + timedelta(seconds=i),
+                }
+                for i in range(ROW_COUNT)
+            ],
+        )
+        db.commit()
+        user_id = user.id
+        db.close()
+
+        def orm_path():
+            with SessionLocal() as session:
+                rows = session.scalars(
+                    select(Generation)
+                    .where(Generation.buyer_id == user_id)
+                    .order_by(Generation.created_at.desc(), Generation.id.desc())
+                    .limit(ROW_COUNT + 1)
+                ).all()
+                return orm_json_response(GENERATION_LIST, rows).body
+
+        def core_path():
+            with SessionLocal() as session:
+                stmt = page_stmt(
+                    Generation,
+                    GENERATION_COLUMNS,
+                    Generation.buyer_id,
+                    user_id,
+                    None,
+                    ROW_COUNT,
+                )
+                rows = [GenerationRow._make(row) for row in session.execute(stmt)]
+                return orm_json_response(GENERATION_LIST, rows).body
+
+        # 컴파일 캐시를 채운 뒤 측정
+        orm_path()
+        core_path()
+        orm_body, orm_elapsed, orm_peak = _measure("ORM select(Generation)", orm_path)
+        core_body, core_elapsed, core_peak = _measure("Core columns + lambda_stmt", core_path)
+
+        assert json.loads(core_body) == json.loads(orm_body)
+        # 단일 측정이라 부하에 따라 흔들리므로 비교는 출력만 한다
+        print(
+            f"[INFO] Core/ORM: time x{core_elapsed / orm_elapsed:.2f}, "
+            f"peak x{core_peak / orm_peak:.2f}"
+        )
+
+        with SessionLocal() as session:
+            auth_user = AuthUser.from_user(session.execute(auth_user_stmt(user_id)).first())
+        assert (auth_user.id, auth_user.status) == (user_id, "active")
+        print("[SUCCESS] 읽기 전용 조회 결과가 ORM 경로와 동일")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    test_read_queries()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import sys
+import os
+import hashlib
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from app import rehost, storage
+from app.config import settings
+from app.rehost import RehostError, fetch_and_store
+from app.storage import content_key
+
+MAX_BYTES = 4096
+IMAGE = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+
+
+def _handler(sent_chunks: list):
+    def endless():
+        # 크기 제한을 넘으면 중단돼야 하므로 끝까지 읽히지 않음
+        for _ in range(1000):
+            sent_chunks.append(1024)
+            yield b"\0" * 1024
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/image.png":
+            return httpx.Response(200, headers={"content-type": "image/png"}, content=IMAGE)
+        if path == "/page.html":
+            return httpx.Response(200, headers={"content-type": "text/html"}, content=b"<html>")
+        if path == "/declared-large.png":
+            headers = {"content-type": "image/png", "content-length": str(MAX_BYTES + 1)}
+            return httpx.Response(200, headers=headers, content=b"\0" * (MAX_BYTES + 1))
+        if path == "/streamed-large.png":
+            return httpx.Response(200, headers={"content-type": "image/png"}, content=endless())
+        return httpx.Response(404)
+
+    return handle
+
+
+def _expect_error(url: str, message: str):
+    try:
+        fetch_and_store(url)
+    except RehostError as exc:
+        assert message in str(exc), exc
+    else:
+        raise AssertionError(f"RehostError expected for {url}")
+
+
+def test_rehost():
+    sent_chunks = []
+    client = httpx.Client(transport=httpx.MockTransport(_handler(sent_chunks)))
+    original = (settings.UPLOAD_DIR, settings.STORAGE_TYPE, settings.REHOST_MAX_BYTES)
+    original_backend, original_get_client = storage._backend, rehost.get_client
+    with tempfile.TemporaryDirectory() as upload_dir:
+        settings.UPLOAD_DIR = upload_dir
+        settings.STORAGE_TYPE = "local"
+        settings.REHOST_MAX_BYTES = MAX_BYTES
+        storage._backend = None
+        rehost.get_client = lambda: client
+        try:
+            _expect_error("https://cdn.example.com/page.html", "Unsupported content type")
+            _expect_error("https://cdn.example.com/missing.png", "returned 404")
+            print("[SUCCESS] 이미지가 아닌 응답 / 오류 상태 거절")
+
+            _expect_error("https://cdn.example.com/declared-large.png", "Image too large")
+            _expect_error("https://cdn.example.com/streamed-large.png", f"exceeds {MAX_BYTES}")
+            # iter_bytes 가 _CHUNK_SIZE 단위로 모으므로 한 청크 이내에서 중단
+            assert sum(sent_chunks) <= MAX_BYTES + rehost._CHUNK_SIZE
+            print("[SUCCESS] 크기 제한 초과 시 수신 중단")
+
+            stored = fetch_and_store("https://cdn.example.com/image.png")
+            sha256 = hashlib.sha256(IMAGE).hexdigest()
+            assert stored.key == content_key(sha256, "generation.png")
+            assert stored.sha256 == sha256
+            assert stored.size == len(IMAGE)
+            assert stored.content_type == "image/png"
+            assert stored.created
+            assert stored.url == f"{settings.STATIC_URL_PREFIX}/{stored.key}"
+            with open(os.path.join(upload_dir, stored.key), "rb") as file:
+                assert file.read() == IMAGE
+
+            # 같은 이미지는 다시 쓰지 않고 같은 객체를 가리킴
+            again = fetch_and_store("https://cdn.example.com/image.png")
+            assert again.key == stored.key
+            assert not again.created
+            print("[SUCCESS] 재호스팅 결과는 콘텐츠 주소 객체로 저장")
+        finally:
+            settings.UPLOAD_DIR, settings.STORAGE_TYPE, settings.REHOST_MAX_BYTES = original
+            storage._backend, rehost.get_client = original_backend, original_get_client
+            client.close()
+
+
+if __name__ == "__main__":
+    test_rehost()
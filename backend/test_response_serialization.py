@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import sys
+import os
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.main import app
+from app.models import Generation
+from app.responses import GENERATION_LIST, orm_json_response
+from app.schemas import GenerationResponse
+
+ROW_COUNT = 2000
+
+
+def _rows() -> list[Generation]:
+    started = datetime(2026, 1, 1)
+    return [
+        Generation(
+            id=i,
+            avatar_id=i % 7 or None,
+            buyer_id=1,
+            credits_used=1,
+            prompt=f"prompt {i} " * 8,
+            request_id=f"req-{i}",
+            image_url=f"https://cdn.example.com/objects/{i:064x}.png",
+            thumbnail_url=None,
+            seed=str(i),
+            status="success",
+            fail_reason=None,
+            nsfw_flag=False,
+            created_at=started + timedelta(seconds=i),
+        )
+        for i in range(ROW_COUNT)
+    ]
+
+
+def _previous_path(route: APIRoute, rows: list[Generation]) -> bytes:
+    """엔드포인트별 model_validate → FastAPI response_model 직렬화 → JSONResponse"""
+    content = [GenerationResponse.model_validate(g) for g in rows]
+    serialized = asyncio.run(
+        serialize_response(field=route.response_field, response_content=content)
+    )
+    return JSONResponse(serialized).body
+
+
+def test_response_serialization():
+    route = next(
+        r for r in app.routes if isinstance(r, APIRoute) and r.path == "/my/generations"
+    )
+    rows = _rows()
+
+    started = time.perf_counter()
+    previous_body = _previous_path(route, rows)
+    previous_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    fast_body = orm_json_response(GENERATION_LIST, rows).body
+    fast_elapsed = time.perf_counter() - started
+
+    print(
+        f"[INFO] {ROW_COUNT} rows: previous {previous_elapsed / ROW_COUNT * 1e6:.1f} us/row, "
+        f"TypeAdapter {fast_elapsed / ROW_COUNT * 1e6:.1f} us/row"
+    )
+    assert json.loads(fast_body) == json.loads(previous_body)
+    print("[SUCCESS] 빠른 응답 경로가 기존과 같은 JSON 생성")
+
+
+if __name__ == "__main__":
+    test_response_serialization()
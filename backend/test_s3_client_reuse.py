@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import sys
+import os
+import time
+from io import BytesIO
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import boto3
+from botocore.stub import Stubber
+
+from app import s3_utils
+from app.config import settings
+from app.storage import OBJECTS_PREFIX, S3StorageBackend
+
+CLIENT_COUNT = 20
+FILE_COUNT = 10
+
+
+def test_s3_client_reuse():
+    # 네트워크 없이 동작하도록 더미 자격 증명 사용
+    original_credentials = (settings.AWS_ACCESS_KEY_ID, settings.AWS_SECRET_ACCESS_KEY)
+    settings.AWS_ACCESS_KEY_ID = settings.AWS_ACCESS_KEY_ID or "test"
+    settings.AWS_SECRET_ACCESS_KEY = settings.AWS_SECRET_ACCESS_KEY or "test"
+    s3_utils._s3_client = None
+    try:
+        _run_benchmark_and_upload()
+    finally:
+        settings.AWS_ACCESS_KEY_ID, settings.AWS_SECRET_ACCESS_KEY = original_credentials
+        s3_utils._s3_client = None
+
+
+def _run_benchmark_and_upload():
+    # 기존 방식: 파일마다 boto3.client 생성
+    started = time.perf_counter()
+    for _ in range(CLIENT_COUNT):
+        boto3.client(
+            "s3",
+            region_name=settings.AWS_REGION,
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        )
+    fresh_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    clients = {id(s3_utils.get_s3_client()) for _ in range(CLIENT_COUNT)}
+    cached_elapsed = time.perf_counter() - started
+
+    print(
+        f"[INFO] boto3.client x{CLIENT_COUNT}: {fresh_elapsed * 1000:.1f} ms, "
+        f"get_s3_client x{CLIENT_COUNT}: {cached_elapsed * 1000:.1f} ms"
+    )
+    assert len(clients) == 1
+
+    # 로컬 S3 대역(Stubber)으로 S3StorageBackend 업로드 검증 (HEAD 404 → PUT)
+    backend = S3StorageBackend()
+    client = s3_utils.get_s3_client()
+    with Stubber(client) as stubber:
+        for _ in range(FILE_COUNT):
+            stubber.add_client_error("head_object", service_error_code="404", http_status_code=404)
+            stubber.add_response("put_object", {"ETag": '"stub"'})
+        stored = [
+            backend.put(BytesIO(os.urandom(1024)), f"photo_{i}.png", "image/png")
+            for i in range(FILE_COUNT)
+        ]
+        stubber.assert_no_pending_responses()
+
+    assert len({obj.key for obj in stored}) == FILE_COUNT
+    assert all(obj.created and obj.size == 1024 for obj in stored)
+    assert all(obj.key.startswith(f"{OBJECTS_PREFIX}/") and obj.key.endswith(".png") for obj in stored)
+    assert all(obj.url == backend.url_for(obj.key) for obj in stored)
+    print(f"[SUCCESS] 공유 S3 클라이언트로 {FILE_COUNT}개 파일 업로드")
+
+if __name__ == "__main__":
+    test_s3_client_reuse()
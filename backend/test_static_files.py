@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+import sys
+import os
+import hashlib
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.static_files import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    CachedStaticFiles,
+)
+
+ORIGINAL = bytes(range(256)) * 4  # 1024 bytes
+WEBP = b"RIFF-webp-variant"
+AVIF = b"avif-variant"
+
+
+def _check_caching(client, url, name):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == ORIGINAL
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{name}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "image/png"
+
+    response = client.get(url, headers={"if-none-match": f'"{name}"'})
+    assert response.status_code == 304
+    assert response.content == b""
+    response = client.get(url, headers={"if-none-match": '"other"'})
+    assert response.status_code == 200
+
+    response = client.head(url)
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(ORIGINAL))
+    assert response.content == b""
+
+    response = client.get("/static/readme.txt")
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert response.headers["etag"] != '"readme.txt"'
+    etag = response.headers["etag"]
+    assert client.get("/static/readme.txt", headers={"if-none-match": etag}).status_code == 304
+
+
+def _check_ranges(client, url, name):
+    size = len(ORIGINAL)
+    cases = {
+        "bytes=0-9": (0, 9),
+        "bytes=1000-": (1000, size - 1),
+        "bytes=-24": (size - 24, size - 1),
+        "bytes=1000-5000": (1000, size - 1),
+    }
+    for value, (start, end) in cases.items():
+        response = client.get(url, headers={"range": value})
+        assert response.status_code == 206, value
+        assert response.headers["content-range"] == f"bytes {start}-{end}/{size}"
+        assert response.headers["content-length"] == str(end - start + 1)
+        assert response.content == ORIGINAL[start:end + 1]
+
+    for value in ("bytes=2000-3000", "bytes=10-5", "bytes=-0"):
+        response = client.get(url, headers={"range": value})
+        assert response.status_code == 416, value
+        assert response.headers["content-range"] == f"bytes */{size}"
+
+    # 다중 범위 / 형식 오류 → 전체 응답
+    for value in ("bytes=0-1,5-6", "items=0-1", "bytes=a-b"):
+        response = client.get(url, headers={"range": value})
+        assert response.status_code == 200, value
+        assert response.content == ORIGINAL
+
+    # If-Range: 검증자가 같을 때만 부분 응답
+    response = client.get(url, headers={"range": "bytes=0-9", "if-range": f'"{name}"'})
+    assert response.status_code == 206
+    response = client.get(url, headers={"range": "bytes=0-9", "if-range": '"stale"'})
+    assert response.status_code == 200
+    assert response.content == ORIGINAL
+    last_modified = client.get(url).headers["last-modified"]
+    response = client.get(url, headers={"range": "bytes=0-9", "if-range": last_modified})
+    assert response.status_code == 206
+
+
+def _check_negotiation(client, url, upload_dir, digest):
+    response = client.get(url, headers={"accept": "image/avif,image/webp,*/*"})
+    assert response.content == AVIF
+    assert response.headers["content-type"] == "image/avif"
+    assert response.headers["vary"] == "Accept"
+    assert response.headers["etag"] == f'"{digest}.avif"'
+
+    response = client.get(url, headers={"accept": "image/webp,*/*"})
+    assert response.content == WEBP
+    assert response.headers["content-type"] == "image/webp"
+
+    response = client.get(url, headers={"accept": "image/png,*/*"})
+    assert response.content == ORIGINAL
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["vary"] == "Accept"
+
+    # 파생본이 없는 포맷은 다음 후보로
+    os.unlink(os.path.join(upload_dir, f"{digest}.avif"))
+    response = client.get(url, headers={"accept": "image/avif,image/webp"})
+    assert response.content == WEBP
+
+    # 파생본에도 Range 적용
+    response = client.get(url, headers={"accept": "image/webp", "range": "bytes=0-3"})
+    assert response.status_code == 206
+    assert response.content == WEBP[:4]
+
+
+def test_static_files():
+    with tempfile.TemporaryDirectory() as upload_dir:
+        digest = hashlib.sha256(ORIGINAL).hexdigest()
+        name = f"{digest}.png"
+        files = {name: ORIGINAL, f"{digest}.webp": WEBP, f"{digest}.avif": AVIF, "readme.txt": b"hi"}
+        for file_name, content in files.items():
+            with open(os.path.join(upload_dir, file_name), "wb") as file:
+                file.write(content)
+
+        app = Starlette(routes=[Mount("/static", CachedStaticFiles(directory=upload_dir))])
+        client = TestClient(app)
+        url = f"/static/{name}"
+
+        _check_caching(client, url, name)
+        print("[SUCCESS] immutable 캐시 / ETag / If-None-Match 304")
+        _check_ranges(client, url, name)
+        print("[SUCCESS] Range 206 / 416 / If-Range")
+        _check_negotiation(client, url, upload_dir, digest)
+        print("[SUCCESS] Accept 기반 AVIF / WebP 파생본 전송")
+
+
+if __name__ == "__main__":
+    test_static_files()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import sys
+import os
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth import create_access_token, verify_token
+from app.dependencies import get_current_user
+from app.token_cache import verified_token_cache
+from app.user_cache import AuthUser, user_auth_cache
+
+REQUEST_COUNT = 2000
+USER_ID = 987654321
+
+
+def _time_requests(credentials, clear_token_cache: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(REQUEST_COUNT):
+        if clear_token_cache:
+            verified_token_cache.clear()
+        # 사용자 캐시가 채워져 있으므로 db 는 사용되지 않음
+        user = get_current_user(credentials=credentials, db=None)
+        assert user.id == USER_ID
+    return time.perf_counter() - started
+
+
+def test_token_cache():
+    user_auth_cache.set(
+        AuthUser(id=USER_ID, email="bench@example.com", role="buyer", status="active")
+    )
+    token = create_access_token({"sub": USER_ID})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    try:
+        uncached = _time_requests(credentials, clear_token_cache=True)
+        hits_before = verified_token_cache.hits
+        cached = _time_requests(credentials, clear_token_cache=False)
+
+        print(
+            f"[INFO] get_current_user x{REQUEST_COUNT}: "
+            f"jwt.decode {uncached / REQUEST_COUNT * 1e6:.1f} us/req, "
+            f"cached {cached / REQUEST_COUNT * 1e6:.1f} us/req"
+        )
+        assert verified_token_cache.hits - hits_before >= REQUEST_COUNT - 1
+
+        # 캐시된 access token 이 refresh 용도로 통과하지 않아야 함
+        assert verify_token(token, token_type="refresh") is None
+        # 반환된 payload 수정이 캐시에 영향을 주지 않아야 함
+        verify_token(token)["sub"] = "0"
+        assert verify_token(token)["sub"] == str(USER_ID)
+        print("[SUCCESS] 검증된 토큰 캐시 동작 확인")
+    finally:
+        user_auth_cache.invalidate(USER_ID)
+        verified_token_cache.clear()
+
+
+if __name__ == "__main__":
+    test_token_cache()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+import sys
+import os
+import hashlib
+import tempfile
+from io import BytesIO
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import storage
+from app.config import settings
+from app.db import Base, get_async_db
+from app.dependencies import get_current_user_async
+from app.main import app
+from app.models import StorageObject, TrainingRequest, User
+from app.user_cache import AuthUser
+
+
+# training_requests 의 JSONB 컬럼을 SQLite 에서는 JSON 으로 생성
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def _slot(content: bytes, file_name: str) -> dict:
+    return {
+        "file_name": file_name,
+        "content_type": "image/png",
+        "size": len(content),
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def _payload(photos: dict[str, list[bytes]]) -> dict:
+    payload = {
+        "avatar_name": "avatar",
+        "negative_prompt": "",
+        "credit_per_generation": 1,
+        "national": "KR",
+        "gender": "female",
+        "description": "description",
+        "preview_image": _slot(photos["preview_image"][0], "preview.png"),
+    }
+    for group in ("front_photos", "side_photos", "fullbody_photos", "other_photos"):
+        payload[group] = [
+            _slot(content, f"{group}_{i}.png") for i, content in enumerate(photos[group])
+        ]
+    return payload
+
+
+def _check_signed_put(client, upload: dict, content: bytes):
+    url = upload["url"]
+    query = parse_qs(urlsplit(url).query)
+    path = urlsplit(url).path
+
+    # 서명 변조 / 만료 → 403
+    tampered = url.replace(f"sig={query['sig'][0]}", "sig=" + "0" * 64)
+    assert client.put(tampered, content=content).status_code == 403
+    expired = storage.get_storage_backend().presign_put(
+        upload["key"], "image/png", len(content), hashlib.sha256(content).hexdigest(), -1
+    )
+    assert client.put(expired.url, content=content).status_code == 403
+    other_size = url.replace(f"size={query['size'][0]}", f"size={len(content) + 1}")
+    assert client.put(other_size, content=content).status_code == 403
+
+    # 서명된 크기 초과 → 413, 크기는 같지만 내용(해시)이 다름 → 400
+    assert client.put(url, content=content + b"!").status_code == 413
+    response = client.put(url, content=bytes(len(content)))
+    assert response.status_code == 400
+    assert not os.path.exists(os.path.join(settings.UPLOAD_DIR, upload["key"]))
+
+    response = client.put(url, content=content)
+    assert response.status_code == 200
+    assert path == f"/uploads/{upload['key']}"
+    with open(os.path.join(settings.UPLOAD_DIR, upload["key"]), "rb") as file:
+        assert file.read() == content
+
+
+def test_training_uploads():
+    original = (settings.UPLOAD_DIR, settings.STORAGE_TYPE, storage._backend)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "uploads.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        tables = [User.__table__, TrainingRequest.__table__, StorageObject.__table__]
+        Base.metadata.create_all(engine, tables=tables)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        db = SessionLocal()
+        user = User(
+            email="uploads@example.com",
+            nickname="uploads",
+            password_hash="-",
+            role="creator",
+            credit_balance=0,
+            status="active",
+            locale="en",
+        )
+        db.add(user)
+        db.commit()
+        current_user = AuthUser(id=user.id, email=user.email, role=user.role, status=user.status)
+        db.close()
+
+        async def override_async_db():
+            async with AsyncSessionLocal() as session:
+                yield session
+
+        settings.UPLOAD_DIR = os.path.join(tmp_dir, "uploads")
+        settings.STORAGE_TYPE = "local"
+        storage._backend = None
+        app.dependency_overrides[get_async_db] = override_async_db
+        app.dependency_overrides[get_current_user_async] = lambda: current_user
+        try:
+            _run(TestClient(app), SessionLocal)
+        finally:
+            app.dependency_overrides.pop(get_async_db, None)
+            app.dependency_overrides.pop(get_current_user_async, None)
+            settings.UPLOAD_DIR, settings.STORAGE_TYPE, storage._backend = original
+            engine.dispose()
+            async_engine.sync_engine.dispose()
+
+
+def _run(client, SessionLocal):
+    backend = storage.get_storage_backend()
+    existing = b"already-stored-preview"
+    backend.put(BytesIO(existing), "old.png", "image/png")
+
+    photos = {
+        "preview_image": [existing],
+        "front_photos": [f"front-{i}".encode() for i in range(4)],
+        "side_photos": [f"side-{i}".encode() for i in range(4)],
+        "fullbody_photos": [b"fullbody"],
+        # 같은 내용은 URL 한 번만 발급
+        "other_photos": [b"front-0"],
+    }
+    response = client.post("/my/training-requests/uploads", json=_payload(photos))
+    assert response.status_code == 201, response.text
+    body = response.json()
+    training_request_id = body["training_request_id"]
+    uploads = {(upload["group"], upload["index"]): upload for upload in body["uploads"]}
+    assert len(uploads) == 11
+
+    # 이미 저장된 내용(중복 제거) → URL 없음, 업로드 생략
+    assert uploads[("preview_image", 0)]["url"] is None
+    assert uploads[("other_photos", 0)]["url"] is None
+    assert uploads[("other_photos", 0)]["key"] == uploads[("front_photos", 0)]["key"]
+    pending = [
+        (upload, photos[group][index])
+        for (group, index), upload in uploads.items()
+        if upload["url"] is not None
+    ]
+    assert len(pending) == 9
+    print("[SUCCESS] 이미 저장된 / 중복된 내용은 presigned URL 발급 생략")
+
+    _check_signed_put(client, *pending[0])
+    print("[SUCCESS] 서명된 로컬 PUT 저장, 잘못된/만료된 서명 403, 해시 불일치 400")
+
+    # 일부만 업로드한 상태에서 confirm → 400 (누락 키 목록)
+    confirm_url = f"/my/training-requests/{training_request_id}/confirm"
+    response = client.post(confirm_url)
+    assert response.status_code == 400
+    assert len(response.json()["detail"]["keys"]) == 8
+
+    for upload, content in pending[1:]:
+        assert client.put(upload["url"], content=content).status_code == 200
+
+    # 키 위치의 파일 크기가 manifest 와 다르면 confirm 거절
+    truncated_key = pending[1][0]["key"]
+    truncated_path = os.path.join(settings.UPLOAD_DIR, truncated_key)
+    with open(truncated_path, "wb") as file:
+        file.write(b"x")
+    response = client.post(confirm_url)
+    assert response.status_code == 400
+    assert response.json()["detail"]["keys"] == [truncated_key]
+    with open(truncated_path, "wb") as file:
+        file.write(pending[1][1])
+    print("[SUCCESS] confirm 시 누락/크기 불일치 객체가 있으면 400")
+
+    response = client.post(confirm_url)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "requested"
+    assert client.post(confirm_url).status_code == 200  # 재시도는 그대로 반환
+
+    db = SessionLocal()
+    try:
+        ref_counts = {row.key: row.ref_count for row in db.query(StorageObject)}
+    finally:
+        db.close()
+    assert ref_counts[uploads[("front_photos", 0)]["key"]] == 2
+    assert ref_counts[uploads[("preview_image", 0)]["key"]] == 1
+    assert sum(ref_counts.values()) == 11
+    print("[SUCCESS] confirm 후 requested 전이, 참조 수는 한 번만 증가")
+
+
+if __name__ == "__main__":
+    test_training_uploads()